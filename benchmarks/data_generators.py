@@ -0,0 +1,246 @@
+#Here we import the necessary libraries
+import os
+import json
+import random
+from collections import deque
+
+#Here we define the values used to generate the synthetic datasets. They imitate the values of the Goodreads files
+LANGUAGES = ["eng", "eng", "eng", "en-US", "spa", "ita", "fre", "ger", ""]
+FORMATS = ["Paperback", "Hardcover", "Kindle Edition", "ebook", "Mass Market Paperback", ""]
+GENDERS = ["male", "female", ""]
+COMMON_TAGS = ["fiction", "fantasy", "romance", "young-adult", "classics", "non-fiction", "mystery", "science-fiction", "historical", "horror"]
+
+
+def random_date(generator: random.Random) -> str:
+    """
+    Function that returns a random date string in format "YYYY", "YYYY-MM" or "YYYY-MM-DD", or an empty string.
+
+    Args:
+        generator (random.Random): Random number generator.
+
+    Returns:
+        str: Date string.
+    """
+    year = generator.randint(1800, 2023)
+    month = generator.randint(1, 12)
+    day = generator.randint(1, 28)
+    return generator.choice([f"{year}", f"{year}-{month:02d}", f"{year}-{month:02d}-{day:02d}", f"{year}-{month:02d}-{day:02d}", ""])
+
+def random_rating_dist(generator: random.Random) -> str:
+    """
+    Function that returns a random rating distribution string (e.g. "5:123|4:45|3:10|2:3|1:1|total:182").
+
+    Args:
+        generator (random.Random): Random number generator.
+
+    Returns:
+        str: Rating distribution string.
+    """
+    counts = [int(generator.expovariate(1 / 50)) for _ in range(5)]
+    return "|".join(f"{5 - i}:{count}" for i, count in enumerate(counts)) + f"|total:{sum(counts)}"
+
+def generate_books(file_path: str, number_of_rows: int, number_of_authors: int, seed: int = 0) -> None:
+    """
+    Function that writes a synthetic lighter_books.json file.
+
+    Args:
+        file_path (str): Path of the file to write.
+        number_of_rows (int): Number of books.
+        number_of_authors (int): Number of authors the books belong to.
+        seed (int, optional): Seed of the random number generator. Defaults to 0.
+    """
+    generator = random.Random(seed)
+    with open(file_path, "w") as books_file:
+        for book_id in range(1, number_of_rows + 1):
+            #The number of books per author follows a skewed (log-uniform) distribution, as in the real dataset
+            author_id = max(int(number_of_authors ** generator.random()), 1)
+            book = {
+                "id": book_id,
+                "title": f"Book {book_id}",
+                "author_name": f"Author {author_id}",
+                "author_id": author_id,
+                "work_id": book_id,
+                "language": generator.choice(LANGUAGES),
+                "average_rating": round(generator.uniform(1, 5), 2),
+                "rating_dist": random_rating_dist(generator),
+                "ratings_count": generator.randint(0, 100000),
+                "text_reviews_count": generator.randint(0, 5000),
+                "publication_date": random_date(generator),
+                "original_publication_date": random_date(generator),
+                "format": generator.choice(FORMATS),
+                "publisher": f"Publisher {generator.randint(1, 1000)}",
+                "num_pages": generator.choice([generator.randint(20, 1500), ""]),
+                "series_id": generator.choice([str(generator.randint(1, 10000)), ""])
+            }
+            books_file.write(json.dumps(book) + "\n")
+
+def generate_authors(file_path: str, number_of_rows: int, seed: int = 0) -> None:
+    """
+    Function that writes a synthetic lighter_authors.json file.
+
+    Args:
+        file_path (str): Path of the file to write.
+        number_of_rows (int): Number of authors.
+        seed (int, optional): Seed of the random number generator. Defaults to 0.
+    """
+    generator = random.Random(seed)
+    with open(file_path, "w") as authors_file:
+        for author_id in range(1, number_of_rows + 1):
+            author = {
+                "id": author_id,
+                "name": f"Author {author_id}",
+                "gender": generator.choice(GENDERS),
+                "fans_count": int(generator.paretovariate(1.1)),
+                "ratings_count": generator.randint(0, 1000000),
+                "average_rating": round(generator.uniform(1, 5), 2),
+                "text_reviews_count": generator.randint(0, 50000),
+                "works_count": int(generator.paretovariate(1.3)),
+                "about": ""
+            }
+            authors_file.write(json.dumps(author) + "\n")
+
+def generate_lists(file_path: str, number_of_rows: int, number_of_books: int, seed: int = 0) -> None:
+    """
+    Function that writes a synthetic list.json file. The tags have a few very common values and a long tail of rare values.
+    The "The Worst Books of All Time" list is placed in the middle of the file.
+
+    Args:
+        file_path (str): Path of the file to write.
+        number_of_rows (int): Number of lists.
+        number_of_books (int): Number of books the lists can contain.
+        seed (int, optional): Seed of the random number generator. Defaults to 0.
+    """
+    generator = random.Random(seed)
+    with open(file_path, "w") as lists_file:
+        for list_id in range(1, number_of_rows + 1):
+            title = "The Worst Books of All Time" if list_id == number_of_rows // 2 + 1 else f"List {list_id}"
+            book_list = {
+                "id": list_id,
+                "title": title,
+                "num_voters": generator.randint(0, 10000),
+                "books": [{"book_id": str(generator.randint(1, number_of_books))} for _ in range(generator.randint(1, 10))]
+            }
+            #Some lists don't have tags, as in the real dataset
+            if generator.random() < 0.8:
+                book_list["tags"] = [generator.choice(COMMON_TAGS) if generator.random() < 0.5 else f"tag-{int(generator.paretovariate(0.8))}" for _ in range(generator.randint(1, 6))]
+            lists_file.write(json.dumps(book_list) + "\n")
+
+def generate_series(file_path: str, number_of_rows: int, seed: int = 0) -> None:
+    """
+    Function that writes a synthetic series.json file.
+
+    Args:
+        file_path (str): Path of the file to write.
+        number_of_rows (int): Number of series.
+        seed (int, optional): Seed of the random number generator. Defaults to 0.
+    """
+    generator = random.Random(seed)
+    with open(file_path, "w") as series_file:
+        for series_id in range(1, number_of_rows + 1):
+            series = {
+                "id": str(series_id),
+                "title": f"Series {series_id}",
+                "works": [{"work_id": str(generator.randint(1, 10**7)), "books_count": str(int(generator.paretovariate(1.5)))} for _ in range(generator.randint(1, 8))]
+            }
+            series_file.write(json.dumps(series) + "\n")
+
+def generate_shelf_instructions(number_of_instructions: int, seed: int = 0, query_ratio: float = 0.3) -> bytes:
+    """
+    Function that returns the input of the Algorithmic Question with random instructions.
+
+    Args:
+        number_of_instructions (int): Number of instructions.
+        seed (int, optional): Seed of the random number generator. Defaults to 0.
+        query_ratio (float, optional): Fraction of ? instructions. Defaults to 0.3.
+
+    Returns:
+        bytes: Input with the number of instructions followed by one instruction per line.
+    """
+    generator = random.Random(seed)
+    lines = [str(number_of_instructions)]
+    number_of_books = 0
+    for _ in range(number_of_instructions):
+        #The first instruction must place a book
+        if number_of_books > 0 and generator.random() < query_ratio:
+            lines.append(f"? {generator.randint(1, number_of_books)}")
+        else:
+            number_of_books += 1
+            lines.append(f"{generator.choice('LR')} {number_of_books}")
+    return ("\n".join(lines) + "\n").encode()
+
+def generate_dynamic_shelf_instructions(number_of_instructions: int, seed: int = 0) -> bytes:
+    """
+    Function that returns the input of the extended shelf (shelf_module.run_dynamic_instructions) with random valid instructions: L, R, ?, D, K, PL and PR.
+
+    Args:
+        number_of_instructions (int): Number of instructions.
+        seed (int, optional): Seed of the random number generator. Defaults to 0.
+
+    Returns:
+        bytes: Input with the number of instructions followed by one instruction per line.
+    """
+    generator = random.Random(seed)
+    lines = [str(number_of_instructions)]
+    #Here we keep the ids of the books on the shelf in a list (to choose random books) with the position of each id in it,
+    #and the order of the shelf in a deque where the removed books are skipped when they reach an end (to know which book is popped)
+    books_on_shelf = []
+    list_positions = {}
+    shelf_order = deque()
+    number_of_books = 0
+
+    def remove_book(book_id: int) -> None:
+        #Here we move the last id of the list to the place of the removed one
+        position = list_positions.pop(book_id)
+        last_book_id = books_on_shelf.pop()
+        if last_book_id != book_id:
+            books_on_shelf[position] = last_book_id
+            list_positions[last_book_id] = position
+
+    for _ in range(number_of_instructions):
+        #Half of the instructions place a book, and all of them if the shelf is empty
+        choice = generator.random()
+        if len(books_on_shelf) == 0 or choice < 0.5:
+            number_of_books += 1
+            list_positions[number_of_books] = len(books_on_shelf)
+            books_on_shelf.append(number_of_books)
+            instruction = generator.choice("LR")
+            if instruction == "L":
+                shelf_order.appendleft(number_of_books)
+            else:
+                shelf_order.append(number_of_books)
+            lines.append(f"{instruction} {number_of_books}")
+        elif choice < 0.7:
+            lines.append(f"? {generator.choice(books_on_shelf)}")
+        elif choice < 0.8:
+            lines.append(f"K {generator.randint(1, len(books_on_shelf))}")
+        elif choice < 0.9:
+            book_id = generator.choice(books_on_shelf)
+            remove_book(book_id)
+            lines.append(f"D {book_id}")
+        else:
+            #Here we pop the first book of the chosen end that is still on the shelf
+            instruction = generator.choice(["PL", "PR"])
+            pop = shelf_order.popleft if instruction == "PL" else shelf_order.pop
+            book_id = pop()
+            while book_id not in list_positions:
+                book_id = pop()
+            remove_book(book_id)
+            lines.append(instruction)
+    return ("\n".join(lines) + "\n").encode()
+
+def generate_dataset_files(directory: str, number_of_rows: int, seed: int = 0) -> None:
+    """
+    Function that writes the four synthetic dataset files in the data folder of a directory, with the names used by the modules.
+
+    Args:
+        directory (str): Directory where the data folder is created.
+        number_of_rows (int): Number of books. The other files have a proportional number of rows.
+        seed (int, optional): Seed of the random number generator. Defaults to 0.
+    """
+    data_directory = os.path.join(directory, "data")
+    os.makedirs(data_directory, exist_ok=True)
+    number_of_authors = max(number_of_rows // 20, 1)
+    generate_books(os.path.join(data_directory, "lighter_books.json"), number_of_rows, number_of_authors, seed=seed)
+    generate_authors(os.path.join(data_directory, "lighter_authors.json"), number_of_authors, seed=seed + 1)
+    generate_lists(os.path.join(data_directory, "list.json"), max(number_of_rows // 10, 1), number_of_rows, seed=seed + 2)
+    generate_series(os.path.join(data_directory, "series.json"), max(number_of_rows // 10, 1), seed=seed + 3)
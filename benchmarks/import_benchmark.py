@@ -0,0 +1,61 @@
+"""
+Script that measures the cold-start time of importing the modules, each one in a fresh Python process, and writes the results to a JSON file.
+It compares the import of each module with the import of the same module plus the heavy libraries it used to import eagerly (scipy, sklearn, matplotlib and seaborn).
+Run it from the repository root with: python -m benchmarks.import_benchmark --output import_results.json
+"""
+#Here we import the necessary libraries
+import sys
+import json
+import argparse
+import statistics
+import subprocess
+
+from benchmarks.run_benchmarks import get_version
+
+#Here we define the import statements to measure
+IMPORT_STATEMENTS = {
+    "data_handling_module": "import modules.data_handling_module",
+    "data_handling_module_with_eager_dependencies": "import modules.data_handling_module, sklearn.linear_model, sklearn.model_selection, scipy.stats",
+    "plotting_module": "import modules.plotting_module",
+    "plotting_module_with_eager_dependencies": "import modules.plotting_module, matplotlib.pyplot, seaborn",
+    "shelf_module": "import modules.shelf_module",
+    "streaming_module": "import modules.streaming_module"
+}
+
+
+def measure_import(statement: str, repetitions: int) -> float:
+    """
+    Function that returns the median wall time of running an import statement in fresh Python processes.
+
+    Args:
+        statement (str): Import statement.
+        repetitions (int): Number of processes to run.
+
+    Returns:
+        float: Median wall time in seconds of the import statement.
+    """
+    #Here we measure the time inside the process, so that the start of the interpreter is not counted
+    code = f"import time; start_time = time.perf_counter(); {statement}; print(time.perf_counter() - start_time)"
+    times = [float(subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True).stdout) for _ in range(repetitions)]
+    return statistics.median(times)
+
+def main() -> None:
+    #Here we read the arguments of the script
+    parser = argparse.ArgumentParser(description="Measure the cold-start import time of the modules.")
+    parser.add_argument("--repetitions", type=int, default=5, help="Number of fresh processes used for each import.")
+    parser.add_argument("--output", default="import_results.json", help="Path of the JSON file with the results.")
+    arguments = parser.parse_args()
+
+    #Here we measure each import statement
+    results = []
+    for name, statement in IMPORT_STATEMENTS.items():
+        seconds = measure_import(statement, arguments.repetitions)
+        results.append({"benchmark": name, "seconds": seconds})
+        print(f"{name}: {seconds:.3f} seconds", file=sys.stderr)
+
+    #Here we write the results together with the version of the code
+    with open(arguments.output, "w") as output_file:
+        json.dump({"version": get_version(), "python": sys.version.split()[0], "repetitions": arguments.repetitions, "results": results}, output_file, indent=2)
+
+if __name__ == "__main__":
+    main()
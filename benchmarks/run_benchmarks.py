@@ -0,0 +1,150 @@
+"""
+Script that benchmarks the functions of the modules on synthetic Goodreads-shaped datasets and writes the results to a JSON file.
+Run it from the repository root with: python -m benchmarks.run_benchmarks --rows 10000 100000 --output bench_results.json
+"""
+#Here we import the necessary libraries
+import os
+import sys
+import json
+import time
+import platform
+import tempfile
+import argparse
+import tracemalloc
+import subprocess
+from typing import Callable
+
+from benchmarks import data_generators
+
+
+def measure(function: Callable, setup: Callable = None) -> dict:
+    """
+    Function that runs a function and measures its wall time and the peak memory allocated while it runs.
+    The function is run twice: once to measure the wall time and once with tracemalloc to measure the memory, since tracing the allocations slows down the function.
+
+    Args:
+        function (Callable): Function to run. If setup is given, it receives the value returned by setup.
+        setup (Callable, optional): Function that prepares the input of each run (e.g. a copy of a dataframe that the function modifies). It is not measured. Defaults to None.
+
+    Returns:
+        dict: Dictionary with the wall time in seconds, the peak allocated memory in bytes and the result of the first run.
+    """
+    #Here we define how each run calls the function
+    def run(argument):
+        return function(argument) if setup is not None else function()
+
+    #Here we prepare the input outside of the measurement
+    argument = setup() if setup is not None else None
+    start_time = time.perf_counter()
+    result = run(argument)
+    seconds = time.perf_counter() - start_time
+
+    #Here we measure the peak memory in a second run
+    argument = setup() if setup is not None else None
+    tracemalloc.start()
+    run(argument)
+    _, peak_memory = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {"seconds": seconds, "peak_memory_bytes": peak_memory, "result": result}
+
+def get_version() -> str:
+    """
+    Function that returns the current git commit of the repository, or "unknown" if it can't be obtained.
+
+    Returns:
+        str: Short hash of the current commit.
+    """
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+def run_benchmarks(number_of_rows: int, n_workers: int, seed: int = 0) -> list:
+    """
+    Function that generates the synthetic datasets with a number of rows and benchmarks the modules on them.
+
+    Args:
+        number_of_rows (int): Number of books of the synthetic dataset.
+        n_workers (int): Number of processes used by the parallel functions.
+        seed (int, optional): Seed of the data generators. Defaults to 0.
+
+    Returns:
+        list: List of dictionaries with the name of the benchmark, the number of rows, the wall time and the peak memory.
+    """
+    #Here we import the modules. We import them here so that their import time is not measured in the first benchmark
+    from modules import data_handling_module, shelf_module, streaming_module
+
+    results = []
+
+    def record(name: str, measurement: dict) -> None:
+        results.append({"benchmark": name, "rows": number_of_rows, "seconds": measurement["seconds"], "peak_memory_bytes": measurement["peak_memory_bytes"]})
+        print(f"{name} ({number_of_rows} rows): {measurement['seconds']:.3f} seconds, {measurement['peak_memory_bytes'] / 2**20:.1f} MiB", file=sys.stderr)
+
+    with tempfile.TemporaryDirectory() as directory:
+        #Here we write the synthetic datasets and move to the directory, since the modules read the files from ./data
+        data_generators.generate_dataset_files(directory, number_of_rows, seed=seed)
+        current_directory = os.getcwd()
+        os.chdir(directory)
+        try:
+            #Benchmarks of the data loading
+            measurement = measure(lambda: data_handling_module.get_data("books", upload_all=True, chunksize=10000))
+            record("get_data", measurement)
+            record("get_data_parallel", measure(lambda: data_handling_module.get_data("books", upload_all=True, n_workers=n_workers)))
+            raw_books = measurement["result"]
+
+            #Benchmark of the date standardization. It modifies the dataframe, so each run receives a copy
+            measurement = measure(lambda books: data_handling_module.standardize_time_column_to_period(books, "original_publication_date"), setup=raw_books.copy)
+            record("standardize_time_column_to_period", measurement)
+            books = measurement["result"]
+
+            #Benchmarks of the yearly statistics
+            record("historical_dataframe", measure(lambda: data_handling_module.historical_dataframe(books, "original_publication_date")))
+            record("build_yearly_stats_dataframe", measure(lambda: data_handling_module.build_yearly_stats_dataframe(books)))
+
+            #Benchmarks of the rating ratios. The column version adds columns to the dataframe, so each run receives a copy
+            record("get_ratings_above_limit_ratio", measure(lambda: books.rating_dist.apply(data_handling_module.get_ratings_above_limit_ratio)))
+            record("get_ratings_above_limit_ratio_column", measure(data_handling_module.get_ratings_above_limit_ratio_column, setup=books.copy))
+
+            #Benchmark of the dictionary of books of the 100 first authors
+            record("build_dict_of_books", measure(lambda: data_handling_module.build_dict_of_books(books, list(range(1, 101)))))
+
+            #Benchmark of the shelf of the Algorithmic Question
+            instructions = data_generators.generate_shelf_instructions(number_of_rows, seed=seed)
+            record("shelf", measure(lambda: shelf_module.run_instructions(instructions)))
+
+            #Benchmark of the tag counter of the AWS Question
+            record("count_tags", measure(lambda: streaming_module.count_tags("./data/list.json", n_workers=n_workers)))
+        finally:
+            os.chdir(current_directory)
+
+    return results
+
+def main() -> None:
+    #Here we read the arguments of the script
+    parser = argparse.ArgumentParser(description="Benchmark the modules on synthetic Goodreads-shaped datasets.")
+    parser.add_argument("--rows", type=int, nargs="+", default=[10**4, 10**5], help="Numbers of books of the synthetic datasets (from 10^4 to 10^7).")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="Number of processes used by the parallel functions.")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the data generators.")
+    parser.add_argument("--output", default="bench_results.json", help="Path of the JSON file with the results.")
+    arguments = parser.parse_args()
+
+    #Here we run the benchmarks for each number of rows
+    results = []
+    for number_of_rows in arguments.rows:
+        results.extend(run_benchmarks(number_of_rows, arguments.workers, seed=arguments.seed))
+
+    #Here we write the results together with the version of the code and the environment, so that the results of different versions can be compared
+    report = {
+        "version": get_version(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "workers": arguments.workers,
+        "seed": arguments.seed,
+        "results": results
+    }
+    with open(arguments.output, "w") as output_file:
+        json.dump(report, output_file, indent=2)
+
+if __name__ == "__main__":
+    main()
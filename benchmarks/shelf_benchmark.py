@@ -0,0 +1,153 @@
+"""
+Script that checks the DynamicShelf of the shelf_module against a naive shelf with random instructions and measures the throughput of the shelves.
+Run it from the repository root with: python -m benchmarks.shelf_benchmark --operations 1000000 10000000 --output shelf_results.json
+"""
+#Here we import the necessary libraries
+import json
+import time
+import random
+import argparse
+import platform
+from collections import deque
+
+from benchmarks import data_generators
+from benchmarks.run_benchmarks import get_version
+from modules import shelf_module
+
+
+class NaiveShelf:
+    """
+    Class that simulates the extended shelf with a deque, searching the books one by one. It is slow but simple, so we use it to check the DynamicShelf.
+    """
+    def __init__(self):
+        self.books = deque()
+
+    def __len__(self) -> int:
+        return len(self.books)
+
+    def place_left(self, book_id) -> None:
+        self.books.appendleft(book_id)
+
+    def place_right(self, book_id) -> None:
+        self.books.append(book_id)
+
+    def remove(self, book_id) -> None:
+        self.books.remove(book_id)
+
+    def rank(self, book_id) -> int:
+        return self.books.index(book_id)
+
+    def select(self, k: int):
+        return self.books[k]
+
+    def pop_left(self):
+        return self.books.popleft()
+
+    def pop_right(self):
+        return self.books.pop()
+
+    def query(self, book_id) -> int:
+        rank = self.books.index(book_id)
+        return min(rank, len(self.books) - 1 - rank)
+
+def stress_check(number_of_operations: int, seed: int) -> None:
+    """
+    Function that applies the same random operations to a DynamicShelf and a NaiveShelf and checks that every answer is the same.
+    The DynamicShelf starts with a capacity of 2, so that its tree grows many times on both sides.
+
+    Args:
+        number_of_operations (int): Number of operations.
+        seed (int): Seed of the random number generator.
+    """
+    generator = random.Random(seed)
+    dynamic_shelf, naive_shelf = shelf_module.DynamicShelf(capacity=2), NaiveShelf()
+    books_on_shelf = []
+    next_book_id = 0
+
+    for step in range(number_of_operations):
+        operation = generator.choice(["place_left", "place_right", "place_left", "place_right", "query", "rank", "select", "remove", "pop_left", "pop_right"])
+        if len(books_on_shelf) == 0 and operation not in ["place_left", "place_right"]:
+            operation = "place_right"
+
+        #Here we apply the operation to both shelves
+        if operation in ["place_left", "place_right"]:
+            next_book_id += 1
+            books_on_shelf.append(next_book_id)
+            argument = next_book_id
+        elif operation == "select":
+            argument = generator.randrange(len(books_on_shelf))
+        elif operation in ["pop_left", "pop_right"]:
+            argument = None
+        else:
+            argument = generator.choice(books_on_shelf)
+
+        arguments = () if argument is None else (argument,)
+        dynamic_answer = getattr(dynamic_shelf, operation)(*arguments)
+        naive_answer = getattr(naive_shelf, operation)(*arguments)
+        assert dynamic_answer == naive_answer, f"Step {step} ({operation} {argument}) of seed {seed}: the DynamicShelf returned {dynamic_answer} and the NaiveShelf {naive_answer}."
+        assert len(dynamic_shelf) == len(naive_shelf), f"Step {step} of seed {seed}: the shelves have different lengths."
+
+        #Here we update the books on the shelf
+        if operation == "remove":
+            books_on_shelf.remove(argument)
+        elif operation in ["pop_left", "pop_right"]:
+            books_on_shelf.remove(dynamic_answer)
+
+    #Here we check the order of the whole shelf
+    assert [dynamic_shelf.select(k) for k in range(len(dynamic_shelf))] == list(naive_shelf.books), f"The final order of the shelves of seed {seed} is different."
+
+def measure_throughput(function, data: bytes, number_of_operations: int) -> dict:
+    """
+    Function that measures the time a shelf function takes to follow an input.
+
+    Args:
+        function: Function that receives the input and returns the answers.
+        data (bytes): Input with the instructions.
+        number_of_operations (int): Number of instructions of the input.
+
+    Returns:
+        dict: Dictionary with the wall time in seconds and the number of operations per second.
+    """
+    start_time = time.perf_counter()
+    function(data)
+    seconds = time.perf_counter() - start_time
+    return {"seconds": seconds, "operations_per_second": number_of_operations / seconds}
+
+def main() -> None:
+    #Here we read the arguments of the script
+    parser = argparse.ArgumentParser(description="Check the DynamicShelf against a naive shelf and measure the throughput of the shelves.")
+    parser.add_argument("--operations", type=int, nargs="+", default=[10**6], help="Numbers of instructions of the throughput benchmark (from 10^6 to 10^7).")
+    parser.add_argument("--stress-operations", type=int, default=2000, help="Number of operations of each stress check.")
+    parser.add_argument("--stress-seeds", type=int, default=50, help="Number of random stress checks.")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the random number generators.")
+    parser.add_argument("--output", default="shelf_results.json", help="Path of the JSON file with the results.")
+    arguments = parser.parse_args()
+
+    #Here we run the stress checks. An AssertionError is raised if the shelves give different answers
+    for seed in range(arguments.seed, arguments.seed + arguments.stress_seeds):
+        stress_check(arguments.stress_operations, seed)
+    print(f"stress check: {arguments.stress_seeds} seeds of {arguments.stress_operations} operations passed")
+
+    #Here we measure the throughput of the original instructions with both shelves and of the extended instructions with the DynamicShelf
+    results = []
+    for number_of_operations in arguments.operations:
+        original_data = data_generators.generate_shelf_instructions(number_of_operations, seed=arguments.seed)
+        dynamic_data = data_generators.generate_dynamic_shelf_instructions(number_of_operations, seed=arguments.seed)
+        for name, function, data in [("run_instructions", shelf_module.run_instructions, original_data), ("run_dynamic_instructions (L/R/?)", shelf_module.run_dynamic_instructions, original_data), ("run_dynamic_instructions", shelf_module.run_dynamic_instructions, dynamic_data)]:
+            result = {"function": name, "operations": number_of_operations, **measure_throughput(function, data, number_of_operations)}
+            print(f"{name}: {number_of_operations} operations in {result['seconds']:.2f} seconds ({result['operations_per_second']:.0f} operations per second)")
+            results.append(result)
+
+    #Here we write the results together with the version of the code and the environment
+    report = {
+        "version": get_version(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "seed": arguments.seed,
+        "results": results
+    }
+    with open(arguments.output, "w") as output_file:
+        json.dump(report, output_file, indent=2)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,262 @@
+#Here we import the necessary libraries
+import os
+import sys
+import copy
+import pickle
+import hashlib
+import inspect
+import functools
+from collections import OrderedDict
+
+#Here we define the version of the format of the keys and files. Changing it invalidates all the saved results
+CACHE_FORMAT_VERSION = 1
+
+#Here we store the state of the cache. It is disabled by default, so the memoized functions only check this flag and run normally
+ENABLED = False
+DIRECTORY = "./data/cache/results"
+MAX_BYTES = 1024 ** 3
+MEMORY_ITEMS = 128
+
+#Here we store the in-memory tier (the most recently used results, in order of use) and the number of hits and misses
+memory_cache = OrderedDict()
+statistics = {"memory_hits": 0, "disk_hits": 0, "misses": 0}
+
+
+def enable_cache(directory: str = DIRECTORY, max_bytes: int = MAX_BYTES, memory_items: int = MEMORY_ITEMS) -> None:
+    """
+    Function that enables the cache of the memoized functions.
+
+    Args:
+        directory (str, optional): Folder where the results are saved. Defaults to "./data/cache/results".
+        max_bytes (int, optional): Maximum size of the saved results. When it is exceeded, the least recently used results are deleted. Defaults to 1 GiB.
+        memory_items (int, optional): Maximum number of results kept in memory. Defaults to 128.
+    """
+    global ENABLED, DIRECTORY, MAX_BYTES, MEMORY_ITEMS
+    ENABLED = True
+    DIRECTORY = directory
+    MAX_BYTES = max_bytes
+    MEMORY_ITEMS = memory_items
+
+def disable_cache() -> None:
+    """
+    Function that disables the cache of the memoized functions. The saved results are kept.
+    """
+    global ENABLED
+    ENABLED = False
+
+def clear_cache(disk: bool = True) -> None:
+    """
+    Function that deletes the cached results.
+
+    Args:
+        disk (bool, optional): If True, the results saved on disk are deleted too. Defaults to True.
+    """
+    memory_cache.clear()
+    if disk and os.path.isdir(DIRECTORY):
+        for entry in os.scandir(DIRECTORY):
+            if entry.name.endswith(".pkl"):
+                os.remove(entry.path)
+
+def update_fingerprint(hasher, value) -> None:
+    """
+    Function that adds a value to a hash so that equal values give equal hashes:
+    dataframes, series and arrays are hashed by their content, paths of existing files by their size and modification time, and containers element by element.
+
+    Args:
+        hasher: Hash object of hashlib.
+        value: Value to add.
+    """
+    #Here we hash the pandas objects by their content. We check the pandas module in sys.modules so that this module doesn't import pandas
+    pandas = sys.modules.get("pandas")
+    if pandas is not None and isinstance(value, (pandas.DataFrame, pandas.Series)):
+        hasher.update(repr((type(value).__name__, getattr(value, "name", None), list(value.columns) if isinstance(value, pandas.DataFrame) else None, [str(dtype) for dtype in (value.dtypes if isinstance(value, pandas.DataFrame) else [value.dtype])])).encode())
+        try:
+            hasher.update(pandas.util.hash_pandas_object(value, index=True).to_numpy().tobytes())
+        except TypeError:
+            #Columns with unhashable values (e.g. lists) are hashed through their pickled bytes
+            hasher.update(pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL))
+        return
+
+    numpy = sys.modules.get("numpy")
+    if numpy is not None and isinstance(value, numpy.ndarray) and value.dtype != object:
+        hasher.update(repr((value.dtype.str, value.shape)).encode())
+        hasher.update(numpy.ascontiguousarray(value).tobytes())
+        return
+
+    #Here we hash the containers element by element
+    if isinstance(value, (list, tuple)):
+        hasher.update(f"{type(value).__name__}:{len(value)}".encode())
+        for item in value:
+            update_fingerprint(hasher, item)
+        return
+    if isinstance(value, dict):
+        hasher.update(f"dict:{len(value)}".encode())
+        for key in sorted(value, key=repr):
+            update_fingerprint(hasher, key)
+            update_fingerprint(hasher, value[key])
+        return
+
+    #Here we hash the paths of existing files by their size and modification time, so that the results are computed again when the file changes
+    if isinstance(value, str) and os.path.isfile(value):
+        file_stat = os.stat(value)
+        hasher.update(repr(("file", os.path.abspath(value), file_stat.st_size, file_stat.st_mtime_ns)).encode())
+        return
+
+    #Here we hash the other values by their pickled bytes or, if they can't be pickled, by their representation
+    try:
+        hasher.update(pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL))
+    except Exception:
+        hasher.update(repr(value).encode())
+
+def get_source(value) -> bytes:
+    """
+    Function that returns the source code of a function or class, or the representation of any other value (e.g. a constant).
+
+    Args:
+        value: Function, class or value.
+
+    Returns:
+        bytes: Source code or representation of the value.
+    """
+    if inspect.isfunction(value) or inspect.isclass(value) or inspect.ismethod(value):
+        try:
+            return inspect.getsource(value).encode()
+        except (OSError, TypeError):
+            if hasattr(value, "__code__"):
+                return value.__code__.co_code
+    return repr(value).encode()
+
+def get_code_version(function, version=None, dependencies: list = ()) -> str:
+    """
+    Function that returns the version of the code of a function: a hash of its source code, of the source code of the functions and classes it depends on and of the version given by hand.
+
+    Args:
+        function: Function.
+        version (optional): Version given by hand. Defaults to None.
+        dependencies (list, optional): Names of the functions, classes or constants of the module of the function that it uses. Defaults to ().
+
+    Returns:
+        str: Version of the code.
+    """
+    hasher = hashlib.blake2b(get_source(function), digest_size=8)
+    for name in dependencies:
+        hasher.update(name.encode() + get_source(function.__globals__[name]))
+    hasher.update(repr((version, CACHE_FORMAT_VERSION)).encode())
+    return hasher.hexdigest()
+
+def save_result(key: str, result) -> None:
+    """
+    Function that saves a result on disk and deletes the least recently used results if the size of the cache exceeds the maximum.
+
+    Args:
+        key (str): Key of the result.
+        result: Result to save.
+    """
+    os.makedirs(DIRECTORY, exist_ok=True)
+    #Here we write the result to a temporary file first, so that an interrupted write doesn't leave a corrupted result
+    file_path = os.path.join(DIRECTORY, f"{key}.pkl")
+    with open(file_path + ".tmp", "wb") as file:
+        pickle.dump(result, file, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(file_path + ".tmp", file_path)
+
+    #Here we delete the results in order of last use (the modification time, which is updated on every hit) until the cache fits in the maximum size
+    entries = sorted((entry.stat().st_mtime_ns, entry.stat().st_size, entry.path) for entry in os.scandir(DIRECTORY) if entry.name.endswith(".pkl"))
+    total_size = sum(size for _, size, _ in entries)
+    for _, size, path in entries:
+        if total_size <= MAX_BYTES:
+            break
+        os.remove(path)
+        total_size -= size
+
+def load_result(key: str):
+    """
+    Function that loads a result saved on disk and marks it as recently used.
+
+    Args:
+        key (str): Key of the result.
+
+    Returns:
+        Tuple with True and the result, or with False and None if the result is not saved.
+    """
+    file_path = os.path.join(DIRECTORY, f"{key}.pkl")
+    try:
+        #The results are pickle files written by this module. Only use cache folders you created
+        with open(file_path, "rb") as file:
+            result = pickle.load(file)
+    except (OSError, EOFError, pickle.UnpicklingError):
+        return False, None
+    os.utime(file_path)
+    return True, result
+
+def remember(key: str, result) -> None:
+    """
+    Function that stores a result in the in-memory tier, removing the least recently used result if it is full.
+
+    Args:
+        key (str): Key of the result.
+        result: Result to store.
+    """
+    memory_cache[key] = result
+    memory_cache.move_to_end(key)
+    while len(memory_cache) > MEMORY_ITEMS:
+        memory_cache.popitem(last=False)
+
+def memoize(function=None, version=None, dependencies: list = ()):
+    """
+    Decorator that caches the results of a function in memory and on disk when the cache is enabled with enable_cache.
+    The results are keyed on the name of the function, the version of its code and a fingerprint of its arguments, so a result is used again only for equal inputs and unchanged code.
+    The version of the code includes the source code of the dependencies, so the helpers that the function calls must be listed in them. The memoized function must not modify its arguments.
+    The cached results are returned as copies, so modifying them doesn't modify the cache.
+
+    Args:
+        function (optional): Function to memoize.
+        version (optional): Version given by hand, which can be changed to invalidate the saved results. Defaults to None.
+        dependencies (list, optional): Names of the functions, classes or constants of the module of the function that it uses. They are looked up on the first call, so they can be defined after the function. Defaults to ().
+
+    Returns:
+        Memoized function.
+    """
+    #Here we allow the decorator to be used with and without arguments
+    if function is None:
+        return functools.partial(memoize, version=version, dependencies=dependencies)
+
+    signature = inspect.signature(function)
+    name = f"{function.__module__}.{function.__qualname__}"
+    code_versions = []
+
+    @functools.wraps(function)
+    def wrapper(*args, **kwargs):
+        #If the cache is disabled, we only call the function
+        if not ENABLED:
+            return function(*args, **kwargs)
+
+        #Here we compute the version of the code on the first call, when all the dependencies are defined
+        if len(code_versions) == 0:
+            code_versions.append(get_code_version(function, version, dependencies))
+
+        #Here we compute the key from the arguments with their default values, so that equal calls written differently have the same key
+        bound_arguments = signature.bind(*args, **kwargs)
+        bound_arguments.apply_defaults()
+        hasher = hashlib.blake2b(f"{name}:{code_versions[0]}".encode(), digest_size=20)
+        update_fingerprint(hasher, dict(bound_arguments.arguments))
+        key = hasher.hexdigest()
+
+        #Here we look for the result in memory and then on disk
+        if key in memory_cache:
+            memory_cache.move_to_end(key)
+            statistics["memory_hits"] += 1
+            return copy.deepcopy(memory_cache[key])
+        found, result = load_result(key)
+        if found:
+            statistics["disk_hits"] += 1
+            remember(key, result)
+            return copy.deepcopy(result)
+
+        #If the result is not cached, we compute it and save it
+        statistics["misses"] += 1
+        result = function(*args, **kwargs)
+        save_result(key, result)
+        remember(key, copy.deepcopy(result))
+        return result
+
+    return wrapper
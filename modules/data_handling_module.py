@@ -1,21 +1,52 @@
 #Here we import the necessary libraries
-import sklearn
-import jsonlines
+#The scipy and sklearn libraries are imported inside the functions that use them, so that importing this module is fast
+import os
+import json
 import numpy as np
 import pandas as pd
-from scipy import stats
+from itertools import combinations
 from typing import List, Tuple
+from contextlib import contextmanager
+from concurrent.futures import ProcessPoolExecutor
 from collections import Counter
-from sklearn import linear_model
+from . import jsonl_module, streaming_module, profiling_module, cache_module
 
 
-#Here we set the maximum number of columns to display when printing a dataframe
-pd.set_option('display.max_columns', None)
+#Here we define the pandas options used in the notebook. They are not set when the module is imported, use set_pandas_options or the pandas_options context manager
+#We set the maximum number of columns to display when printing a dataframe to None in order to display all of them
+PANDAS_OPTIONS = {"display.max_columns": None}
 
-#Here we default the chained assignment warning to None. We dothis to avoid the SettingWithCopyWarning warning (specifically in the ChatGPT functions)
-pd.options.mode.chained_assignment = None 
+def set_pandas_options() -> None:
+    """
+    Function that sets the pandas options used in the notebook for the rest of the session.
+    """
+    for option, value in PANDAS_OPTIONS.items():
+        pd.set_option(option, value)
+
+@contextmanager
+def pandas_options():
+    """
+    Context manager that sets the pandas options used in the notebook only inside a with block.
+    """
+    with pd.option_context(*[item for option in PANDAS_OPTIONS.items() for item in option]):
+        yield
 
-def get_data(dataset_name:str, upload_all: bool = False, columns: list = None, dtype: dict = None, chunksize:int=100) -> pd.DataFrame:
+#Here we define the paths of the json files of each dataset
+DATASET_PATHS = {
+    "authors": "./data/lighter_authors.json",
+    "books": "./data/lighter_books.json"
+}
+
+#Here we define the path of the json file with the book lists
+LIST_PATH = "./data/list.json"
+
+#Here we define the folder where the columnar copies of the datasets and the indexes of the list file are stored
+CACHE_DIRECTORY = "./data/cache"
+
+#Here we keep the indexes of the list files that were already loaded, so that they are read from disk only once
+list_indexes = {}
+
+def get_data(dataset_name:str, upload_all: bool = False, columns: list = None, dtype: dict = None, chunksize:int=100, cache: bool = False, keep_columns: list = None, row_filter = None, n_workers: int = 1, compact: bool = False) -> pd.DataFrame:
     """
     Function that reads a json file and returns a dataframe with the data.
 
@@ -25,42 +56,490 @@ def get_data(dataset_name:str, upload_all: bool = False, columns: list = None, d
         columns (list, optional): List of columns to drop. Defaults to None.
         dtype (dict, optional): Dictionary with the data types of the columns. Defaults to None.
         chunksize (int, optional): Number of rows to read. Defaults to 10000.
+        cache (bool, optional): If True, the data is read from a columnar copy of the json file that is created on the first load. Defaults to False.
+        keep_columns (list, optional): List of columns to keep. Defaults to None.
+        row_filter (str or callable, optional): Query string (e.g. "language == 'eng'") or function that receives a dataframe and returns a boolean mask. Only the rows that satisfy it are kept. Defaults to None.
+        n_workers (int, optional): Number of processes used to parse the json file when upload_all is True. Defaults to 1.
+        compact (bool, optional): If True, the data types of the columns are compacted with the compact_dataset function. Defaults to False.
 
     Returns:
         dataset (pd.DataFrame): Dataframe with the dataset.
     """
-   #Here we read the json file in chunks from the json file depending on the dataset name
-    if dataset_name == "authors":
-        chunks= pd.read_json('./data/lighter_authors.json', dtype=dtype, lines=True, chunksize=chunksize)
-    elif dataset_name == "books":
-        chunks = pd.read_json('./data/lighter_books.json', dtype=dtype, lines=True,  chunksize=chunksize)
     #If the dataset name is not valid, we raise an error
-    else:
-        assert False, f"Dataset name {dataset_name} is not valid. Please choose between 'authors' and 'books'."
+    assert dataset_name in DATASET_PATHS, f"Dataset name {dataset_name} is not valid. Please choose between 'authors' and 'books'."
 
-    #Here we create an empty dataframe
-    dataset = pd.DataFrame()
+    #If we want to compact the data types, we read the dataset and then we compact it
+    if compact:
+        return compact_dataset(get_data(dataset_name, upload_all=upload_all, columns=columns, dtype=dtype, chunksize=chunksize, cache=cache, keep_columns=keep_columns, row_filter=row_filter, n_workers=n_workers))
 
-    #Here we iterate over the chunks
-    for chunk in chunks:
-        #If the columns argument is not None, we drop the columns
-        if columns is not None:
-            chunk.drop(columns=columns, axis=1, inplace=True)
-        
-        #Here we concatenate the chunks
-        dataset = pd.concat([dataset, chunk])
+    #If we want to use the cache, we read the columnar copy of the dataset instead of parsing the json file
+    if cache:
+        return get_cached_data(dataset_name, upload_all=upload_all, columns=columns, dtype=dtype, chunksize=chunksize, keep_columns=keep_columns, row_filter=row_filter)
+
+    #If we want to upload all the data with more than one process, we parse newline-aligned byte ranges of the json file in parallel
+    if upload_all and n_workers > 1:
+        #Query strings can be applied inside the processes, while functions are applied here since they may not be sent to other processes
+        dataset = jsonl_module.read_jsonl_parallel(DATASET_PATHS[dataset_name], n_workers=n_workers, dtype=dtype, range_function=read_data_range, columns=columns, keep_columns=keep_columns, row_filter=row_filter if isinstance(row_filter, str) else None)
+        if row_filter is not None and not isinstance(row_filter, str):
+            dataset = filter_rows(dataset, row_filter)
+        return dataset
+
+    #Here we create a list to store the chunks. We concatenate them only once at the end, since concatenating them inside the loop copies the whole dataset for every chunk
+    chunks_list = []
+
+    #Here we iterate over the chunks that are already projected and filtered
+    for chunk in get_data_chunks(dataset_name, columns=columns, dtype=dtype, chunksize=chunksize, keep_columns=keep_columns, row_filter=row_filter):
+        chunks_list.append(chunk)
 
         #If we don't want to upload all the data, we break the loop in order to upload only the first chunk
         if upload_all== False:
             break
-    #In this last step we convert all the empty values to NaN
-    return dataset.replace('', np.nan)
 
-def get_worst_books_list() -> list:
-    with jsonlines.open('./data/list.json', 'r') as jsonl_f:
-        for object in jsonl_f:
-            if object.get("title") == "The Worst Books of All Time":
-                return object.get("books")
+    #If the file is empty, we return an empty dataframe
+    if len(chunks_list) == 0:
+        return pd.DataFrame()
+
+    #Here we concatenate the chunks
+    with profiling_module.profile_stage("concat") as stage:
+        dataset = pd.concat(chunks_list)
+        stage.rows = len(dataset)
+    return dataset
+
+def get_data_chunks(dataset_name:str, columns: list = None, dtype: dict = None, chunksize:int=100, keep_columns: list = None, row_filter = None):
+    """
+    Generator that reads a json file in chunks and yields each chunk after dropping columns, converting the empty values to NaN and filtering rows.
+
+    Args:
+        dataset_name (str): Name of the dataset.
+        columns (list, optional): List of columns to drop. Defaults to None.
+        dtype (dict, optional): Dictionary with the data types of the columns. Defaults to None.
+        chunksize (int, optional): Number of rows to read in each chunk. Defaults to 100.
+        keep_columns (list, optional): List of columns to keep. Defaults to None.
+        row_filter (str or callable, optional): Query string or function that receives a dataframe and returns a boolean mask. Defaults to None.
+
+    Yields:
+        chunk (pd.DataFrame): Dataframe with a chunk of the dataset.
+    """
+    #Here we read the json file in chunks from the json file depending on the dataset name
+    chunks = iter(pd.read_json(DATASET_PATHS[dataset_name], dtype=dtype, lines=True, chunksize=chunksize))
+
+    #Here we iterate over the chunks. Reading each chunk is measured as a stage when the profiler is enabled
+    while True:
+        with profiling_module.profile_stage("read_chunk") as stage:
+            chunk = next(chunks, None)
+            if chunk is None:
+                break
+            stage.rows = len(chunk)
+        yield prepare_chunk(chunk, columns=columns, keep_columns=keep_columns, row_filter=row_filter)
+
+def prepare_chunk(chunk: pd.DataFrame, columns: list = None, keep_columns: list = None, row_filter = None) -> pd.DataFrame:
+    """
+    Function that drops columns, converts the empty values to NaN and filters the rows of a chunk of a dataset.
+
+    Args:
+        chunk (pd.DataFrame): Dataframe with a chunk of the dataset.
+        columns (list, optional): List of columns to drop. Defaults to None.
+        keep_columns (list, optional): List of columns to keep. Defaults to None.
+        row_filter (str or callable, optional): Query string or function that receives a dataframe and returns a boolean mask. Defaults to None.
+
+    Returns:
+        chunk (pd.DataFrame): Dataframe with the prepared chunk.
+    """
+    with profiling_module.profile_stage("drop_columns", rows=len(chunk)):
+        #If the keep_columns argument is not None, we keep only these columns. We use reindex so that every chunk has the same columns even if some keys are missing in it
+        if keep_columns is not None:
+            chunk = chunk.reindex(columns=keep_columns)
+
+        #If the columns argument is not None, we drop the columns. We ignore the columns that are not in the chunk (e.g. the ones already removed by keep_columns)
+        if columns is not None:
+            chunk = chunk.drop(columns=columns, errors="ignore")
+
+    #Here we convert all the empty values to NaN
+    with profiling_module.profile_stage("replace", rows=len(chunk)):
+        chunk = chunk.replace('', np.nan)
+
+    #If the row_filter argument is not None, we keep only the rows that satisfy it
+    if row_filter is not None:
+        chunk = filter_rows(chunk, row_filter)
+
+    return chunk
+
+def read_data_range(file_path: str, start: int, end: int, dtype: dict = None, columns: list = None, keep_columns: list = None, row_filter = None) -> Tuple[int, pd.DataFrame]:
+    """
+    Function that parses a byte range of a json lines file and prepares it as a chunk of the dataset. It is used by the processes of the parallel reader.
+
+    Args:
+        file_path (str): Path of the json lines file.
+        start (int): Byte offset where the range begins.
+        end (int): Byte offset where the range ends.
+        dtype (dict, optional): Dictionary with the data types of the columns. Defaults to None.
+        columns (list, optional): List of columns to drop. Defaults to None.
+        keep_columns (list, optional): List of columns to keep. Defaults to None.
+        row_filter (str, optional): Query string used to filter the rows. Defaults to None.
+
+    Returns:
+        Tuple[int, pd.DataFrame]: Number of rows of the range before they are filtered, which the parallel reader uses to label the rows, and dataframe with the prepared chunk.
+    """
+    #Here we parse the range
+    chunk = jsonl_module.read_range_to_dataframe(file_path, start, end, dtype=dtype)
+
+    #If the range is empty, we return it as it is
+    if len(chunk.columns) == 0:
+        return 0, chunk
+
+    #Here we prepare the chunk, counting its rows before they are filtered
+    return len(chunk), prepare_chunk(chunk, columns=columns, keep_columns=keep_columns, row_filter=row_filter)
+
+def filter_rows(dataset: pd.DataFrame, row_filter) -> pd.DataFrame:
+    """
+    Function that returns the rows of a dataframe that satisfy a condition.
+
+    Args:
+        dataset (pd.DataFrame): Dataframe with the dataset.
+        row_filter (str or callable): Query string (e.g. "num_pages > 0") or function that receives a dataframe and returns a boolean mask.
+
+    Returns:
+        pd.DataFrame: Dataframe with the rows that satisfy the condition.
+    """
+    #If the condition is a string, we use the query method
+    if isinstance(row_filter, str):
+        return dataset.query(row_filter)
+
+    #Otherwise we use the condition as a function that returns a boolean mask
+    return dataset[row_filter(dataset)]
+
+def get_file_fingerprint(file_path: str) -> dict:
+    """
+    Function that returns the size and the modification time of a file. We use them to know if a file changed since the last time we read it.
+
+    Args:
+        file_path (str): Path of the file.
+
+    Returns:
+        dict: Dictionary with the size and the modification time of the file.
+    """
+    #Here we get the information of the file
+    file_stats = os.stat(file_path)
+    #Here we return the size and the modification time (in nanoseconds) of the file
+    return {"size": file_stats.st_size, "mtime": file_stats.st_mtime_ns}
+
+def get_cached_data(dataset_name:str, upload_all: bool = False, columns: list = None, dtype: dict = None, chunksize:int=100, keep_columns: list = None, row_filter = None) -> pd.DataFrame:
+    """
+    Function that reads a dataset from a columnar (Feather) copy of its json file. The copy is created the first time the function is called and it is created again when the json file changes.
+    It returns the same rows, columns and data types as the get_data function without the cache. If upload_all is False, the columns have the data types of the whole file,
+    which can differ from the ones that pandas infers from the first chunk alone (e.g. a column of numbers with empty values in other chunks is an object column).
+
+    Args:
+        dataset_name (str): Name of the dataset.
+        upload_all (bool, optional): If True, all the data is uploaded. Defaults to False.
+        columns (list, optional): List of columns to drop. Defaults to None.
+        dtype (dict, optional): Dictionary with the data types of the columns. Defaults to None.
+        chunksize (int, optional): Number of rows of the first chunk if upload_all is False. The rows of the chunk are filtered after they are read, as in the get_data function. Defaults to 100.
+        keep_columns (list, optional): List of columns to keep. Defaults to None.
+        row_filter (str or callable, optional): Query string or function that receives a dataframe and returns a boolean mask. Defaults to None.
+
+    Returns:
+        dataset (pd.DataFrame): Dataframe with the dataset.
+    """
+    #Here we import the feather module of pyarrow. We import it here since it is only needed when the cache is used
+    from pyarrow import feather
+
+    #Here we define the paths of the columnar copy and of its metadata
+    cache_path = os.path.join(CACHE_DIRECTORY, f"{dataset_name}.feather")
+    metadata_path = os.path.join(CACHE_DIRECTORY, f"{dataset_name}.json")
+
+    #Here we define the metadata the columnar copy must have in order to be valid: the fingerprint of the json file and the data types used to parse it
+    fingerprint = get_file_fingerprint(DATASET_PATHS[dataset_name])
+    dtype_description = repr(dtype)
+
+    #Here we read the metadata of the columnar copy if it exists
+    metadata = None
+    if os.path.exists(cache_path) and os.path.exists(metadata_path):
+        with open(metadata_path, "r") as metadata_file:
+            metadata = json.load(metadata_file)
+
+    #If the columnar copy doesn't exist or the json file changed, we create it again from the whole json file
+    if metadata is None or metadata.get("fingerprint") != fingerprint or metadata.get("dtype") != dtype_description or "dtypes" not in metadata:
+        dataset = get_data(dataset_name, upload_all=True, dtype=dtype, chunksize=chunksize).reset_index(drop=True)
+
+        #Here we write the columnar copy. Columns with mixed types can't be written in a columnar format, in this case we use the parsed dataset
+        os.makedirs(CACHE_DIRECTORY, exist_ok=True)
+        try:
+            #We don't compress the file so that it can be memory-mapped when we read it
+            feather.write_feather(dataset, cache_path, compression="uncompressed")
+        except (TypeError, ValueError) as error:
+            print(f"The {dataset_name} dataset can't be cached ({error}). The parsed json file will be used instead.")
+            #Here we keep the rows and columns we want, as the get_data function does
+            if upload_all == False:
+                dataset = dataset.head(chunksize)
+            return prepare_chunk(dataset, columns=columns, keep_columns=keep_columns, row_filter=row_filter)
+
+        #Here we write the metadata of the columnar copy, with the data types of the parsed columns
+        metadata = {"fingerprint": fingerprint, "dtype": dtype_description, "columns": list(dataset.columns), "dtypes": {column: str(column_dtype) for column, column_dtype in dataset.dtypes.items()}}
+        with open(metadata_path, "w") as metadata_file:
+            json.dump(metadata, metadata_file)
+
+    #Here we obtain the columns we want to read, i.e. the columns we want to keep except the ones we want to drop
+    columns_to_read = keep_columns if keep_columns is not None else metadata["columns"]
+    columns_to_read = [column for column in columns_to_read if column in metadata["columns"] and (columns is None or column not in columns)]
+
+    #Here we memory-map the columnar copy and read only the columns we want
+    table = feather.read_table(cache_path, columns=columns_to_read, memory_map=True)
+
+    #If we don't want to upload all the data, we keep only the rows of the first chunk of the json file, as the get_data function does
+    if upload_all == False:
+        table = table.slice(0, chunksize)
+
+    #Here we convert the table to a dataframe with the data types of the parsed json file
+    #Columns of integers and missing values have the object type when they are parsed, and they are stored as integers with nulls, so we read them as objects
+    dataset = table.to_pandas(integer_object_nulls=True)
+    for column in dataset.columns:
+        if metadata["dtypes"][column] == "object":
+            dataset[column] = dataset[column].astype("object").where(dataset[column].notna(), np.nan)
+        elif str(dataset[column].dtype) != metadata["dtypes"][column]:
+            dataset[column] = dataset[column].astype(metadata["dtypes"][column])
+
+    #If the keep_columns argument is not None, we add the columns that are not in the file, as the reindex of the prepare_chunk function does
+    if keep_columns is not None:
+        dataset = dataset.reindex(columns=[column for column in keep_columns if columns is None or column not in columns])
+
+    #If the row_filter argument is not None, we keep only the rows that satisfy it
+    if row_filter is not None:
+        dataset = filter_rows(dataset, row_filter)
+
+    #Here we return the dataset
+    return dataset
+
+def get_worst_books_list(n_workers: int = 1) -> list:
+    """
+    Function that returns the books of "The Worst Books of All Time" list.
+
+    Args:
+        n_workers (int, optional): Number of processes used to search the list file. If it is 1, the list is read using the index of the list file. Defaults to 1.
+
+    Returns:
+        list: List with the books of the list.
+    """
+    #If we want to use more than one process, we search newline-aligned byte ranges of the list file in parallel and return the first match in the file order
+    if n_workers > 1:
+        partial_results = jsonl_module.map_file_ranges(LIST_PATH, find_list_books_in_range, n_workers=n_workers, title="The Worst Books of All Time")
+        return next((books for books in partial_results if books is not None), None)
+
+    #Otherwise we use the index of the list file to read only the line of the list
+    return get_list_books("The Worst Books of All Time")
+
+def index_list_range(file_path: str, start: int, end: int) -> Tuple[dict, dict]:
+    """
+    Function that maps the titles and ids of the lists inside a byte range of the list file to the byte offsets of their lines.
+
+    Args:
+        file_path (str): Path of the list file.
+        start (int): Byte offset where the range begins.
+        end (int): Byte offset where the range ends.
+
+    Returns:
+        Tuple[dict, dict]: Dictionaries that map each title (the first occurrence) and each id to the byte offset of its line.
+    """
+    titles, ids = {}, {}
+    offset = start
+    for line in jsonl_module.iterate_range_lines(file_path, start, end):
+        if line.strip():
+            book_list = jsonl_module.loads(line)
+            titles.setdefault(book_list.get("title"), offset)
+            ids.setdefault(str(book_list.get("id")), offset)
+        offset += len(line)
+    return titles, ids
+
+def get_list_index(file_path: str = LIST_PATH, n_workers: int = 1) -> dict:
+    """
+    Function that returns the index of the list file, which maps the title and the id of each list to the byte offset of its line.
+    The index is built in one pass over the file and saved next to the columnar copies of the datasets. It is built again when the size or modification time of the file changes.
+
+    Args:
+        file_path (str, optional): Path of the list file. Defaults to "./data/list.json".
+        n_workers (int, optional): Number of processes used to build the index. Defaults to 1.
+
+    Returns:
+        dict: Dictionary with the fingerprint of the file and the "titles" and "ids" dictionaries.
+    """
+    #Here we get the fingerprint of the file and the path of the saved index
+    fingerprint = get_file_fingerprint(file_path)
+    index_path = os.path.join(CACHE_DIRECTORY, os.path.basename(file_path) + ".index.json")
+
+    #If the index was already loaded and the file didn't change, we return it
+    if file_path in list_indexes and list_indexes[file_path]["fingerprint"] == fingerprint:
+        return list_indexes[file_path]
+
+    #Here we read the saved index if it exists
+    index = None
+    if os.path.exists(index_path):
+        with open(index_path, "r") as index_file:
+            index = json.load(index_file)
+
+    #If the index doesn't exist or the file changed, we build it again in one pass over the file
+    if index is None or index.get("fingerprint") != fingerprint:
+        partial_indexes = jsonl_module.map_file_ranges(file_path, index_list_range, n_workers=n_workers)
+
+        #Here we merge the partial indexes in the file order, keeping the first occurrence of each title and id
+        index = {"fingerprint": fingerprint, "titles": {}, "ids": {}}
+        for titles, ids in partial_indexes:
+            for title, offset in titles.items():
+                index["titles"].setdefault(title, offset)
+            for list_id, offset in ids.items():
+                index["ids"].setdefault(list_id, offset)
+
+        #Here we save the index
+        os.makedirs(CACHE_DIRECTORY, exist_ok=True)
+        with open(index_path, "w") as index_file:
+            json.dump(index, index_file)
+
+    list_indexes[file_path] = index
+    return index
+
+def get_list_books(title: str = None, list_id = None, file_path: str = LIST_PATH) -> list:
+    """
+    Function that returns the books of a list given its title or its id. Only the line of the list is read and decoded, using the index of the list file.
+
+    Args:
+        title (str, optional): Title of the list. Defaults to None.
+        list_id (optional): Id of the list. It is used if the title is None. Defaults to None.
+        file_path (str, optional): Path of the list file. Defaults to "./data/list.json".
+
+    Returns:
+        list: List with the books of the list or None if the list doesn't exist.
+    """
+    #Here we assert that the title or the id is given
+    assert title is not None or list_id is not None, "The title or the id of the list must be given."
+
+    #Here we get the byte offset of the line of the list
+    index = get_list_index(file_path)
+    offset = index["titles"].get(title) if title is not None else index["ids"].get(str(list_id))
+    if offset is None:
+        return None
+
+    #Here we read and decode only the line of the list
+    with open(file_path, "rb") as list_file:
+        return jsonl_module.read_record_at(list_file, offset).get("books")
+
+def get_lists_books(titles: List[str], file_path: str = LIST_PATH) -> dict:
+    """
+    Function that returns the books of many lists given their titles. The lines are read in the file order with a single open file.
+
+    Args:
+        titles (List[str]): Titles of the lists.
+        file_path (str, optional): Path of the list file. Defaults to "./data/list.json".
+
+    Returns:
+        dict: Dictionary that maps each title to the books of its list (or None if the list doesn't exist).
+    """
+    #Here we get the byte offsets of the lines of the lists
+    index = get_list_index(file_path)
+    offsets = {title: index["titles"].get(title) for title in titles}
+
+    #Here we read the lines sorted by offset, so that the file is read forward
+    lists_books = {title: None for title in titles}
+    with open(file_path, "rb") as list_file:
+        for title, offset in sorted(((title, offset) for title, offset in offsets.items() if offset is not None), key=lambda pair: pair[1]):
+            lists_books[title] = jsonl_module.read_record_at(list_file, offset).get("books")
+
+    return lists_books
+
+def find_list_books_in_range(file_path: str, start: int, end: int, title: str) -> list:
+    """
+    Function that returns the books of the first list with a given title inside a byte range of the list file.
+
+    Args:
+        file_path (str): Path of the list file.
+        start (int): Byte offset where the range begins.
+        end (int): Byte offset where the range ends.
+        title (str): Title of the list.
+
+    Returns:
+        list: List with the books of the list or None if the list is not in the range.
+    """
+    for object in jsonl_module.iterate_range_records(file_path, start, end):
+        if object.get("title") == title:
+            return object.get("books")
+    return None
+
+def is_id_column(column_name) -> bool:
+    """
+    Function that checks if a column stores identifiers or codes (e.g. id, author_id, isbn or asin), whose strings can have leading zeros and must not be converted to numbers.
+
+    Args:
+        column_name: Name of the column.
+
+    Returns:
+        bool: True if the column stores identifiers.
+    """
+    column_name = str(column_name).lower()
+    return column_name == "id" or column_name.endswith("_id") or column_name in ["isbn", "isbn13", "asin"]
+
+def compact_dataset(dataset: pd.DataFrame, categorical_threshold: float = 0.5, report: bool = False) -> pd.DataFrame:
+    """
+    Function that converts the columns of a copy of a dataframe to smaller data types:
+    object columns with only numbers (except the identifier columns, see is_id_column) are converted to numeric columns, integer columns are downcast to the smallest integer type, float columns that only have whole numbers and NaN are converted to the smallest nullable integer type,
+    and string columns with few distinct values (e.g. language or format) are converted to categorical columns. Columns with non-integer floats are not changed, so that no precision is lost.
+
+    Args:
+        dataset (pd.DataFrame): Dataframe with the dataset.
+        categorical_threshold (float, optional): Maximum ratio between the number of distinct values and the number of rows of a string column to convert it to a categorical column. Defaults to 0.5.
+        report (bool, optional): If True, a dataframe with the memory usage of each column before and after the conversion is also returned. Defaults to False.
+
+    Returns:
+        dataset (pd.DataFrame): New dataframe with the compacted columns. The given dataframe is not modified.
+        memory_report (pd.DataFrame): Dataframe with the data type and memory usage in bytes of each column before and after the conversion. Only returned if report is True.
+    """
+    #Here we store the data types and memory usage before the conversion
+    dtypes_before = dataset.dtypes.astype(str)
+    memory_before = dataset.memory_usage(deep=True, index=False)
+
+    #Here we work on a shallow copy, so that replacing its columns doesn't modify the dataframe of the caller
+    dataset = dataset.copy(deep=False)
+
+    for column_name in dataset.columns:
+        column = dataset[column_name]
+
+        #Here we convert the object columns that only have numbers and NaN (e.g. columns where the empty strings were replaced by NaN) to numeric columns. The identifiers are kept as they are, since they can have leading zeros
+        if pd.api.types.is_object_dtype(column) and not is_id_column(column_name):
+            numeric_column = pd.to_numeric(column, errors="coerce")
+            if numeric_column.notna().sum() == column.notna().sum() and column.notna().any():
+                column = numeric_column
+                dataset[column_name] = column
+
+        #Here we downcast the integer columns
+        if pd.api.types.is_integer_dtype(column) and not pd.api.types.is_extension_array_dtype(column):
+            dataset[column_name] = pd.to_numeric(column, downcast="integer")
+
+        #Here we convert the float columns with only whole numbers to the smallest nullable integer type that can store their values
+        elif pd.api.types.is_float_dtype(column):
+            values = column.dropna()
+            if len(values) > 0 and (values == np.floor(values)).all():
+                for integer_type in ["Int8", "Int16", "Int32", "Int64"]:
+                    if np.iinfo(integer_type.lower()).min <= values.min() and values.max() <= np.iinfo(integer_type.lower()).max:
+                        dataset[column_name] = column.astype(integer_type)
+                        break
+
+        #Here we convert the string columns with few distinct values to categorical columns. Columns with lists or dictionaries can't be converted
+        elif pd.api.types.is_object_dtype(column) or pd.api.types.is_string_dtype(column):
+            try:
+                if len(column) > 0 and column.nunique() <= categorical_threshold * len(column):
+                    dataset[column_name] = column.astype("category")
+            except TypeError:
+                pass
+
+    #Here we return the dataset and, if we want it, the memory report
+    if report:
+        memory_after = dataset.memory_usage(deep=True, index=False)
+        memory_report = pd.DataFrame({
+            "dtype_before": dtypes_before,
+            "dtype_after": dataset.dtypes.astype(str),
+            "bytes_before": memory_before,
+            "bytes_after": memory_after
+        })
+        memory_report.loc["total"] = ["", "", memory_before.sum(), memory_after.sum()]
+        return dataset, memory_report
+    return dataset
 
 def set_column_as_index(dataset: pd.DataFrame, column_name: str) -> pd.DataFrame:
     """
@@ -96,13 +575,59 @@ def sort_dataset_by_column(dataset: pd.DataFrame, column_name: List[str], number
     Returns:
         authors_dataset (pd.DataFrame): Dataframe with the authors dataset.
     """
-    
+    #Here we get the list of columns to sort by and the values we sort, applying the key function to each column as the sort_values function does
+    columns = [column_name] if isinstance(column_name, str) else list(column_name)
+    sort_values = dataset[columns] if key is None else dataset[columns].apply(key)
+
+    #If we only want the first rows of numeric columns without NaN, we select them without sorting the whole dataset using the nlargest (or nsmallest) function
+    #The next columns break the ties of the first one and the remaining ties are broken by the position of the rows, as a stable sort does
+    if number_of_rows < len(dataset) and isinstance(ascending, bool) and all(pd.api.types.is_numeric_dtype(sort_values[column]) for column in columns) and not sort_values.isna().any().any():
+        sort_values = sort_values.reset_index(drop=True)
+        if ascending:
+            selected_rows = sort_values.nsmallest(number_of_rows, columns, keep="first")
+        else:
+            selected_rows = sort_values.nlargest(number_of_rows, columns, keep="first")
+        return dataset.iloc[selected_rows.index]
+
     #Here we sort the dataset by the number of works in descending order.
-    dataset = dataset.sort_values(by=column_name, key = key, ascending=ascending)
+    dataset = dataset.sort_values(by=column_name, key = key, ascending=ascending, kind="stable")
     #Here we return the first n rows
     return dataset.head(number_of_rows)
 
-def count_column_values(dataframe_column: pd.Series, limit: int = 10, general_name: str = "other") -> pd.Series:
+def get_top_rows(dataset_name: str, column_name: List[str], number_of_rows: int = 10, key: callable = None, ascending: bool = False, columns: list = None, dtype: dict = None, chunksize: int = 10000, keep_columns: list = None, row_filter = None) -> pd.DataFrame:
+    """
+    Function that returns the first rows of a dataset sorted by a column without loading the whole dataset into memory.
+    The dataset is read in chunks and only the best rows seen so far are kept, so it gives the same rows as sort_dataset_by_column applied to the whole dataset.
+
+    Args:
+        dataset_name (str): Name of the dataset.
+        column_name (str): Name of the column to sort by.
+        number_of_rows (int, optional): Number of rows to return. Defaults to 10.
+        key (callable, optional): Function to apply to the column values. Defaults to None.
+        ascending (bool, optional): If True, the sorting is ascending. Defaults to False.
+        columns (list, optional): List of columns to drop. Defaults to None.
+        dtype (dict, optional): Dictionary with the data types of the columns. Defaults to None.
+        chunksize (int, optional): Number of rows to read in each chunk. Defaults to 10000.
+        keep_columns (list, optional): List of columns to keep. Defaults to None.
+        row_filter (str or callable, optional): Query string or function that receives a dataframe and returns a boolean mask. Defaults to None.
+
+    Returns:
+        pd.DataFrame: Dataframe with the first rows.
+    """
+    #Here we store the best rows seen so far
+    top_rows = None
+
+    for chunk in get_data_chunks(dataset_name, columns=columns, dtype=dtype, chunksize=chunksize, keep_columns=keep_columns, row_filter=row_filter):
+        #Here we select the best rows among the previous best rows and the new chunk. The previous rows go first, so they win the ties as in a stable sort
+        candidates = chunk if top_rows is None else pd.concat([top_rows, chunk])
+        top_rows = sort_dataset_by_column(candidates, column_name, number_of_rows=number_of_rows, key=key, ascending=ascending)
+
+    #If the dataset is empty, we return an empty dataframe
+    if top_rows is None:
+        return pd.DataFrame()
+    return top_rows
+
+def count_column_values(dataframe_column: pd.Series, limit: int = 10, general_name: str = "other", capacity: int = None) -> pd.Series:
     """
     Function that counts the values of a column until a limit and summarizes the rest as "general_name".
 
@@ -110,10 +635,30 @@ def count_column_values(dataframe_column: pd.Series, limit: int = 10, general_na
         dataframe_column (pd.Series): Dataframe column.
         limit (int, optional): Number of rows to return. Defaults to 10.
         general_name (str, optional): Name of the general category. Defaults to "other".
+        capacity (int, optional): If it is not None, the values are counted approximately with a SpaceSaving summary that keeps at most this number of counters, and the bounds of the real counts are also returned. Defaults to None.
 
     Returns:
-        dataframe_column_counts (pd.Series): Dataframe column with the counts.
+        labels (list): List with the most frequent values and the general name.
+        values (list): List with the count of each label. If capacity is not None, the counts of the values are upper bounds of their real counts and the count of the general category is a lower bound.
+        bounds (list): List of (lower_bound, upper_bound) tuples with the bounds of the real count of each label, as the error_bounds method of the SpaceSaving summary. Only returned if capacity is not None.
     """
+    #If we want to count approximately, we only keep the counts of the most frequent values
+    if capacity is not None:
+        #Here we count the values that are not NaN, as the value_counts function does
+        summary = streaming_module.SpaceSaving(capacity)
+        summary.update_many(dataframe_column.dropna())
+
+        #Here we create the lists of labels, values and bounds of the most frequent values
+        error_bounds = summary.error_bounds(limit)
+        labels = [label for label, _, _ in error_bounds] + [general_name]
+        values = [upper_bound for _, _, upper_bound in error_bounds]
+        bounds = [(lower_bound, upper_bound) for _, lower_bound, upper_bound in error_bounds]
+
+        #The count of the general category is the total number of values minus the counts of the most frequent values. Since these counts can be overestimated, it is a lower bound, and the upper bound uses their lower bounds
+        values.append(summary.total - sum(values))
+        bounds.append((values[-1], summary.total - sum(lower_bound for lower_bound, _ in bounds)))
+        return labels, values, bounds
+
     #Here we count the values of the column and store them in a dictionary
     dataframe_column_counts = dict(dataframe_column.value_counts())
 
@@ -128,27 +673,77 @@ def count_column_values(dataframe_column: pd.Series, limit: int = 10, general_na
     #Here we return the labels and values lists
     return labels, values
 
-def standardize_time_column_to_period(dataset: pd.DataFrame, column_name: str) -> pd.DataFrame:
+def standardize_time_column_to_period(dataset: pd.DataFrame, column_name: str, return_errors: bool = False) -> pd.DataFrame:
     """
     Function that standardizes a column with dates to a period format.
 
     Args:
         dataset (pd.DataFrame): Dataframe with dataset.
         column_name (str): Name of the column to standardize. It can have string values in format "YYYY", "YYYY-MM" or "YYYY-MM-DD".
+        return_errors (bool, optional): If True, a boolean mask of the malformed dates is also returned. Defaults to False.
 
     Returns:
-        dataset (pd.DataFrame): Dataframe with the dataset.
+        dataset (pd.DataFrame): Dataframe with the dataset. The missing (NaN or empty strings) and malformed dates are converted to NaT.
+        error_mask (pd.Series): Boolean series that is True for the malformed dates. The missing dates are not errors. Only returned if return_errors is True.
     """
 
     #Here we assert that the column is a string column
-    assert dataset[column_name].dtype == "object", f"The {column_name} column is not a string column."
+    assert pd.api.types.is_object_dtype(dataset[column_name]) or pd.api.types.is_string_dtype(dataset[column_name]), f"The {column_name} column is not a string column."
 
-    #Finally we convert the column to a daily period column. This is done using the pd.Period function
-    dataset[column_name] = dataset[column_name].apply(lambda x: pd.Period(x, freq='D'))
+    #Here we parse all the dates of the column at once into the number of days since 1970-01-01
+    ordinals, error_mask = get_day_ordinals(dataset[column_name])
+
+    #Finally we convert the column to a daily period column. The period array is built directly from the day ordinals, without creating a pd.Period object per row
+    dataset[column_name] = pd.arrays.PeriodArray(ordinals, dtype=pd.PeriodDtype("D"))
 
     #Here we return the dataset
+    if return_errors:
+        return dataset, pd.Series(error_mask, index=dataset.index)
     return dataset
 
+@cache_module.memoize
+def get_day_ordinals(dates: pd.Series) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Function that converts a series of strings in format "YYYY", "YYYY-MM" or "YYYY-MM-DD" into the number of days since 1970-01-01 (the ordinals of daily Pandas Periods).
+    Missing months and days are replaced by 1, as pd.Period does.
+
+    Args:
+        dates (pd.Series): Series with the date strings.
+
+    Returns:
+        ordinals (np.ndarray): Array with the day ordinals. Missing (NaN or empty strings) and malformed dates have the NaT ordinal.
+        error_mask (np.ndarray): Boolean array that is True for the malformed dates.
+    """
+    #Here we convert the dates to strings and get the positions of the dates with a valid format
+    strings = dates.astype("string")
+    lengths = strings.str.len().fillna(0).to_numpy(dtype="int64")
+    valid = strings.str.fullmatch(r"\d{4}(?:-\d{2}(?:-\d{2})?)?").fillna(False).to_numpy(dtype=bool)
+
+    #Here we extract the year, month and day of each date using the length of the string to know which parts it has
+    year = pd.to_numeric(strings.str.slice(0, 4), errors="coerce").fillna(0).to_numpy(dtype="int64")
+    month = np.where(lengths >= 7, pd.to_numeric(strings.str.slice(5, 7), errors="coerce").fillna(0).to_numpy(dtype="int64"), 1)
+    day = np.where(lengths == 10, pd.to_numeric(strings.str.slice(8, 10), errors="coerce").fillna(0).to_numpy(dtype="int64"), 1)
+
+    #Here we check that the months and days exist, taking leap years into account
+    is_leap_year = ((year % 4 == 0) & (year % 100 != 0)) | (year % 400 == 0)
+    days_in_month = np.array([0, 31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31])[np.clip(month, 0, 12)] + ((month == 2) & is_leap_year)
+    valid &= (month >= 1) & (month <= 12) & (day >= 1) & (day <= days_in_month)
+
+    #Here we compute the number of days since 1970-01-01 of each date in the proleptic Gregorian calendar. The computation counts years from March so that the leap day is the last day of the year
+    shifted_year = year - (month <= 2)
+    era = np.floor_divide(shifted_year, 400)
+    year_of_era = shifted_year - era * 400
+    day_of_year = (153 * np.where(month > 2, month - 3, month + 9) + 2) // 5 + day - 1
+    day_of_era = year_of_era * 365 + year_of_era // 4 - year_of_era // 100 + day_of_year
+    ordinals = era * 146097 + day_of_era - 719468
+
+    #Here we set the NaT ordinal for the missing and malformed dates. Only the dates that are not missing are reported as errors. The empty strings (e.g. in the chunks where they were not replaced by NaN) are missing dates
+    ordinals[~valid] = np.iinfo(np.int64).min
+    present = strings.str.strip().str.len().fillna(0).to_numpy(dtype="int64") > 0
+    error_mask = ~valid & present
+
+    return ordinals, error_mask
+
 def historical_data(books_dataset:pd.DataFrame, column_name: str, year: int) -> pd.DataFrame:
     """
     Function that returns a dataframe with historical data for a given year for the books dataset.
@@ -187,6 +782,7 @@ def historical_data(books_dataset:pd.DataFrame, column_name: str, year: int) ->
     })
 
 
+@cache_module.memoize(dependencies=["YearlyStats"])
 def historical_dataframe(books_dataset:pd.DataFrame, column_name: str) -> pd.DataFrame:
     """
     Function that returns a dataframe with historical data for all the years for the books dataset.
@@ -202,23 +798,157 @@ def historical_dataframe(books_dataset:pd.DataFrame, column_name: str) -> pd.Dat
     #Here we assert that the column is a period column
     assert books_dataset[column_name].dtype == "period[D]", f"The {column_name} column is not a Pandas Period column."
 
-    #Here we obtain all the years that appear in the column. We use the unique() function to get the unique values
-    years = np.sort(books_dataset[column_name].dt.year.unique())
-
-    #Here we create an empty dataframe
-    historical_dataframe = pd.DataFrame()
-
-    #Here we iterate over the years and concatenate the historical data for each year
-    for year in years:
-        historical_dataframe = pd.concat([historical_dataframe, historical_data(books_dataset, column_name, year)])
-    
-    #Finally we set the year column as index
-    historical_dataframe.set_index("Year", inplace=True)
+    #Here we compute the historical data of all the years in a single pass over the dataset
+    historical_dataframe = YearlyStats(column_name).update(books_dataset).to_dataframe()
 
     #Here we return the historical dataframe
     return historical_dataframe
 
 
+class YearlyStats:
+    """
+    Class that computes the total number of books, the total number of pages, the most prolific month and the longest book of every year of the books dataset.
+    The statistics are computed with groupby operations over all the years at once and they can be updated with new books without computing them again.
+
+    Args:
+        column_name (str, optional): Name of the Pandas Period column with the publication dates. Defaults to "original_publication_date".
+    """
+    def __init__(self, column_name: str = "original_publication_date"):
+        self.column_name = column_name
+        #Here we store, for each year, the number of books, the number of pages and the number of pages and title of the longest book
+        self.totals = pd.DataFrame({"books": pd.Series(dtype="int64"), "pages": pd.Series(dtype="float64"), "longest_pages": pd.Series(dtype="float64"), "longest_book": pd.Series(dtype="object")})
+        #Here we store the number of books of each (year, month) pair and the position of its first book among the dated books. We need them to update the most prolific month of each year
+        self.month_counts = pd.Series(dtype="int64", index=pd.MultiIndex.from_arrays([[], []], names=["year", "month"]))
+        self.month_first_seen = pd.Series(dtype="int64", index=pd.MultiIndex.from_arrays([[], []], names=["year", "month"]))
+
+    def _aggregate(self, books_dataset: pd.DataFrame) -> Tuple[pd.DataFrame, pd.Series, pd.Series]:
+        """
+        Method that computes the statistics of a dataset of books grouped by year.
+
+        Args:
+            books_dataset (pd.DataFrame): Dataframe with the books.
+
+        Returns:
+            Tuple[pd.DataFrame, pd.Series, pd.Series]: Dataframe with the totals of each year, series with the number of books of each (year, month) pair and series with the position of the first book of each pair.
+        """
+        #Here we create a dataframe with only the information we need. We drop the books without a publication date before getting the years, since the year of NaT is -1 in recent versions of pandas
+        dated = books_dataset[self.column_name].notna().to_numpy()
+        books_dataset = books_dataset[dated]
+        dates = books_dataset[self.column_name]
+        books = pd.DataFrame({
+            "year": dates.dt.year.to_numpy(),
+            "month": dates.dt.month.to_numpy(),
+            "pages": pd.to_numeric(books_dataset.num_pages, errors="coerce").to_numpy(dtype="float64", na_value=np.nan),
+            "title": books_dataset.title.to_numpy(dtype="object")
+        })
+        books = books.astype({"year": "int64", "month": "int64"})
+
+        #Here we compute the number of books and pages of each year
+        grouped_books = books.groupby("year")
+        totals = pd.DataFrame({"books": grouped_books.size(), "pages": grouped_books["pages"].sum()})
+
+        #Here we get the longest book of each year. The idxmax function returns the first book with the maximum number of pages
+        books_with_pages = books.dropna(subset=["pages"])
+        longest_books = books_with_pages.loc[books_with_pages.groupby("year")["pages"].idxmax()].set_index("year")
+        totals["longest_pages"] = longest_books["pages"].reindex(totals.index)
+        totals["longest_book"] = longest_books["title"].reindex(totals.index)
+
+        #Here we count the books of each (year, month) pair and get the position of the first book of each pair
+        grouped_months = books.groupby(["year", "month"])
+        month_counts = grouped_months.size()
+        month_first_seen = pd.Series(books.index.to_numpy(), index=books.index).groupby([books["year"], books["month"]]).min()
+
+        return totals, month_counts, month_first_seen
+
+    def update(self, new_rows: pd.DataFrame) -> "YearlyStats":
+        """
+        Method that updates the statistics with new books.
+
+        Args:
+            new_rows (pd.DataFrame): Dataframe with the new books.
+
+        Returns:
+            YearlyStats: The updated object.
+        """
+        #Here we assert that the column is a period column
+        assert new_rows[self.column_name].dtype == "period[D]", f"The {self.column_name} column is not a Pandas Period column."
+
+        #Here we compute the statistics of the new books and add them to the current ones
+        return self._merge_aggregates(*self._aggregate(new_rows))
+
+    def merge(self, other: "YearlyStats") -> "YearlyStats":
+        """
+        Method that adds the statistics of another object, computed over the books that come after the books of this object (e.g. the next part of the file).
+
+        Args:
+            other (YearlyStats): Statistics of the next books.
+
+        Returns:
+            YearlyStats: The updated object.
+        """
+        return self._merge_aggregates(other.totals, other.month_counts, other.month_first_seen)
+
+    def _merge_aggregates(self, new_totals: pd.DataFrame, new_month_counts: pd.Series, new_month_first_seen: pd.Series) -> "YearlyStats":
+        """
+        Method that adds the totals of each year and the number of books of each (year, month) pair of new books to the current statistics.
+
+        Args:
+            new_totals (pd.DataFrame): Dataframe with the totals of each year of the new books.
+            new_month_counts (pd.Series): Series with the number of new books of each (year, month) pair.
+            new_month_first_seen (pd.Series): Series with the position of the first new book of each (year, month) pair among the new books.
+
+        Returns:
+            YearlyStats: The updated object.
+        """
+        #Here we align the old and new statistics over all the years
+        years = self.totals.index.union(new_totals.index)
+        old_totals = self.totals.reindex(years)
+        new_totals = new_totals.reindex(years)
+
+        #Here we add the number of books and pages
+        totals = pd.DataFrame(index=years)
+        totals["books"] = old_totals["books"].fillna(0).add(new_totals["books"].fillna(0)).astype("int64")
+        totals["pages"] = old_totals["pages"].fillna(0).add(new_totals["pages"].fillna(0))
+
+        #Here we keep the old longest book unless a new book is strictly longer, so that the first longest book is kept
+        take_new = (new_totals["longest_pages"] > old_totals["longest_pages"]) | (old_totals["longest_pages"].isna() & new_totals["longest_pages"].notna())
+        totals["longest_pages"] = old_totals["longest_pages"].where(~take_new, new_totals["longest_pages"])
+        totals["longest_book"] = old_totals["longest_book"].where(~take_new, new_totals["longest_book"])
+
+        #Here we add the number of books of each (year, month) pair. The new books come after the current ones, so their positions are shifted by the number of current books and the first position of each pair is kept
+        self.month_counts = self.month_counts.add(new_month_counts, fill_value=0).astype("int64")
+        new_month_first_seen = new_month_first_seen + int(self.totals["books"].sum())
+        self.month_first_seen = pd.concat([self.month_first_seen, new_month_first_seen]).groupby(level=["year", "month"]).min().astype("int64")
+        self.totals = totals
+
+        return self
+
+    def to_dataframe(self) -> pd.DataFrame:
+        """
+        Method that returns the statistics as a dataframe with one row for each year.
+
+        Returns:
+            pd.DataFrame: Dataframe with the total number of books, the total number of pages, the most prolific month and the longest book of each year.
+        """
+        #Here we get the most prolific month of each year. We sort the (year, month) pairs by number of books and keep the first pair of each year
+        #Ties are broken with the month whose first book comes first, as value_counts().idxmax() does in the historical_data function
+        month_counts = pd.DataFrame({"count": self.month_counts, "first_seen": self.month_first_seen.reindex(self.month_counts.index)}).reset_index()
+        month_counts = month_counts.sort_values(["year", "count", "first_seen"], ascending=[True, False, True])
+        prolific_months = month_counts.drop_duplicates("year").set_index("year")["month"]
+
+        #Here we build the dataframe with the same columns as the historical_data function
+        historical_dataframe = pd.DataFrame({
+            "Year": self.totals.index.astype("int64"),
+            "Total Number of Books": self.totals["books"].to_numpy(dtype="int64"),
+            "Total Number of Pages": self.totals["pages"].to_numpy(dtype="int64"),
+            "Most Prolific Month": prolific_months.reindex(self.totals.index).to_numpy(),
+            "Longest Book": self.totals["longest_book"].to_numpy()
+        })
+
+        #Finally we sort the years and set the year column as index
+        return historical_dataframe.sort_values("Year").set_index("Year")
+
+
 def get_yearly_stats(books_df, year):
     """
     Function that returns a dictionary with information about the books published in a given year (Made by ChatGPT)
@@ -249,7 +979,9 @@ def get_yearly_stats(books_df, year):
     total_pages = books_in_year['num_pages'].sum()
 
     # Extract the month and year from the publication date
-    books_in_year['month'] = books_in_year['original_publication_date'].dt.month
+    # We silence the chained assignment warning only here, since books_in_year is a filtered view of books_df
+    with pd.option_context('mode.chained_assignment', None):
+        books_in_year['month'] = books_in_year['original_publication_date'].dt.month
 
     # Find the most prolific month in terms of book publications
     most_prolific_month = books_in_year['month'].value_counts().idxmax()
@@ -266,7 +998,7 @@ def get_yearly_stats(books_df, year):
 
 def build_yearly_stats_dataframe(books_df):
     """
-    Function that returns a dataframe with information about the books published in each year (Made by ChatGPT)
+    Function that returns a dataframe with information about the books published in each year (Made by ChatGPT, the statistics are now computed in a single pass with YearlyStats)
 
     Args:
         books_df (pd.DataFrame): Dataframe with the books dataset.
@@ -275,34 +1007,155 @@ def build_yearly_stats_dataframe(books_df):
         yearly_stats_df (pd.DataFrame): Dataframe with the information.
     """
     # Extract unique years from the "original_publication_date" column
-    unique_years = books_df['original_publication_date'].dt.year.unique()
-
-    # Create a list of dictionaries to store yearly statistics
-    yearly_stats_list = []
+    unique_years = books_df['original_publication_date'].dropna().dt.year.unique().astype(int)
 
-    # Calculate and populate statistics for each year
-    for year in unique_years:
-        yearly_stats = get_yearly_stats(books_df, year)
-        yearly_stats['Year'] = year
-        yearly_stats_list.append(yearly_stats)
-
-    # Convert the list of dictionaries to a DataFrame
-    yearly_stats_df = pd.DataFrame(yearly_stats_list)
-    yearly_stats_df.set_index('Year', inplace=True)
+    # Calculate the statistics of all the years at once and keep the years in the order in which they appear
+    yearly_stats_df = YearlyStats('original_publication_date').update(books_df).to_dataframe()
+    yearly_stats_df = yearly_stats_df.reindex(unique_years)
 
     return yearly_stats_df
 
-def build_dict_of_books(books_dataframe: pd.DataFrame, author_ids: list)-> dict:
+class AuthorBooksIndex:
+    """
+    Class that stores the books of each author grouped in CSR style: the books are sorted by author once, and the books of the i-th author are values[offsets[i]:offsets[i + 1]].
+    Looking up k authors takes a binary search for each of them and returns slices of the sorted array, instead of scanning the whole books dataframe.
+    """
+    def __init__(self, author_ids: np.ndarray, offsets: np.ndarray, values: np.ndarray):
+        #Here we store the sorted distinct author ids, the offsets where the books of each author begin and the books sorted by author
+        self.author_ids = author_ids
+        self.offsets = offsets
+        self.values = values
+
+    def __len__(self) -> int:
+        return len(self.author_ids)
+
+    @classmethod
+    def build(cls, books_dataframe: pd.DataFrame, author_column: str = "author_id", value_column: str = "title") -> "AuthorBooksIndex":
+        """
+        Method that builds the index from the books dataset.
+
+        Args:
+            books_dataframe (pd.DataFrame): Dataframe with the books dataset.
+            author_column (str, optional): Name of the column with the author ids. Defaults to "author_id".
+            value_column (str, optional): Name of the column with the values to store for each book. Defaults to "title".
+
+        Returns:
+            AuthorBooksIndex: Index of the books of each author.
+        """
+        #Here we ignore the books without author, as the groupby function does
+        books_dataframe = books_dataframe[books_dataframe[author_column].notna()]
+        authors = books_dataframe[author_column].to_numpy()
+
+        #Here we sort the books by author. The sort is stable, so the books of each author keep the order of the dataframe
+        order = np.argsort(authors, kind="stable")
+        sorted_authors = authors[order]
+
+        #Here we get the distinct authors and the position where the books of each one begin
+        author_ids, starts = np.unique(sorted_authors, return_index=True)
+        offsets = np.append(starts, len(sorted_authors))
+
+        return cls(author_ids, offsets, books_dataframe[value_column].to_numpy()[order])
+
+    def get_positions(self, author_ids: list) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Method that finds the positions of some authors in the index with a binary search.
+
+        Args:
+            author_ids (list): List with the author ids.
+
+        Returns:
+            author_ids (np.ndarray): Sorted distinct author ids that are in the index.
+            positions (np.ndarray): Positions of these authors in the index.
+        """
+        author_ids = np.unique(np.asarray(author_ids))
+        positions = np.searchsorted(self.author_ids, author_ids)
+        #Here we keep only the authors that are in the index
+        found = positions < len(self.author_ids)
+        found[found] = self.author_ids[positions[found]] == author_ids[found]
+        return author_ids[found], positions[found]
+
+    def lookup(self, author_id) -> np.ndarray:
+        """
+        Method that returns the books of an author.
+
+        Args:
+            author_id: Id of the author.
+
+        Returns:
+            np.ndarray: Slice of the index with the books of the author. It is empty if the author is not in the index.
+        """
+        _, positions = self.get_positions([author_id])
+        if len(positions) == 0:
+            return self.values[:0]
+        return self.values[self.offsets[positions[0]]:self.offsets[positions[0] + 1]]
+
+    def lookup_many(self, author_ids: list) -> dict:
+        """
+        Method that returns the books of some authors.
+
+        Args:
+            author_ids (list): List with the author ids.
+
+        Returns:
+            dict: Dictionary with the slice of books of each author that is in the index, sorted by author id.
+        """
+        author_ids, positions = self.get_positions(author_ids)
+        return {author_id: self.values[self.offsets[position]:self.offsets[position + 1]] for author_id, position in zip(author_ids.tolist(), positions)}
+
+    def to_dict(self, author_ids: list = None) -> dict:
+        """
+        Method that returns the books of some authors as a dictionary of lists, as the build_dict_of_books function.
+
+        Args:
+            author_ids (list, optional): List with the author ids. Defaults to all the authors of the index.
+
+        Returns:
+            dict: Dictionary with the list of books of each author that is in the index, sorted by author id.
+        """
+        if author_ids is None:
+            author_ids = self.author_ids
+        return {author_id: books.tolist() for author_id, books in self.lookup_many(author_ids).items()}
+
+    def save(self, file_path: str) -> None:
+        """
+        Method that saves the index to a numpy .npz file.
+
+        Args:
+            file_path (str): Path of the file.
+        """
+        np.savez(file_path, author_ids=self.author_ids, offsets=self.offsets, values=self.values)
+
+    @classmethod
+    def load(cls, file_path: str) -> "AuthorBooksIndex":
+        """
+        Method that loads an index saved with the save method.
+
+        Args:
+            file_path (str): Path of the file.
+
+        Returns:
+            AuthorBooksIndex: Index of the books of each author.
+        """
+        #The titles are stored as an array of Python objects, so we need to allow pickle to read them. Only load files created by the save method
+        with np.load(file_path, allow_pickle=True) as data:
+            return cls(data["author_ids"], data["offsets"], data["values"])
+
+def build_dict_of_books(books_dataframe: pd.DataFrame, author_ids: list, index: AuthorBooksIndex = None)-> dict:
     """
     Function that returns a dictionary with the book names of the authors in the author_ids list.
 
     Args:
         books_dataframe (pd.DataFrame): Dataframe with the books dataset.
         author_ids (list): List with the author ids.
+        index (AuthorBooksIndex, optional): Index of the books of each author. If it is given, the books are looked up in it instead of filtering the dataframe, which is much faster for many calls. Defaults to None.
 
     Returns:
         dict_of_books (dict): Dictionary with the book names of the authors in the author_ids list.
     """
+    #If we have an index, we look up the authors in it
+    if index is not None:
+        return index.to_dict(author_ids)
+
     #Here we define a new filtered dataframe containing only books of the authors in the author_ids list
     #We use the isin() function in order to obtain True when the author_id is in the author_ids list and False otherwise
     filtered_books_dataframe = books_dataframe[books_dataframe.author_id.isin(author_ids)]
@@ -398,6 +1251,122 @@ def get_ratings_above_limit_ratio(average_rating_dist: str, limit: int = 4) -> f
     #Finally we return the ratio of ratings above the limit
     return ratings_above_limit_sum/total_ratings
 
+#Here we define the labels that appear in the rating distribution strings
+RATING_LABELS = ["5", "4", "3", "2", "1", "total"]
+
+def parse_rating_counts(rating_dist: pd.Series) -> np.ndarray:
+    """
+    Function that parses a series of rating distribution strings (e.g. "5:123|4:45|3:10|2:3|1:1|total:182") into the number of ratings of each star and the total number of ratings, in the order of RATING_LABELS.
+    The missing labels and values are counted as 0.
+
+    Args:
+        rating_dist (pd.Series): Series with the rating distribution strings.
+
+    Returns:
+        np.ndarray: Integer matrix with one row per string and one column per label.
+    """
+    counts = np.zeros((len(rating_dist), len(RATING_LABELS)), dtype="int64")
+
+    #Here we extract the count of each label with a vectorized regular expression over the whole series
+    #If pyarrow is installed we use its compiled regular expressions, which are much faster than the pandas string methods
+    try:
+        import pyarrow as pa
+        import pyarrow.compute as pc
+        arrow_rating_dist = pa.array(rating_dist, type=pa.string(), from_pandas=True)
+        for i, label in enumerate(RATING_LABELS):
+            label_counts = pc.struct_field(pc.extract_regex(arrow_rating_dist, rf"(?:^|\|){label}:(?P<count>\d+)"), "count")
+            counts[:, i] = pc.fill_null(pc.cast(label_counts, pa.int64()), 0).to_numpy(zero_copy_only=False)
+    except ImportError:
+        string_rating_dist = rating_dist.astype("string")
+        for i, label in enumerate(RATING_LABELS):
+            label_counts = string_rating_dist.str.extract(rf"(?:^|\|){label}:(\d+)", expand=False)
+            counts[:, i] = pd.to_numeric(label_counts).fillna(0).astype("int64").to_numpy()
+
+    return counts
+
+def parse_rating_dist_column(dataset: pd.DataFrame, column_name: str = "rating_dist") -> pd.DataFrame:
+    """
+    Function that parses a column of rating distribution strings (e.g. "5:123|4:45|3:10|2:3|1:1|total:182") into integer columns with the number of ratings of each star and the total number of ratings.
+    The new columns are called "<column_name>_5", ..., "<column_name>_1" and "<column_name>_total". If they already exist, the column is not parsed again.
+
+    Args:
+        dataset (pd.DataFrame): Dataframe with the dataset.
+        column_name (str, optional): Name of the column with the rating distribution strings. Defaults to "rating_dist".
+
+    Returns:
+        dataset (pd.DataFrame): Dataframe with the dataset and the new columns.
+    """
+    #Here we define the names of the new columns
+    count_columns = [f"{column_name}_{label}" for label in RATING_LABELS]
+
+    #If the columns were already created, we return the dataset as it is
+    if all(count_column in dataset.columns for count_column in count_columns):
+        return dataset
+
+    #Here we parse the strings and add a column for each label
+    counts = parse_rating_counts(dataset[column_name])
+    for i, count_column in enumerate(count_columns):
+        dataset[count_column] = counts[:, i]
+
+    #Here we return the dataset
+    return dataset
+
+@cache_module.memoize(dependencies=["parse_rating_counts", "get_ratio_from_counts", "RATING_LABELS"])
+def get_ratings_above_limit_ratio_values(rating_dist: pd.Series, limit: int = 4) -> np.ndarray:
+    """
+    Function that returns the ratio of ratings above a limit of each rating distribution string of a series. It doesn't modify the series, so its results can be cached.
+
+    Args:
+        rating_dist (pd.Series): Series with the rating distribution strings.
+        limit (int, optional): Limit to use. Defaults to 4.
+
+    Returns:
+        np.ndarray: Array with the ratio of ratings above the limit of each string.
+    """
+    counts = parse_rating_counts(rating_dist)
+    #The first columns of the counts are the stars from 5 to 1, so the stars above the limit are the first 6 - limit columns
+    return get_ratio_from_counts(counts[:, :6 - limit].sum(axis=1), counts[:, -1])
+
+def get_ratio_from_counts(ratings_above_limit: np.ndarray, total_ratings: np.ndarray) -> np.ndarray:
+    """
+    Function that divides the number of ratings above a limit by the total number of ratings. The ratio is 0 when there are no ratings.
+
+    Args:
+        ratings_above_limit (np.ndarray): Number of ratings above the limit of each row.
+        total_ratings (np.ndarray): Total number of ratings of each row.
+
+    Returns:
+        np.ndarray: Ratio of each row.
+    """
+    return np.divide(ratings_above_limit, total_ratings, out=np.zeros(len(total_ratings), dtype="float64"), where=total_ratings != 0)
+
+def get_ratings_above_limit_ratio_column(dataset: pd.DataFrame, limit: int = 4, column_name: str = "rating_dist") -> pd.Series:
+    """
+    Function that returns the ratio of ratings above a limit for every row of a dataset. It gives the same values as applying get_ratings_above_limit_ratio to the column.
+    If the count columns of parse_rating_dist_column exist, they are reused. Otherwise the strings are parsed without modifying the dataset (and the result can be cached with the cache_module).
+
+    Args:
+        dataset (pd.DataFrame): Dataframe with the dataset.
+        limit (int, optional): Limit to use. Defaults to 4.
+        column_name (str, optional): Name of the column with the rating distribution strings. Defaults to "rating_dist".
+
+    Returns:
+        pd.Series: Series with the ratio of ratings above the limit of each row.
+    """
+    #First we assert that the limit is between 1 and 5
+    assert 1 <= limit <= 5, f"The limit must be between 1 and 5. The limit {limit} is not valid."
+
+    #If the rating distribution column was already parsed, we add the number of ratings above the limit and get the total number of ratings from the count columns
+    count_columns = [f"{column_name}_{label}" for label in RATING_LABELS]
+    if all(count_column in dataset.columns for count_column in count_columns):
+        ratings_above_limit = dataset[[f"{column_name}_{rating}" for rating in range(limit, 6)]].to_numpy().sum(axis=1)
+        ratio = get_ratio_from_counts(ratings_above_limit, dataset[f"{column_name}_total"].to_numpy())
+    else:
+        ratio = get_ratings_above_limit_ratio_values(dataset[column_name], limit)
+
+    #Finally we return the ratio of ratings above the limit
+    return pd.Series(ratio, index=dataset.index)
+
 def get_published_books_ratio(dates_list: List[pd.Period]) -> float:
     """
     Function that returns the ratio between the number of times an author published a book within two years after his/her last publication and the total number of publications.
@@ -423,6 +1392,65 @@ def get_published_books_ratio(dates_list: List[pd.Period]) -> float:
     #Here we return the published books ratio
     return len(time_gaps_list)/len(dates_list)
 
+@cache_module.memoize
+def author_timeline_statistics(books_dataset: pd.DataFrame, column_name: str = "original_publication_date", author_column: str = "author_id") -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Function that returns the publication timeline statistics of every author at once. The books are sorted by (author, date) and the time gaps are computed as differences between subsequent books of the same author.
+    For each author, it gives the same values as get_average_time_gap, get_published_books_ratio and get_cumulative_date_values applied to the sorted list of his/her publication dates.
+
+    Args:
+        books_dataset (pd.DataFrame): Dataframe with the books dataset.
+        column_name (str, optional): Name of the Pandas Period column with the publication dates. Defaults to "original_publication_date".
+        author_column (str, optional): Name of the column with the author ids. Defaults to "author_id".
+
+    Returns:
+        timeline_dataframe (pd.DataFrame): Dataframe indexed by author with the number of books, the average time gap in days (NaN for authors with one book) and the published books ratio.
+        cumulative_dataframe (pd.DataFrame): Dataframe with the cumulative number of books published by each author until each year.
+    """
+    #Here we assert that the column is a period column
+    assert books_dataset[column_name].dtype == "period[D]", f"The {column_name} column is not a Pandas Period column."
+
+    #Here we get the day ordinals and the years of the dates and we drop the books without a date
+    dates = books_dataset[column_name]
+    has_date = dates.notna().to_numpy()
+    authors = books_dataset[author_column].to_numpy()[has_date]
+    ordinals = dates.array.asi8[has_date]
+    years = dates.dt.year.to_numpy()[has_date].astype("int64")
+
+    #Here we sort the books by author and date
+    order = np.lexsort((ordinals, authors))
+    authors, ordinals, years = authors[order], ordinals[order], years[order]
+
+    #Here we compute the differences between subsequent books and keep only the ones between books of the same author
+    same_author = authors[1:] == authors[:-1]
+    pair_authors = authors[1:][same_author]
+    time_gaps = np.diff(ordinals)[same_author]
+    year_gaps = np.diff(years)[same_author]
+
+    #Here we count the books of each author and compute the average time gap and the number of publications within two years of the previous one
+    number_of_books = pd.Series(years).groupby(authors).size()
+    average_time_gap = pd.Series(time_gaps, dtype="float64").groupby(pair_authors).mean()
+    close_publications = pd.Series(year_gaps <= 2).groupby(pair_authors).sum()
+
+    #Here we build the dataframe with the statistics of each author
+    timeline_dataframe = pd.DataFrame({
+        "number_of_books": number_of_books,
+        "average_time_gap": average_time_gap.reindex(number_of_books.index),
+        "published_books_ratio": close_publications.reindex(number_of_books.index, fill_value=0) / number_of_books
+    })
+    timeline_dataframe.index.name = author_column
+
+    #Here we compute the cumulative number of books of each author until each year in which he/she published
+    yearly_counts = pd.Series(years).groupby([authors, years]).size()
+    cumulative_counts = yearly_counts.groupby(level=0).cumsum()
+    cumulative_dataframe = pd.DataFrame({
+        author_column: cumulative_counts.index.get_level_values(0),
+        "year": cumulative_counts.index.get_level_values(1),
+        "cumulative_books": cumulative_counts.to_numpy()
+    })
+
+    return timeline_dataframe, cumulative_dataframe
+
 def get_pearson_correlation(x: list, y: list) -> tuple:
     """
     Function that returns the Pearson correlation coefficient and the p-value for two lists of values.
@@ -434,6 +1462,9 @@ def get_pearson_correlation(x: list, y: list) -> tuple:
     Returns:
         tuple: Tuple with the Pearson correlation coefficient and the p-value.
     """
+    #Here we import the stats module of scipy. We import it here so that importing this module is fast
+    from scipy import stats
+
     #Here we calculate the Pearson correlation coefficient and the p-value
     pearson_correlation, p_value = stats.pearsonr(x, y)
     #Here we return the Pearson correlation coefficient and the p-value
@@ -450,11 +1481,244 @@ def t_test(x: list, y: list) -> tuple:
     Returns:
         tuple: Tuple with the t-statistic and the p-value.
     """
+    #Here we import the stats module of scipy. We import it here so that importing this module is fast
+    from scipy import stats
+
     #Here we calculate the t-statistic and the p-value
     t_statistic, p_value = stats.ttest_ind(x, y)
     #Here we return the t-statistic and the p-value
     return t_statistic, p_value
 
+def get_pairwise_correlations(values: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Function that returns the Pearson correlation coefficient of every pair of columns of a matrix, using for each pair the rows where both values are not NaN.
+    All the coefficients are computed at once from sums of the values, their squares and their products, which are obtained with matrix products.
+
+    Args:
+        values (np.ndarray): Matrix with one column per variable. It can have NaN values.
+
+    Returns:
+        correlations (np.ndarray): Matrix with the correlation coefficient of each pair of columns.
+        counts (np.ndarray): Matrix with the number of rows used for each pair of columns.
+    """
+    #Here we create a matrix that is 1 where the value is not NaN
+    present = (~np.isnan(values)).astype("float64")
+
+    #Here we subtract the mean of each column, so that the sums below don't lose precision when a column has a large offset. The correlations don't change with the offset
+    counts_per_column = present.sum(axis=0)
+    means = np.divide(np.nansum(values, axis=0), counts_per_column, out=np.zeros(values.shape[1]), where=counts_per_column > 0)
+
+    #Here we create a copy of the centered values with 0 instead of NaN
+    filled_values = np.where(present > 0, values - means, 0.0)
+
+    #Here we compute, for each pair (i, j), the number of rows, the sums of i and of its squares over the rows where j is present, and the sum of the products
+    counts = present.T @ present
+    sums = filled_values.T @ present
+    squared_sums = (filled_values ** 2).T @ present
+    product_sums = filled_values.T @ filled_values
+
+    #Here we compute the covariances and variances of each pair and the correlation coefficients
+    with np.errstate(divide="ignore", invalid="ignore"):
+        covariances = product_sums - sums * sums.T / counts
+        variances_i = squared_sums - sums ** 2 / counts
+        variances_j = variances_i.T
+        correlations = np.clip(covariances / np.sqrt(variances_i * variances_j), -1, 1)
+
+    return correlations, counts
+
+def get_correlation_p_values(correlations: np.ndarray, counts: np.ndarray) -> np.ndarray:
+    """
+    Function that returns the two-sided p-values of Pearson correlation coefficients, as the scipy pearsonr function does.
+
+    Args:
+        correlations (np.ndarray): Array with the correlation coefficients.
+        counts (np.ndarray): Array with the number of rows used to compute each coefficient.
+
+    Returns:
+        np.ndarray: Array with the p-values.
+    """
+    #Here we import the stats module of scipy. We import it here so that importing this module is fast
+    from scipy import stats
+
+    #Here we compute the t-statistic of each coefficient, which follows a Student's t distribution with n - 2 degrees of freedom
+    with np.errstate(divide="ignore", invalid="ignore"):
+        degrees_of_freedom = counts - 2
+        t_statistics = correlations * np.sqrt(degrees_of_freedom / (1 - correlations ** 2))
+        return 2 * stats.t.sf(np.abs(t_statistics), degrees_of_freedom)
+
+def correlation_matrix(dataset: pd.DataFrame, columns: List[str] = None, pairs: List[Tuple[str, str]] = None) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Function that returns the Pearson correlation coefficients and p-values of many pairs of columns in one pass over the data. Each pair uses the rows where both values are not NaN.
+
+    Args:
+        dataset (pd.DataFrame): Dataframe with the dataset.
+        columns (List[str], optional): Columns to correlate with each other. Defaults to all the numeric columns.
+        pairs (List[Tuple[str, str]], optional): If it is not None, only these pairs of columns are returned, in a dataframe with one row per pair. Defaults to None.
+
+    Returns:
+        If pairs is None, a tuple with the matrix of correlation coefficients and the matrix of p-values.
+        Otherwise, a dataframe with the correlation coefficient, the p-value and the number of rows of each pair.
+    """
+    #Here we get the columns to correlate
+    if pairs is not None:
+        columns = list(dict.fromkeys(column for pair in pairs for column in pair))
+    elif columns is None:
+        columns = [column for column in dataset.columns if pd.api.types.is_numeric_dtype(dataset[column]) and not pd.api.types.is_bool_dtype(dataset[column])]
+
+    #Here we compute the correlation coefficients and p-values of all the pairs of columns
+    values = dataset[columns].apply(pd.to_numeric, errors="coerce").to_numpy(dtype="float64", na_value=np.nan)
+    correlations, counts = get_pairwise_correlations(values)
+    p_values = get_correlation_p_values(correlations, counts)
+
+    #If we want only some pairs, we return one row per pair
+    if pairs is not None:
+        positions = {column: i for i, column in enumerate(columns)}
+        return pd.DataFrame([{
+            "x": x,
+            "y": y,
+            "correlation": correlations[positions[x], positions[y]],
+            "p_value": p_values[positions[x], positions[y]],
+            "n": int(counts[positions[x], positions[y]])
+        } for x, y in pairs])
+
+    #Here we return the matrices of correlation coefficients and p-values. A column is perfectly correlated with itself
+    np.fill_diagonal(p_values, 0.0)
+    return pd.DataFrame(correlations, index=columns, columns=columns), pd.DataFrame(p_values, index=columns, columns=columns)
+
+def grouped_t_tests(dataset: pd.DataFrame, value_columns: List[str], group_column: str, group_pairs: List[Tuple] = None) -> pd.DataFrame:
+    """
+    Function that runs independent two-sample t-tests (with equal variances, as the t_test function) of many columns between groups of rows.
+    The size, mean and variance of every group are computed in one groupby pass, and the t-statistics are computed from them.
+
+    Args:
+        dataset (pd.DataFrame): Dataframe with the dataset.
+        value_columns (List[str]): Columns to compare between the groups.
+        group_column (str): Column with the group of each row.
+        group_pairs (List[Tuple], optional): Pairs of groups to compare. Defaults to all the pairs of groups.
+
+    Returns:
+        pd.DataFrame: Dataframe with the column, the two groups, their sizes, the t-statistic and the p-value of each test.
+    """
+    #Here we import the stats module of scipy. We import it here so that importing this module is fast
+    from scipy import stats
+
+    #Here we compute the size, mean and variance of each column in each group, ignoring the NaN values
+    values = dataset[value_columns].apply(pd.to_numeric, errors="coerce")
+    grouped_values = values.groupby(dataset[group_column], observed=True)
+    sizes, means, variances = grouped_values.count(), grouped_values.mean(), grouped_values.var(ddof=1)
+
+    #Here we get the pairs of groups to compare
+    if group_pairs is None:
+        group_pairs = list(combinations(sizes.index, 2))
+
+    tests = []
+    for group_a, group_b in group_pairs:
+        #Here we compute the pooled variance and the t-statistic of every column at once
+        size_a, size_b = sizes.loc[group_a], sizes.loc[group_b]
+        pooled_variance = ((size_a - 1) * variances.loc[group_a] + (size_b - 1) * variances.loc[group_b]) / (size_a + size_b - 2)
+        t_statistics = (means.loc[group_a] - means.loc[group_b]) / np.sqrt(pooled_variance * (1 / size_a + 1 / size_b))
+        p_values = 2 * stats.t.sf(np.abs(t_statistics), size_a + size_b - 2)
+
+        for i, column in enumerate(value_columns):
+            tests.append({
+                "column": column,
+                "group_a": group_a,
+                "group_b": group_b,
+                "n_a": int(size_a[column]),
+                "n_b": int(size_b[column]),
+                "t_statistic": t_statistics[column],
+                "p_value": p_values[i]
+            })
+
+    return pd.DataFrame(tests)
+
+def resample_correlations(values: np.ndarray, pair_positions: List[Tuple[int, int]], number_of_resamples: int, method: str, seed: int) -> np.ndarray:
+    """
+    Function that computes the correlation coefficients of some pairs of columns on resamples of the rows. It is used by the processes of correlation_confidence.
+
+    Args:
+        values (np.ndarray): Matrix with one column per variable and no NaN values.
+        pair_positions (List[Tuple[int, int]]): Positions of the columns of each pair.
+        number_of_resamples (int): Number of resamples.
+        method (str): "bootstrap" to resample the rows with replacement or "permutation" to shuffle the second column of each pair.
+        seed (int): Seed of the random number generator.
+
+    Returns:
+        np.ndarray: Matrix with the correlation coefficient of each pair (columns) in each resample (rows).
+    """
+    generator = np.random.default_rng(seed)
+    first_positions = [x for x, _ in pair_positions]
+    second_positions = [y for _, y in pair_positions]
+    resampled_correlations = np.empty((number_of_resamples, len(pair_positions)))
+
+    for i in range(number_of_resamples):
+        if method == "bootstrap":
+            #Here we draw the rows with replacement
+            rows = generator.integers(0, len(values), len(values))
+            first_values, second_values = values[rows][:, first_positions], values[rows][:, second_positions]
+        else:
+            #Here we shuffle the rows of the second columns, which breaks any correlation between the columns of each pair
+            first_values, second_values = values[:, first_positions], values[generator.permutation(len(values))][:, second_positions]
+
+        #Here we compute the correlation coefficients of all the pairs at once
+        first_centered = first_values - first_values.mean(axis=0)
+        second_centered = second_values - second_values.mean(axis=0)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            resampled_correlations[i] = (first_centered * second_centered).sum(axis=0) / np.sqrt((first_centered ** 2).sum(axis=0) * (second_centered ** 2).sum(axis=0))
+
+    return resampled_correlations
+
+def correlation_confidence(dataset: pd.DataFrame, pairs: List[Tuple[str, str]], method: str = "bootstrap", number_of_resamples: int = 1000, confidence: float = 0.95, n_workers: int = 1, seed: int = 0) -> pd.DataFrame:
+    """
+    Function that returns bootstrap confidence intervals or permutation p-values of the Pearson correlation coefficients of some pairs of columns. The resamples are split among a pool of processes.
+    Only the rows where all the columns of the pairs are not NaN are used.
+
+    Args:
+        dataset (pd.DataFrame): Dataframe with the dataset.
+        pairs (List[Tuple[str, str]]): Pairs of columns.
+        method (str, optional): "bootstrap" for confidence intervals or "permutation" for p-values. Defaults to "bootstrap".
+        number_of_resamples (int, optional): Number of resamples. Defaults to 1000.
+        confidence (float, optional): Confidence level of the bootstrap intervals. Defaults to 0.95.
+        n_workers (int, optional): Number of processes to use. Defaults to 1.
+        seed (int, optional): Seed of the random number generators. Defaults to 0.
+
+    Returns:
+        pd.DataFrame: Dataframe with the correlation coefficient of each pair and its confidence interval (bootstrap) or its p-value (permutation).
+    """
+    #Here we assert that the method is valid
+    assert method in ["bootstrap", "permutation"], f"The method {method} is not valid. Please choose between 'bootstrap' and 'permutation'."
+
+    #Here we get the values of the columns of the pairs, keeping only the complete rows
+    columns = list(dict.fromkeys(column for pair in pairs for column in pair))
+    values = dataset[columns].apply(pd.to_numeric, errors="coerce").dropna().to_numpy(dtype="float64")
+    positions = {column: i for i, column in enumerate(columns)}
+    pair_positions = [(positions[x], positions[y]) for x, y in pairs]
+
+    #Here we compute the observed correlation coefficients
+    correlations = np.array([np.corrcoef(values[:, x], values[:, y])[0, 1] for x, y in pair_positions])
+
+    #Here we split the resamples among the processes, each one with a different seed
+    resamples_per_worker = [len(chunk) for chunk in np.array_split(np.arange(number_of_resamples), n_workers) if len(chunk) > 0]
+    seeds = [seed + i + 1 for i in range(len(resamples_per_worker))]
+    if n_workers == 1:
+        resampled_correlations = [resample_correlations(values, pair_positions, resamples_per_worker[0], method, seeds[0])]
+    else:
+        with ProcessPoolExecutor(max_workers=n_workers) as executor:
+            resampled_correlations = list(executor.map(resample_correlations, [values] * len(seeds), [pair_positions] * len(seeds), resamples_per_worker, [method] * len(seeds), seeds))
+    resampled_correlations = np.vstack(resampled_correlations)
+
+    #Here we build the dataframe with the results
+    results = pd.DataFrame({"x": [x for x, _ in pairs], "y": [y for _, y in pairs], "correlation": correlations, "n": len(values)})
+    if method == "bootstrap":
+        #The confidence interval is given by the percentiles of the bootstrap coefficients
+        results["lower"] = np.nanpercentile(resampled_correlations, 100 * (1 - confidence) / 2, axis=0)
+        results["upper"] = np.nanpercentile(resampled_correlations, 100 * (1 + confidence) / 2, axis=0)
+    else:
+        #The p-value is the fraction of permutations with a coefficient at least as extreme as the observed one
+        results["p_value"] = ((np.abs(resampled_correlations) >= np.abs(correlations)).sum(axis=0) + 1) / (len(resampled_correlations) + 1)
+
+    return results
+
 def linear_regression(x: list, y: list) -> tuple:
     """
     Function that performs a linear regression for two lists of values.
@@ -466,12 +1730,16 @@ def linear_regression(x: list, y: list) -> tuple:
     Returns:
         tuple: Tuple with rsquared, linear regression model, x test and y test values.
     """
+    #Here we import the sklearn functions. We import them here so that importing this module is fast
+    from sklearn import linear_model
+    from sklearn.model_selection import train_test_split
+
     #First, we transform the lists into numpy arrays.
     x = np.array(x).reshape(-1, 1)
     y = np.array(y).reshape(-1, 1)
 
     #Now, we split the data into train and test sets
-    x_train, x_test, y_train, y_test = sklearn.model_selection.train_test_split(x, y, test_size=0.2, random_state=0)
+    x_train, x_test, y_train, y_test = train_test_split(x, y, test_size=0.2, random_state=0)
 
     #Here we create the linear regression model
     linear_regression_model = linear_model.LinearRegression()
@@ -485,6 +1753,102 @@ def linear_regression(x: list, y: list) -> tuple:
     #Here we return the rsquared, linear regression model, x test and y test values
     return rsquared, linear_regression_model, x_test, y_test
 
+def is_test_row(ids: pd.Series, test_size: float = 0.2) -> np.ndarray:
+    """
+    Function that assigns rows to the test set by hashing their ids, so that a row is always in the same set no matter how the file is split into chunks.
+
+    Args:
+        ids (pd.Series): Series with the ids of the rows.
+        test_size (float, optional): Approximate fraction of rows in the test set. Defaults to 0.2.
+
+    Returns:
+        np.ndarray: Boolean array that is True for the rows in the test set.
+    """
+    return pd.util.hash_pandas_object(ids, index=False).to_numpy() % 10000 < test_size * 10000
+
+def streaming_linear_regression(dataset_name: str, feature_columns: List[str], target_column: str, id_column: str = "id", test_size: float = 0.2, max_test_rows: int = 100000, chunksize: int = 10000, dtype: dict = None, row_filter = None, seed: int = 0) -> tuple:
+    """
+    Function that performs a linear regression over a dataset that is read in chunks, so that the whole dataset doesn't need to be in memory.
+    For each chunk we only accumulate the matrices XᵀX and Xᵀy of the train rows and the same sums of the test rows, which are enough to fit the model and to compute the rsquared value on the test set.
+
+    Args:
+        dataset_name (str): Name of the dataset.
+        feature_columns (List[str]): Columns to use as features.
+        target_column (str): Column to predict.
+        id_column (str, optional): Column with the id of each row, used to split the rows into train and test sets. Defaults to "id".
+        test_size (float, optional): Approximate fraction of rows in the test set. Defaults to 0.2.
+        max_test_rows (int, optional): Maximum number of test rows to return. If the test set is bigger, a uniform sample of it is returned. Defaults to 100000.
+        chunksize (int, optional): Number of rows to read in each chunk. Defaults to 10000.
+        dtype (dict, optional): Dictionary with the data types of the columns. Defaults to None.
+        row_filter (str or callable, optional): Query string or function that receives a dataframe and returns a boolean mask. Defaults to None.
+        seed (int, optional): Seed of the random number generator used to sample the test set. Defaults to 0.
+
+    Returns:
+        tuple: Tuple with rsquared, linear regression model, x test and y test values, as the linear_regression function.
+    """
+    #Here we import the sklearn linear model. We import it here so that importing this module is fast
+    from sklearn import linear_model
+
+    number_of_features = len(feature_columns)
+    generator = np.random.default_rng(seed)
+
+    #Here we create the sums of the train and test rows. The first column of the features is a column of ones for the intercept
+    train_xtx = np.zeros((number_of_features + 1, number_of_features + 1))
+    train_xty = np.zeros(number_of_features + 1)
+    test_xtx = np.zeros((number_of_features + 1, number_of_features + 1))
+    test_xty = np.zeros(number_of_features + 1)
+    test_yty = 0.0
+
+    #Here we create the reservoir with the sample of the test rows
+    sample_x = np.empty((max_test_rows, number_of_features))
+    sample_y = np.empty(max_test_rows)
+    number_of_test_rows = 0
+
+    #Here we iterate over the chunks keeping only the needed columns
+    for chunk in get_data_chunks(dataset_name, dtype=dtype, chunksize=chunksize, keep_columns=[id_column] + feature_columns + [target_column], row_filter=row_filter):
+        #Here we convert the columns to numbers and drop the rows with missing values
+        values = chunk[feature_columns + [target_column]].apply(pd.to_numeric, errors="coerce")
+        complete = values.notna().all(axis=1).to_numpy()
+        values = values.to_numpy(dtype="float64")[complete]
+        x = np.column_stack([np.ones(len(values)), values[:, :-1]])
+        y = values[:, -1]
+        test_rows = is_test_row(chunk[id_column][complete], test_size)
+
+        #Here we add the sums of the chunk
+        x_train, y_train = x[~test_rows], y[~test_rows]
+        x_test, y_test = x[test_rows], y[test_rows]
+        train_xtx += x_train.T @ x_train
+        train_xty += x_train.T @ y_train
+        test_xtx += x_test.T @ x_test
+        test_xty += x_test.T @ y_test
+        test_yty += y_test @ y_test
+
+        #Here we update the reservoir: the i-th test row replaces a random row of the sample with probability max_test_rows / (i + 1)
+        positions = np.arange(number_of_test_rows, number_of_test_rows + len(y_test))
+        targets = np.where(positions < max_test_rows, positions, generator.integers(0, positions + 1))
+        for row, target in zip(np.flatnonzero(targets < max_test_rows), targets[targets < max_test_rows]):
+            sample_x[target] = x_test[row, 1:]
+            sample_y[target] = y_test[row]
+        number_of_test_rows += len(y_test)
+
+    #Here we solve the normal equations to get the intercept and the coefficients
+    coefficients = np.linalg.lstsq(train_xtx, train_xty, rcond=None)[0]
+
+    #Here we create a linear regression model with the fitted values, so that it can be used as the one returned by the linear_regression function
+    linear_regression_model = linear_model.LinearRegression()
+    linear_regression_model.coef_ = coefficients[1:].reshape(1, -1)
+    linear_regression_model.intercept_ = coefficients[:1]
+    linear_regression_model.n_features_in_ = number_of_features
+
+    #Here we calculate the rsquared value on the test set from its sums: the residual sum of squares is yᵀy - 2bᵀXᵀy + bᵀXᵀXb
+    residual_sum_of_squares = test_yty - 2 * coefficients @ test_xty + coefficients @ test_xtx @ coefficients
+    total_sum_of_squares = test_yty - test_xty[0] ** 2 / test_xtx[0, 0]
+    rsquared = 1 - residual_sum_of_squares / total_sum_of_squares
+
+    #Here we return the rsquared, linear regression model, x test and y test values
+    sample_size = min(number_of_test_rows, max_test_rows)
+    return rsquared, linear_regression_model, sample_x[:sample_size], sample_y[:sample_size].reshape(-1, 1)
+
 
 
 
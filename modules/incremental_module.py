@@ -0,0 +1,221 @@
+#Here we import the necessary libraries
+import os
+import pickle
+import hashlib
+from typing import Callable
+from collections import Counter
+from . import jsonl_module, streaming_module
+
+#Here we define the folder where the checkpoints are saved
+CHECKPOINT_DIRECTORY = "./data/cache/incremental"
+
+#Here we define the number of bytes used to check that the part of the file that was already read didn't change
+CHECK_SIZE = 65536
+
+
+def get_bytes_hash(file_path: str, start: int, end: int) -> str:
+    """
+    Function that returns the hash of a byte range of a file.
+
+    Args:
+        file_path (str): Path of the file.
+        start (int): Byte offset where the range begins.
+        end (int): Byte offset where the range ends.
+
+    Returns:
+        str: Hexadecimal hash of the bytes.
+    """
+    with open(file_path, "rb") as file:
+        file.seek(start)
+        return hashlib.blake2b(file.read(end - start), digest_size=16).hexdigest()
+
+def get_complete_end(file_path: str, start: int) -> int:
+    """
+    Function that returns the byte offset right after the last complete line of a file, so that a line that is still being written is not read.
+
+    Args:
+        file_path (str): Path of the file.
+        start (int): Byte offset from which the lines are read.
+
+    Returns:
+        int: Byte offset after the last newline of the file, or start if there is no newline after it.
+    """
+    file_size = os.path.getsize(file_path)
+    with open(file_path, "rb") as file:
+        #Here we read the file backwards in blocks until we find a newline
+        end = file_size
+        while end > start:
+            block_start = max(end - CHECK_SIZE, start)
+            file.seek(block_start)
+            newline_position = file.read(end - block_start).rfind(b"\n")
+            if newline_position >= 0:
+                return block_start + newline_position + 1
+            end = block_start
+    return start
+
+def get_checkpoint_path(name: str, file_path: str, directory: str = CHECKPOINT_DIRECTORY) -> str:
+    """
+    Function that returns the path of the checkpoint of an aggregate of a file.
+
+    Args:
+        name (str): Name of the aggregate.
+        file_path (str): Path of the source file.
+        directory (str, optional): Folder of the checkpoints. Defaults to CHECKPOINT_DIRECTORY.
+
+    Returns:
+        str: Path of the checkpoint.
+    """
+    return os.path.join(directory, f"{os.path.basename(file_path)}.{name}.pkl")
+
+def get_checkpoint(name: str, file_path: str, directory: str = CHECKPOINT_DIRECTORY) -> dict:
+    """
+    Function that reads the checkpoint of an aggregate of a file.
+
+    Args:
+        name (str): Name of the aggregate.
+        file_path (str): Path of the source file.
+        directory (str, optional): Folder of the checkpoints. Defaults to CHECKPOINT_DIRECTORY.
+
+    Returns:
+        dict: Checkpoint with the offset up to which the file was read, the hashes used to detect rewrites and the aggregate. None if there is no checkpoint.
+    """
+    checkpoint_path = get_checkpoint_path(name, file_path, directory)
+    if not os.path.exists(checkpoint_path):
+        return None
+    #The checkpoints are pickle files written by this module. Only load checkpoints you created
+    with open(checkpoint_path, "rb") as file:
+        return pickle.load(file)
+
+def is_checkpoint_valid(checkpoint: dict, file_path: str) -> bool:
+    """
+    Function that checks that the part of a file covered by a checkpoint is unchanged, that is, that the file was only appended to since the checkpoint was saved.
+    Only the size and the first and last CHECK_SIZE bytes of the read part are checked, so that the check doesn't read the whole file.
+
+    Args:
+        checkpoint (dict): Checkpoint of the file.
+        file_path (str): Path of the file.
+
+    Returns:
+        bool: False if the file was truncated or rewritten.
+    """
+    offset = checkpoint["offset"]
+    #If the checkpoint is of another file or the file is shorter than the read part, it was truncated or replaced
+    if checkpoint["file_path"] != os.path.abspath(file_path) or os.path.getsize(file_path) < offset:
+        return False
+    #Here we compare the hashes of the beginning and the end of the read part, which change if the file is rewritten
+    return checkpoint["head_hash"] == get_bytes_hash(file_path, 0, min(offset, CHECK_SIZE)) and checkpoint["tail_hash"] == get_bytes_hash(file_path, max(offset - CHECK_SIZE, 0), offset)
+
+def refresh(name: str, file_path: str, create_aggregate: Callable, update_aggregate: Callable, directory: str = CHECKPOINT_DIRECTORY):
+    """
+    Function that updates an aggregate of a json lines file with the lines appended since its last checkpoint and saves a new checkpoint.
+    If there is no checkpoint or the file was truncated or rewritten, the aggregate is built again from the beginning of the file.
+
+    Args:
+        name (str): Name of the aggregate. It must change when the parameters of the aggregate change.
+        file_path (str): Path of the json lines file.
+        create_aggregate (Callable): Function without arguments that returns an empty aggregate.
+        update_aggregate (Callable): Function that receives the aggregate, the file path and the start and end of a byte range of new lines, and returns the updated aggregate.
+        directory (str, optional): Folder of the checkpoints. Defaults to CHECKPOINT_DIRECTORY.
+
+    Returns:
+        Updated aggregate.
+    """
+    #Here we read the checkpoint and check that the file was only appended to
+    checkpoint = get_checkpoint(name, file_path, directory)
+    rebuilt = checkpoint is None or not is_checkpoint_valid(checkpoint, file_path)
+    if rebuilt:
+        start, aggregate = 0, create_aggregate()
+    else:
+        start, aggregate = checkpoint["offset"], checkpoint["aggregate"]
+
+    #Here we update the aggregate with the complete lines after the checkpoint
+    end = get_complete_end(file_path, start)
+    if end > start:
+        aggregate = update_aggregate(aggregate, file_path, start, end)
+
+    #Here we save the new checkpoint. We write it to a temporary file first, so that an interrupted write doesn't corrupt the checkpoint
+    if rebuilt or end > start:
+        os.makedirs(directory, exist_ok=True)
+        checkpoint_path = get_checkpoint_path(name, file_path, directory)
+        with open(checkpoint_path + ".tmp", "wb") as file:
+            pickle.dump({
+                "file_path": os.path.abspath(file_path),
+                "offset": end,
+                "head_hash": get_bytes_hash(file_path, 0, min(end, CHECK_SIZE)),
+                "tail_hash": get_bytes_hash(file_path, max(end - CHECK_SIZE, 0), end),
+                "last_start": start,
+                "rebuilt": rebuilt,
+                "aggregate": aggregate
+            }, file)
+        os.replace(checkpoint_path + ".tmp", checkpoint_path)
+
+    return aggregate
+
+def refresh_tag_counts(file_path: str = "./data/list.json", field: str = "tags", capacity: int = None, directory: str = CHECKPOINT_DIRECTORY):
+    """
+    Function that returns the number of occurrences of each tag in the list file, counting only the lines appended since the last call.
+
+    Args:
+        file_path (str, optional): Path of the list file. Defaults to "./data/list.json".
+        field (str, optional): Name of the field with the tags. Defaults to "tags".
+        capacity (int, optional): If it is not None, the tags are counted approximately with a SpaceSaving summary with this number of counters. Defaults to None.
+        directory (str, optional): Folder of the checkpoints. Defaults to CHECKPOINT_DIRECTORY.
+
+    Returns:
+        Counter or SpaceSaving: Counter with the number of occurrences of each tag.
+    """
+    def update_aggregate(tags_occurrences, file_path: str, start: int, end: int):
+        new_tags_occurrences = streaming_module.count_tags_in_range(file_path, start, end, field=field, capacity=capacity)
+        return streaming_module.merge_counters([tags_occurrences, new_tags_occurrences])
+
+    create_aggregate = lambda: Counter() if capacity is None else streaming_module.SpaceSaving(capacity)
+    return refresh(f"tags-{field}-{capacity}", file_path, create_aggregate, update_aggregate, directory)
+
+def refresh_top_series(file_path: str = "./data/series.json", k: int = 5, directory: str = CHECKPOINT_DIRECTORY) -> list:
+    """
+    Function that returns the k series with the greatest total book count, reading only the lines of the series file appended since the last call.
+
+    Args:
+        file_path (str, optional): Path of the series file. Defaults to "./data/series.json".
+        k (int, optional): Number of series to return. Defaults to 5.
+        directory (str, optional): Folder of the checkpoints. Defaults to CHECKPOINT_DIRECTORY.
+
+    Returns:
+        list: List of (id, title, total_book_count) tuples sorted by total book count in descending order, as the get_top_series function.
+    """
+    #The aggregate is the heap of the best k series and the number of lines read, which gives the line numbers used to break ties
+    def update_aggregate(aggregate: dict, file_path: str, start: int, end: int) -> dict:
+        aggregate["lines"] += streaming_module.update_top_series(aggregate["heap"], jsonl_module.iterate_range_lines(file_path, start, end), aggregate["lines"], k)
+        return aggregate
+
+    aggregate = refresh(f"top-series-{k}", file_path, lambda: {"heap": [], "lines": 0}, update_aggregate, directory)
+    return streaming_module.sort_top_series(aggregate["heap"])
+
+def refresh_yearly_stats(dataset_name: str = "books", column_name: str = "original_publication_date", directory: str = CHECKPOINT_DIRECTORY):
+    """
+    Function that returns the yearly statistics of the books dataset, parsing only the lines appended since the last call.
+
+    Args:
+        dataset_name (str, optional): Name of the dataset. Defaults to "books".
+        column_name (str, optional): Name of the column with the publication dates. Defaults to "original_publication_date".
+        directory (str, optional): Folder of the checkpoints. Defaults to CHECKPOINT_DIRECTORY.
+
+    Returns:
+        pd.DataFrame: Dataframe with the historical data of each year, as the historical_dataframe function.
+    """
+    #Here we import the data handling module. We import it here so that the tag and series functions don't need pandas
+    from . import data_handling_module
+
+    #The aggregate is a YearlyStats object, which keeps the totals and the longest book of each year and the number of books of each month
+    def update_aggregate(yearly_stats, file_path: str, start: int, end: int):
+        #We read the dates as strings, since pandas reads a range with only year-style dates (e.g. "1999") as integers
+        new_books = data_handling_module.prepare_chunk(jsonl_module.read_range_to_dataframe(file_path, start, end, dtype={column_name: str}), keep_columns=[column_name, "num_pages", "title"])
+        #If no line of the range has the date column, reindex creates it with float NaN values, so we convert it to an object column of missing dates
+        new_books[column_name] = new_books[column_name].astype("object")
+        new_books = data_handling_module.standardize_time_column_to_period(new_books, column_name)
+        return yearly_stats.update(new_books)
+
+    file_path = data_handling_module.DATASET_PATHS[dataset_name]
+    #The version in the name invalidates the checkpoints saved before the books without a date were dropped from the statistics
+    yearly_stats = refresh(f"yearly-stats-v2-{column_name}", file_path, lambda: data_handling_module.YearlyStats(column_name), update_aggregate, directory)
+    return yearly_stats.to_dataframe()
@@ -0,0 +1,210 @@
+#Here we import the necessary libraries
+import io
+import os
+import json
+from functools import partial
+from typing import Callable, Iterator, List, Tuple
+from concurrent.futures import ProcessPoolExecutor
+
+#Here we use the orjson decoder if it is installed, since it is much faster than the json module. Otherwise we use the json module
+try:
+    import orjson
+    loads = orjson.loads
+except ImportError:
+    loads = json.loads
+
+
+def get_byte_ranges(file_path: str, number_of_ranges: int) -> List[Tuple[int, int]]:
+    """
+    Function that splits a json lines file into byte ranges that start and end at the beginning of a line.
+
+    Args:
+        file_path (str): Path of the json lines file.
+        number_of_ranges (int): Number of ranges to create. Less ranges are returned if the file has less lines.
+
+    Returns:
+        List[Tuple[int, int]]: List of (start, end) byte offsets in the order in which they appear in the file.
+    """
+    #Here we get the size of the file
+    file_size = os.path.getsize(file_path)
+
+    #Here we create a list with the offsets where each range begins
+    boundaries = [0]
+
+    with open(file_path, "rb") as file:
+        for i in range(1, number_of_ranges):
+            #Here we go to the byte right before the approximate boundary and read until the end of its line. In this way the boundary is always the beginning of a line
+            target = max(file_size * i // number_of_ranges, boundaries[-1])
+            file.seek(max(target - 1, 0))
+            file.readline()
+            boundaries.append(min(file.tell(), file_size))
+
+    boundaries.append(file_size)
+
+    #Here we return the pairs of subsequent boundaries, ignoring the empty ranges
+    return [(start, end) for start, end in zip(boundaries[:-1], boundaries[1:]) if end > start]
+
+def iterate_range_lines(file_path: str, start: int, end: int) -> Iterator[bytes]:
+    """
+    Generator that yields the lines of a file that begin inside a byte range.
+
+    Args:
+        file_path (str): Path of the file.
+        start (int): Byte offset where the range begins. It must be the beginning of a line.
+        end (int): Byte offset where the range ends.
+
+    Yields:
+        line (bytes): Line of the file.
+    """
+    with open(file_path, "rb") as file:
+        file.seek(start)
+        position = start
+        #Here we read lines until we reach the end of the range
+        while position < end:
+            line = file.readline()
+            if not line:
+                break
+            position += len(line)
+            yield line
+
+def iterate_range_records(file_path: str, start: int, end: int) -> Iterator[dict]:
+    """
+    Generator that yields the decoded json objects of the lines of a file that begin inside a byte range.
+
+    Args:
+        file_path (str): Path of the json lines file.
+        start (int): Byte offset where the range begins. It must be the beginning of a line.
+        end (int): Byte offset where the range ends.
+
+    Yields:
+        record (dict): Decoded json object.
+    """
+    for line in iterate_range_lines(file_path, start, end):
+        #Here we skip the empty lines
+        if line.strip():
+            yield loads(line)
+
+def read_record_at(file, offset: int) -> dict:
+    """
+    Function that decodes the json object of the line that begins at a byte offset of a json lines file.
+
+    Args:
+        file: Json lines file opened in binary mode.
+        offset (int): Byte offset where the line begins.
+
+    Returns:
+        dict: Decoded json object.
+    """
+    file.seek(offset)
+    return loads(file.readline())
+
+def read_range_to_dataframe(file_path: str, start: int, end: int, dtype: dict = None):
+    """
+    Function that parses the lines of a json lines file inside a byte range into a dataframe.
+
+    Args:
+        file_path (str): Path of the json lines file.
+        start (int): Byte offset where the range begins. It must be the beginning of a line.
+        end (int): Byte offset where the range ends.
+        dtype (dict, optional): Dictionary with the data types of the columns. Defaults to None.
+
+    Returns:
+        pd.DataFrame: Dataframe with the lines of the range.
+    """
+    #Here we import pandas. We import it here so that the scripts that only count values don't need it
+    import pandas as pd
+
+    #Here we read the bytes of the range
+    with open(file_path, "rb") as file:
+        file.seek(start)
+        data = file.read(end - start)
+
+    #If the range only has whitespace, we return an empty dataframe
+    if not data.strip():
+        return pd.DataFrame()
+
+    #Here we parse the bytes of the range with pandas
+    return pd.read_json(io.BytesIO(data), dtype=dtype, lines=True)
+
+def read_range_with_row_count(file_path: str, start: int, end: int, dtype: dict = None) -> tuple:
+    """
+    Function that parses the lines of a json lines file inside a byte range into a dataframe and returns it with its number of rows. It is the default range function of the parallel reader.
+
+    Args:
+        file_path (str): Path of the json lines file.
+        start (int): Byte offset where the range begins. It must be the beginning of a line.
+        end (int): Byte offset where the range ends.
+        dtype (dict, optional): Dictionary with the data types of the columns. Defaults to None.
+
+    Returns:
+        tuple: Number of rows of the range and dataframe with the lines of the range.
+    """
+    dataset = read_range_to_dataframe(file_path, start, end, dtype=dtype)
+    return len(dataset), dataset
+
+def map_file_ranges(file_path: str, function: Callable, n_workers: int = None, number_of_ranges: int = None, **kwargs) -> list:
+    """
+    Function that splits a json lines file into byte ranges and applies a function to each range in a pool of processes.
+
+    Args:
+        file_path (str): Path of the json lines file.
+        function (Callable): Function that receives the file path, the start and the end of a range (and the keyword arguments) and returns a partial result. It must be defined at the top level of a module so that it can be sent to other processes.
+        n_workers (int, optional): Number of processes to use. Defaults to the number of CPUs.
+        number_of_ranges (int, optional): Number of ranges to create. Defaults to the number of processes.
+        **kwargs: Keyword arguments to pass to the function.
+
+    Returns:
+        list: List with the partial results in the order in which the ranges appear in the file.
+    """
+    #Here we define the number of processes and ranges to use
+    n_workers = n_workers or os.cpu_count() or 1
+    number_of_ranges = number_of_ranges or n_workers
+
+    #Here we split the file into ranges
+    ranges = get_byte_ranges(file_path, number_of_ranges)
+    starts = [start for start, _ in ranges]
+    ends = [end for _, end in ranges]
+    range_function = partial(function, **kwargs)
+
+    #If we only have one process or one range, we apply the function in the current process
+    if n_workers == 1 or len(ranges) <= 1:
+        return [range_function(file_path, start, end) for start, end in ranges]
+
+    #Here we apply the function to each range in a pool of processes. The map method returns the results in the order of the ranges
+    with ProcessPoolExecutor(max_workers=min(n_workers, len(ranges))) as executor:
+        return list(executor.map(range_function, [file_path] * len(ranges), starts, ends))
+
+def read_jsonl_parallel(file_path: str, n_workers: int = None, dtype: dict = None, range_function: Callable = read_range_with_row_count, **kwargs):
+    """
+    Function that reads a json lines file into a dataframe using a pool of processes.
+
+    Args:
+        file_path (str): Path of the json lines file.
+        n_workers (int, optional): Number of processes to use. Defaults to the number of CPUs.
+        dtype (dict, optional): Dictionary with the data types of the columns. Defaults to None.
+        range_function (Callable, optional): Function that parses a byte range and returns the number of rows parsed from it and a dataframe labeled with the row numbers of the range (e.g. filtering its rows but keeping their labels). Defaults to read_range_with_row_count.
+        **kwargs: Keyword arguments to pass to the range function.
+
+    Returns:
+        pd.DataFrame: Dataframe with all the lines of the file in their original order, labeled with their row number as in pd.read_json.
+    """
+    #Here we import pandas. We import it here so that the scripts that only count values don't need it
+    import pandas as pd
+
+    #Here we parse the ranges in parallel
+    results = map_file_ranges(file_path, range_function, n_workers=n_workers, dtype=dtype, **kwargs)
+
+    #Here we give the rows of each partial dataset the labels they have when the file is read sequentially: the row number in the range plus the number of rows of the previous ranges
+    partial_datasets = []
+    first_row = 0
+    for number_of_rows, partial_dataset in results:
+        #Here we ignore the empty partial datasets
+        if len(partial_dataset.columns) > 0:
+            partial_dataset.index = partial_dataset.index + first_row
+            partial_datasets.append(partial_dataset)
+        first_row += number_of_rows
+    if len(partial_datasets) == 0:
+        return pd.DataFrame()
+
+    #Here we concatenate the partial datasets in the original line order
+    return pd.concat(partial_datasets)
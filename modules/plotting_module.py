@@ -1,37 +1,69 @@
 #Here we import the necessary libraries
-import matplotlib.pyplot as plt
-import seaborn as sns
-import pandas as pd
+#The matplotlib and seaborn libraries are imported inside the functions that use them, so that importing this module is fast and doesn't change any global setting
 import warnings
+import numpy as np
+import pandas as pd
+from contextlib import contextmanager
+
+#Here we define the style of the plots. It is not applied when the module is imported, use set_plot_style or the plot_style context manager
+PLOT_STYLE = {
+    #First, we set that matplotlib plots text should be in LaTeX format.
+    "text.usetex": True,
+    #Here we set the font family to serif.
+    "font.family": "serif",
+    #Here we set the font size
+    "font.size": 10,
+    #Here we set the label size for axes
+    "axes.labelsize": 10,
+    #Here we set the label weight for axes
+    "axes.labelweight": "bold",
+    #Here we set the title size for axes
+    "axes.titlesize": 10,
+    #Here we set the ticks label size
+    "xtick.labelsize": 8,
+    "ytick.labelsize": 8,
+    #Here we set the legend font size
+    "legend.fontsize": 10,
+    #Here we set the figure title size
+    "figure.titlesize": 15
+}
+
+def set_plot_style(usetex: bool = True) -> None:
+    """
+    Function that applies the style of the plots for the rest of the session.
+
+    Args:
+        usetex (bool, optional): If True, the text of the plots is rendered with LaTeX. Defaults to True.
 
-#Here we ignore the warnings that are shown when we use the seaborn library. Specifically we ignore the FutureWarning warnings.
-warnings.simplefilter(action='ignore', category=FutureWarning)
+    Returns:
+        None
+    """
+    import matplotlib.pyplot as plt
+
+    #Here we ignore the warnings that are shown when we use the seaborn library. Specifically we ignore the FutureWarning warnings.
+    warnings.simplefilter(action='ignore', category=FutureWarning)
 
-#Here we set the style of the plots.
-#First, we set as default that matplotlib plots text should be in LaTeX format.
-plt.rcParams['text.usetex'] = True
-#Here we set the font family to serif.
-plt.rcParams['font.family'] = 'serif'
-#Here we set the font size
-plt.rcParams['font.size'] = 10
-#Here we set the label size for axes
-plt.rcParams['axes.labelsize'] = 10
-#Here we set the label weight for axes
-plt.rcParams['axes.labelweight'] = 'bold'
-#Here we set the title size for axes
-plt.rcParams['axes.titlesize'] = 10
-#Here we set the ticks label size
-plt.rcParams['xtick.labelsize'] = 8
-plt.rcParams['ytick.labelsize'] = 8
-#Here we set the legend font size
-plt.rcParams['legend.fontsize'] = 10
-#Here we set the figure title size
-plt.rcParams['figure.titlesize'] = 15
+    #Here we set the style of the plots.
+    plt.rcParams.update(PLOT_STYLE)
+    plt.rcParams["text.usetex"] = usetex
 
+@contextmanager
+def plot_style(usetex: bool = True):
+    """
+    Context manager that applies the style of the plots only inside a with block.
+
+    Args:
+        usetex (bool, optional): If True, the text of the plots is rendered with LaTeX. Defaults to True.
+    """
+    import matplotlib.pyplot as plt
 
+    with warnings.catch_warnings(), plt.rc_context({**PLOT_STYLE, "text.usetex": usetex}):
+        #Here we ignore the FutureWarning warnings of the seaborn library
+        warnings.simplefilter(action='ignore', category=FutureWarning)
+        yield
 
 
-def box_plot(data: pd.DataFrame, x: str = None, y: str = None, **kwargs) -> None:
+def box_plot(data: pd.DataFrame, x: str = None, y: str = None, aggregate: bool = False, **kwargs) -> None:
     """
     Function that plots boxplots for the columns of a dataframe.
 
@@ -39,29 +71,103 @@ def box_plot(data: pd.DataFrame, x: str = None, y: str = None, **kwargs) -> None
         data (pd.DataFrame): Dataframe with the columns to plot.
         x (str, optional): Dataframe column to plot. Defaults to None.
         y (str, optional): Dataframe column to plot. Defaults to None.
-        **kwargs: Keyword arguments to pass to the seaborn boxplot function.
+        aggregate (bool, optional): If True, the quartiles and whiskers are computed first with pandas and only the boxes are drawn with matplotlib, without the outliers. Use it for datasets with millions of rows. Defaults to False.
+        **kwargs: Keyword arguments to pass to the seaborn boxplot function (or to the matplotlib bxp function if aggregate is True).
 
     Returns:
         None
     """
+    #If we want to aggregate the data, we plot the boxes from the precomputed statistics
+    if aggregate:
+        aggregated_box_plot(data, x=x, y=y, **kwargs)
+        return
+
+    import seaborn as sns
+
     #Here we plot the boxplot using seaborn
     sns.boxplot(data=data, x=x, y=y, width=0.1, **kwargs)
 
-def hist_plot(data: pd.DataFrame, x: str = None, y: str = None, **kwargs) -> None:
+def get_box_statistics(values: pd.Series, groups: pd.Series = None) -> list:
     """
-    Function that plots the distribution of a dataframe column.
+    Function that computes the statistics needed to draw boxplots (quartiles and whiskers at 1.5 times the interquartile range) for each group of values.
+
+    Args:
+        values (pd.Series): Numeric values.
+        groups (pd.Series, optional): Group of each value. Defaults to None, in which case all the values are in the same group.
+
+    Returns:
+        list: List of dictionaries with the statistics of each group, in the format of the matplotlib bxp function.
+    """
+    #Here we put all the values in the same group if there are no groups
+    if groups is None:
+        groups = pd.Series("", index=values.index)
+
+    #Here we compute the quartiles of each group
+    quartiles = values.groupby(groups, observed=True).quantile([0.25, 0.5, 0.75]).unstack()
+    interquartile_range = quartiles[0.75] - quartiles[0.25]
+
+    #Here we compute the whiskers, which are the most extreme values inside 1.5 times the interquartile range from the box
+    lower_limit = groups.map(quartiles[0.25] - 1.5 * interquartile_range).astype(float)
+    upper_limit = groups.map(quartiles[0.75] + 1.5 * interquartile_range).astype(float)
+    lower_whiskers = values.where(values >= lower_limit).groupby(groups, observed=True).min()
+    upper_whiskers = values.where(values <= upper_limit).groupby(groups, observed=True).max()
+
+    return [{
+        "label": str(group),
+        "q1": quartiles.loc[group, 0.25],
+        "med": quartiles.loc[group, 0.5],
+        "q3": quartiles.loc[group, 0.75],
+        "whislo": lower_whiskers.loc[group],
+        "whishi": upper_whiskers.loc[group],
+        "fliers": []
+    } for group in quartiles.index]
+
+def aggregated_box_plot(data: pd.DataFrame, x: str = None, y: str = None, **kwargs) -> None:
+    """
+    Function that plots boxplots from precomputed statistics, so that the time to draw them doesn't depend on the number of rows.
+    As in seaborn, if both columns are given the numeric one is plotted grouped by the other one.
 
     Args:
         data (pd.DataFrame): Dataframe with the columns to plot.
         x (str, optional): Dataframe column to plot. Defaults to None.
         y (str, optional): Dataframe column to plot. Defaults to None.
-        **kwargs: Keyword arguments to pass to the seaborn histplot function.
+        **kwargs: Keyword arguments to pass to the matplotlib bxp function.
 
     Returns:
         None
     """
-    #Here we plot the histogram using seaborn
-    sns.histplot(data=data, x=x, y=y, **kwargs)
+    import matplotlib.pyplot as plt
+
+    #Here we decide which column has the values and which one has the groups. The boxes are vertical unless the values are in the x column
+    if x is not None and y is not None:
+        vertical = pd.api.types.is_numeric_dtype(data[y])
+        value_column, group_column = (y, x) if vertical else (x, y)
+    else:
+        vertical = y is not None
+        value_column, group_column = (y if vertical else x), None
+
+    #Here we compute the statistics of the boxes
+    values = pd.to_numeric(data[value_column], errors="coerce")
+    groups = data[group_column] if group_column is not None else None
+    box_statistics = get_box_statistics(values, groups)
+
+    #Here we draw the boxes with matplotlib
+    axes = plt.gca()
+    try:
+        axes.bxp(box_statistics, widths=0.1, showfliers=False, orientation="vertical" if vertical else "horizontal", **kwargs)
+    except TypeError:
+        #Older versions of matplotlib use the vert argument instead of orientation
+        axes.bxp(box_statistics, widths=0.1, showfliers=False, vert=vertical, **kwargs)
+
+    #Here we set the labels of the axes
+    if vertical:
+        axes.set_ylabel(value_column)
+        if group_column is not None:
+            axes.set_xlabel(group_column)
+    else:
+        axes.set_xlabel(value_column)
+        if group_column is not None:
+            axes.set_ylabel(group_column)
 
 def bar_plot(data: pd.DataFrame, x: str = None, y: str = None, **kwargs) -> None:
     """
@@ -76,6 +182,8 @@ def bar_plot(data: pd.DataFrame, x: str = None, y: str = None, **kwargs) -> None
     Returns:
         None
     """
+    import seaborn as sns
+
     #Here we plot the bar plot using seaborn
     sns.barplot(data=data, x=x, y=y, **kwargs)
 
@@ -90,6 +198,8 @@ def heat_map(data: pd.DataFrame, **kwargs) -> None:
     Returns:
         None
     """
+    import seaborn as sns
+
     #Here we plot the heat map using seaborn
     sns.heatmap(data=data, **kwargs)
 
@@ -105,6 +215,8 @@ def pie_chart(counts_list: list, labels_list: list = None, **kwargs) -> None:
     Returns:
         None
     """
+    import matplotlib.pyplot as plt
+
     #Here we define a list called explode with the coefficients for the explosion of the pie chart. This is a form of highlighting a specific slice of the pie chart.
     explode = [0.1 for i in range(len(counts_list))]
 
@@ -114,7 +226,7 @@ def pie_chart(counts_list: list, labels_list: list = None, **kwargs) -> None:
     #We use the legend function to add a legend to the pie chart. We use the labels_list parameter to add the labels to the legend.
     plt.legend(labels_list, loc="upper center", bbox_to_anchor=(0.5, 0.05), ncol=5, fancybox=True, shadow=True)
 
-def scatter_plot(data: pd.DataFrame, x: str = None, y: str = None, **kwargs) -> None:
+def scatter_plot(data: pd.DataFrame, x: str = None, y: str = None, aggregate: bool = False, bins: int = 100, **kwargs) -> None:
     """
     Function that plots a scatter plot.
 
@@ -122,15 +234,59 @@ def scatter_plot(data: pd.DataFrame, x: str = None, y: str = None, **kwargs) ->
         data (pd.DataFrame): Dataframe with the columns to plot.
         x (str, optional): Dataframe column to plot. Defaults to None.
         y (str, optional): Dataframe column to plot. Defaults to None.
-        **kwargs: Keyword arguments to pass to the seaborn scatterplot function.
+        aggregate (bool, optional): If True, the points are binned with numpy into a 2D grid and the number of points of each cell is plotted as a density map. Use it for datasets with millions of rows. Defaults to False.
+        bins (int, optional): Number of bins of each axis of the density map. Defaults to 100.
+        **kwargs: Keyword arguments to pass to the seaborn scatterplot function (or to the matplotlib pcolormesh function if aggregate is True).
 
     Returns:
         None
     """
+    #If we want to aggregate the data, we plot a density map instead of the points
+    if aggregate:
+        density_plot(data, x=x, y=y, bins=bins, **kwargs)
+        return
+
+    import seaborn as sns
+
     #Here we plot the scatter plot using seaborn
     sns.scatterplot(data=data, x=x, y=y, **kwargs)
 
-def hist_plot(data: pd.DataFrame, x: str = None, y: str = None, **kwargs) -> None:
+def density_plot(data: pd.DataFrame, x: str, y: str, bins: int = 100, **kwargs) -> None:
+    """
+    Function that plots the number of points of each cell of a 2D grid. The grid is computed with numpy, so the time to draw it only depends on the number of bins.
+
+    Args:
+        data (pd.DataFrame): Dataframe with the columns to plot.
+        x (str): Dataframe column to plot.
+        y (str): Dataframe column to plot.
+        bins (int, optional): Number of bins of each axis. Defaults to 100.
+        **kwargs: Keyword arguments to pass to the matplotlib pcolormesh function. The ax keyword argument gives the axes where the grid is plotted.
+
+    Returns:
+        None
+    """
+    import matplotlib.pyplot as plt
+    from matplotlib.colors import LogNorm
+
+    #Here we keep only the points where both values are finite
+    x_values = pd.to_numeric(data[x], errors="coerce").to_numpy(dtype=float, na_value=np.nan)
+    y_values = pd.to_numeric(data[y], errors="coerce").to_numpy(dtype=float, na_value=np.nan)
+    finite = np.isfinite(x_values) & np.isfinite(y_values)
+
+    #Here we count the points of each cell of the grid
+    counts, x_edges, y_edges = np.histogram2d(x_values[finite], y_values[finite], bins=bins)
+
+    #Here we plot the counts with a logarithmic color scale, hiding the empty cells
+    kwargs.setdefault("norm", LogNorm())
+    kwargs.setdefault("cmap", "viridis")
+    #If no axes are given, we plot on the current axes
+    ax = kwargs.pop("ax", None) or plt.gca()
+    mesh = ax.pcolormesh(x_edges, y_edges, np.ma.masked_equal(counts.T, 0), **kwargs)
+    ax.figure.colorbar(mesh, ax=ax, label="count")
+    ax.set_xlabel(x)
+    ax.set_ylabel(y)
+
+def hist_plot(data: pd.DataFrame, x: str = None, y: str = None, aggregate: bool = False, bins: int = 50, **kwargs) -> None:
     """
     Function that plots a histogram.
 
@@ -138,10 +294,34 @@ def hist_plot(data: pd.DataFrame, x: str = None, y: str = None, **kwargs) -> Non
         data (pd.DataFrame): Dataframe with the columns to plot.
         x (str, optional): Dataframe column to plot. Defaults to None.
         y (str, optional): Dataframe column to plot. Defaults to None.
+        aggregate (bool, optional): If True, the counts of the bins are computed first with numpy and only the bins are passed to seaborn. Use it for datasets with millions of rows. Defaults to False.
+        bins (int, optional): Number of bins used if aggregate is True. Defaults to 50.
         **kwargs: Keyword arguments to pass to the seaborn histplot function.
 
     Returns:
         None
     """
+    import seaborn as sns
+
+    #If we want to aggregate the data, we compute the counts of the bins with numpy
+    if aggregate:
+        #If both columns are given, the histogram is bivariate, so we plot it as a density map with the same keyword arguments (e.g. cmap or ax)
+        if x is not None and y is not None:
+            density_plot(data, x=x, y=y, bins=bins, **kwargs)
+            return
+
+        #Here we count the finite values of each bin
+        column = x if x is not None else y
+        values = pd.to_numeric(data[column], errors="coerce").to_numpy(dtype=float, na_value=np.nan)
+        counts, edges = np.histogram(values[np.isfinite(values)], bins=bins)
+
+        #Here we plot one weighted value per bin, so seaborn draws the same bars from only as many values as bins
+        bins_data = pd.DataFrame({column: edges[:-1], "count": counts})
+        if x is not None:
+            sns.histplot(data=bins_data, x=column, weights="count", bins=len(counts), binrange=(edges[0], edges[-1]), **kwargs)
+        else:
+            sns.histplot(data=bins_data, y=column, weights="count", bins=len(counts), binrange=(edges[0], edges[-1]), **kwargs)
+        return
+
     #Here we plot the histogram using seaborn
     sns.histplot(data=data, x=x, y=y, **kwargs)
@@ -0,0 +1,244 @@
+#Here we import the necessary libraries
+import os
+import sys
+import json
+import time
+import inspect
+import functools
+import tracemalloc
+from typing import List
+
+#Here we import the resource module, which gives the peak memory of the process. It is not available on Windows
+try:
+    import resource
+except ImportError:
+    resource = None
+
+#Here we store the state of the profiler. It is disabled by default, so the stages cost only a function call and a check
+ENABLED = False
+TRACE_ALLOCATIONS = False
+LOG_PATH = None
+
+#Here we store the finished top-level stages (the registry) and the stack of the stages that are running
+records = []
+stages_stack = []
+
+
+def get_peak_rss() -> int:
+    """
+    Function that returns the peak resident set size of the current process.
+
+    Returns:
+        int: Peak resident set size in bytes, or None if it is not available.
+    """
+    if resource is None:
+        return None
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    #Linux gives the value in kilobytes and macOS in bytes
+    return peak_rss if sys.platform == "darwin" else peak_rss * 1024
+
+class Stage:
+    """
+    Class that measures a stage of the code: its wall time, the rows it processes, the peak memory of the process, the memory blocks it allocates and, if allocations are traced, its peak traced memory.
+    The stages that run inside it are stored as its children.
+    """
+    def __init__(self, name: str, rows: int = None):
+        self.name = name
+        self.rows = rows
+        self.children = []
+
+    def __enter__(self):
+        #If we trace the allocations, we reset the peak of tracemalloc. The peak reached so far is kept in the parent stage, since the reset loses it
+        self.traced_peak = 0
+        if TRACE_ALLOCATIONS and tracemalloc.is_tracing():
+            if len(stages_stack) > 0:
+                stages_stack[-1].traced_peak = max(stages_stack[-1].traced_peak, tracemalloc.get_traced_memory()[1])
+            tracemalloc.reset_peak()
+
+        #Here we put the stage on the stack, so that the stages that run inside it become its children
+        stages_stack.append(self)
+        self.allocated_blocks = sys.getallocatedblocks()
+        self.start = time.time()
+        self.start_counter = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        wall_time = time.perf_counter() - self.start_counter
+        if TRACE_ALLOCATIONS and tracemalloc.is_tracing():
+            self.traced_peak = max(self.traced_peak, tracemalloc.get_traced_memory()[1])
+        record = {
+            "name": self.name,
+            "start": self.start,
+            "wall_time": wall_time,
+            "rows": self.rows,
+            "rows_per_second": self.rows / wall_time if self.rows is not None and wall_time > 0 else None,
+            "peak_rss": get_peak_rss(),
+            "allocated_blocks": sys.getallocatedblocks() - self.allocated_blocks,
+            "traced_peak": self.traced_peak if TRACE_ALLOCATIONS else None,
+            "error": exc_type.__name__ if exc_type is not None else None,
+            "children": self.children
+        }
+
+        #Here we take the stage out of the stack and store its record in its parent or, if it is a top-level stage, in the registry and the log
+        stages_stack.pop()
+        if len(stages_stack) > 0:
+            stages_stack[-1].children.append(record)
+            stages_stack[-1].traced_peak = max(stages_stack[-1].traced_peak, self.traced_peak)
+        else:
+            records.append(record)
+            if LOG_PATH is not None:
+                with open(LOG_PATH, "a") as file:
+                    file.write(json.dumps(record) + "\n")
+
+class NullStage:
+    """
+    Class of the stage that is returned when the profiler is disabled. It does nothing.
+    """
+    rows = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        return None
+
+NULL_STAGE = NullStage()
+
+def profile_stage(name: str, rows: int = None):
+    """
+    Function that returns a context manager that measures a stage of the code. The number of processed rows can be given here or set later in the rows attribute of the stage.
+
+    Args:
+        name (str): Name of the stage.
+        rows (int, optional): Number of rows processed in the stage. Defaults to None.
+
+    Returns:
+        Stage: Context manager of the stage, or a stage that does nothing if the profiler is disabled.
+    """
+    if not ENABLED:
+        return NULL_STAGE
+    return Stage(name, rows)
+
+def enable(log_path: str = None, trace_allocations: bool = False, modules: list = ()) -> None:
+    """
+    Function that enables the profiler.
+
+    Args:
+        log_path (str, optional): Path of the json lines file where the top-level stages are appended. Defaults to None, in which case they are only stored in the registry.
+        trace_allocations (bool, optional): If True, the memory allocations are traced with tracemalloc to get the peak memory of each stage. It makes the code slower. Defaults to False.
+        modules (list, optional): Modules whose public functions are instrumented. Defaults to ().
+    """
+    global ENABLED, TRACE_ALLOCATIONS, LOG_PATH
+    ENABLED = True
+    TRACE_ALLOCATIONS = trace_allocations
+    LOG_PATH = log_path
+    if trace_allocations and not tracemalloc.is_tracing():
+        tracemalloc.start()
+    for module in modules:
+        instrument(module)
+
+def enable_from_environment(modules: list = ()) -> bool:
+    """
+    Function that enables the profiler if the ADM_PROFILE_LOG environment variable is set to the path of the log. If the ADM_PROFILE_ALLOCATIONS environment variable is set to 1, the allocations are traced too.
+
+    Args:
+        modules (list, optional): Modules whose public functions are instrumented. Defaults to ().
+
+    Returns:
+        bool: True if the profiler was enabled.
+    """
+    log_path = os.environ.get("ADM_PROFILE_LOG")
+    if not log_path:
+        return False
+    enable(log_path, trace_allocations=os.environ.get("ADM_PROFILE_ALLOCATIONS") == "1", modules=modules)
+    return True
+
+def disable() -> None:
+    """
+    Function that disables the profiler. The instrumented functions are kept, but they only check that the profiler is disabled.
+    """
+    global ENABLED, TRACE_ALLOCATIONS
+    ENABLED = False
+    if TRACE_ALLOCATIONS and tracemalloc.is_tracing():
+        tracemalloc.stop()
+    TRACE_ALLOCATIONS = False
+
+def reset() -> None:
+    """
+    Function that empties the registry of stages.
+    """
+    records.clear()
+
+def profiled(function, name: str = None):
+    """
+    Function that wraps a function so that each call is measured as a stage. If the function returns a dataframe or another object with a length, its length is used as the number of rows.
+
+    Args:
+        function: Function to wrap.
+        name (str, optional): Name of the stage. Defaults to the name of the function.
+
+    Returns:
+        Wrapped function.
+    """
+    name = name or function.__name__
+
+    @functools.wraps(function)
+    def wrapper(*args, **kwargs):
+        #If the profiler is disabled, we only call the function
+        if not ENABLED:
+            return function(*args, **kwargs)
+        with Stage(name) as stage:
+            result = function(*args, **kwargs)
+            if hasattr(result, "__len__") and not isinstance(result, (str, bytes)):
+                stage.rows = len(result)
+        return result
+
+    wrapper.__profiled__ = True
+    return wrapper
+
+def instrument(module) -> List[str]:
+    """
+    Function that replaces the public functions of a module with profiled versions of them. Generators are not wrapped, since their work happens after the call returns.
+    The functions of the module call each other through the module, so the stages of the inner calls are nested inside the outer ones.
+
+    Args:
+        module: Module to instrument.
+
+    Returns:
+        List[str]: Names of the instrumented functions.
+    """
+    instrumented = []
+    for name, function in list(vars(module).items()):
+        #Here we keep only the public functions defined in the module that are not instrumented yet
+        if name.startswith("_") or not inspect.isfunction(function) or function.__module__ != module.__name__:
+            continue
+        if inspect.isgeneratorfunction(function) or getattr(function, "__profiled__", False):
+            continue
+        setattr(module, name, profiled(function, f"{module.__name__.split('.')[-1]}.{name}"))
+        instrumented.append(name)
+    return instrumented
+
+def summarize(stage_records: list = None) -> dict:
+    """
+    Function that aggregates the stages of the registry by their path (the names of the stage and its parents joined by "/").
+
+    Args:
+        stage_records (list, optional): Top-level stages to aggregate. Defaults to the registry.
+
+    Returns:
+        dict: Dictionary with the number of calls, the total wall time and the total rows of each path.
+    """
+    summary = {}
+
+    def add_record(record: dict, parent_path: str) -> None:
+        path = f"{parent_path}/{record['name']}" if parent_path else record["name"]
+        path_summary = summary.setdefault(path, {"calls": 0, "wall_time": 0.0, "rows": 0})
+        path_summary["calls"] += 1
+        path_summary["wall_time"] += record["wall_time"]
+        path_summary["rows"] += record["rows"] or 0
+        for child in record["children"]:
+            add_record(child, path)
+
+    for record in (records if stage_records is None else stage_records):
+        add_record(record, "")
+    return summary
@@ -0,0 +1,253 @@
+#Here we import the necessary libraries
+import os
+import heapq
+from collections import Counter
+from typing import Dict, List, Tuple
+from concurrent.futures import ProcessPoolExecutor
+from . import jsonl_module, streaming_module
+
+
+class Consumer:
+    """
+    Base class of the analyses that are computed by the ScanEngine. The engine splits each file into byte ranges and, for each range:
+    it creates a state with the create method, calls the consume method with every decoded record of the range and calls the close method at the end of the range.
+    Then it merges the states of the ranges in the order of the file with the merge method and returns the result of the finalize method.
+    The consumers are sent to other processes, so their classes must be defined at the top level of a module.
+
+    Args:
+        name (str): Name of the result of the consumer.
+    """
+    #Key that a line must contain for the consumer to need its record. If all the consumers of a file have a key and a line contains none of them, the line is not decoded
+    required_key = None
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def create(self):
+        return None
+
+    def consume(self, state, record: dict, offset: int):
+        return state
+
+    def close(self, state):
+        return state
+
+    def merge(self, state, other_state):
+        return state
+
+    def finalize(self, state):
+        return state
+
+class TagCounter(Consumer):
+    """
+    Consumer that counts the occurrences of each tag in the lists, as the streaming_module.count_tags function.
+
+    Args:
+        name (str, optional): Name of the result. Defaults to "tags".
+        field (str, optional): Name of the field with the tags. Defaults to "tags".
+        capacity (int, optional): If it is not None, the tags are counted approximately with a SpaceSaving summary with this number of counters. Defaults to None.
+    """
+    def __init__(self, name: str = "tags", field: str = "tags", capacity: int = None):
+        super().__init__(name)
+        self.field = field
+        self.capacity = capacity
+        self.required_key = f'"{field}"'.encode()
+
+    def create(self):
+        return Counter() if self.capacity is None else streaming_module.SpaceSaving(self.capacity)
+
+    def consume(self, state, record: dict, offset: int):
+        #Some lines do not have tags, so we must check for this
+        tags = record.get(self.field)
+        if tags:
+            if self.capacity is None:
+                state.update(tags)
+            else:
+                state.update_many(tags)
+        return state
+
+    def merge(self, state, other_state):
+        return streaming_module.merge_counters([state, other_state])
+
+class TopSeries(Consumer):
+    """
+    Consumer that keeps the k series with the greatest total book count, as the streaming_module.get_top_series function.
+    Ties are broken by the byte offset of the line, which gives the same order as the line number.
+
+    Args:
+        name (str, optional): Name of the result. Defaults to "top_series".
+        k (int, optional): Number of series to keep. Defaults to 5.
+    """
+    def __init__(self, name: str = "top_series", k: int = 5):
+        super().__init__(name)
+        self.k = k
+
+    def create(self) -> list:
+        return []
+
+    def consume(self, heap: list, record: dict, offset: int) -> list:
+        total_book_count = sum(streaming_module.to_number(work.get("books_count")) for work in record.get("works") or [])
+        item = (total_book_count, offset, record.get("id"), record.get("title"))
+        #Here we add the series to the heap, removing the smallest series when the heap has more than k items
+        if len(heap) < self.k:
+            heapq.heappush(heap, item)
+        elif item > heap[0]:
+            heapq.heapreplace(heap, item)
+        return heap
+
+    def merge(self, heap: list, other_heap: list) -> list:
+        return heapq.nlargest(self.k, heap + other_heap)
+
+    def finalize(self, heap: list) -> list:
+        return streaming_module.sort_top_series(heap)
+
+class ListBooks(Consumer):
+    """
+    Consumer that returns the books of the first list with a given title, as the data_handling_module.get_worst_books_list function.
+
+    Args:
+        name (str, optional): Name of the result. Defaults to "worst_books".
+        title (str, optional): Title of the list. Defaults to "The Worst Books of All Time".
+    """
+    def __init__(self, name: str = "worst_books", title: str = "The Worst Books of All Time"):
+        super().__init__(name)
+        self.title = title
+
+    def consume(self, books: list, record: dict, offset: int) -> list:
+        if books is None and record.get("title") == self.title:
+            return record.get("books")
+        return books
+
+    def merge(self, books: list, other_books: list) -> list:
+        #The states are merged in the order of the file, so we keep the first list found
+        return books if books is not None else other_books
+
+class YearlyBookStats(Consumer):
+    """
+    Consumer that computes the yearly statistics of the books, as the data_handling_module.historical_dataframe function.
+    The needed fields of the records are buffered and added to a YearlyStats object in batches, so that the statistics are computed with groupby operations.
+
+    Args:
+        name (str, optional): Name of the result. Defaults to "yearly_stats".
+        column_name (str, optional): Name of the field with the publication dates. Defaults to "original_publication_date".
+        batch_size (int, optional): Number of records buffered before they are added to the statistics. Defaults to 100000.
+    """
+    def __init__(self, name: str = "yearly_stats", column_name: str = "original_publication_date", batch_size: int = 100000):
+        super().__init__(name)
+        self.column_name = column_name
+        self.batch_size = batch_size
+
+    def create(self) -> dict:
+        #Here we import the data handling module. We import it here so that the other consumers don't need pandas
+        from . import data_handling_module
+        return {"stats": data_handling_module.YearlyStats(self.column_name), "rows": []}
+
+    def consume(self, state: dict, record: dict, offset: int) -> dict:
+        state["rows"].append((record.get(self.column_name), record.get("num_pages"), record.get("title")))
+        if len(state["rows"]) >= self.batch_size:
+            state = self.close(state)
+        return state
+
+    def close(self, state: dict) -> dict:
+        #Here we add the buffered records to the statistics, preparing them as the chunks of get_data
+        if len(state["rows"]) > 0:
+            import pandas as pd
+            from . import data_handling_module
+            books = data_handling_module.prepare_chunk(pd.DataFrame(state["rows"], columns=[self.column_name, "num_pages", "title"]))
+            state["stats"].update(data_handling_module.standardize_time_column_to_period(books, self.column_name))
+            state["rows"] = []
+        return state
+
+    def merge(self, state: dict, other_state: dict) -> dict:
+        state["stats"].merge(other_state["stats"])
+        return state
+
+    def finalize(self, state: dict):
+        return state["stats"].to_dataframe()
+
+def scan_range(file_path: str, start: int, end: int, consumers: List[Consumer]) -> list:
+    """
+    Function that decodes each line of a byte range of a json lines file once and passes its record to all the consumers. It is used by the processes of the ScanEngine.
+
+    Args:
+        file_path (str): Path of the json lines file.
+        start (int): Byte offset where the range begins.
+        end (int): Byte offset where the range ends.
+        consumers (List[Consumer]): Consumers of the file.
+
+    Returns:
+        list: List with the state of each consumer for the range.
+    """
+    states = [consumer.create() for consumer in consumers]
+    #Here we get the keys of the consumers. If a consumer needs every record, we decode every line
+    required_keys = [consumer.required_key for consumer in consumers]
+    skip_lines = all(key is not None for key in required_keys)
+
+    offset = start
+    for line in jsonl_module.iterate_range_lines(file_path, start, end):
+        line_offset = offset
+        offset += len(line)
+        if not line.strip() or (skip_lines and not any(key in line for key in required_keys)):
+            continue
+        record = jsonl_module.loads(line)
+        for i, consumer in enumerate(consumers):
+            states[i] = consumer.consume(states[i], record, line_offset)
+
+    return [consumer.close(state) for consumer, state in zip(consumers, states)]
+
+class ScanEngine:
+    """
+    Class that computes many analyses of json lines files reading and decoding each file only once.
+    The analyses are registered as consumers of a file. The files are split into byte ranges, and the ranges of all the files are scanned concurrently in a pool of processes.
+    """
+    def __init__(self):
+        #Here we store the consumers of each file
+        self.consumers = {}
+
+    def register(self, file_path: str, consumer: Consumer) -> "ScanEngine":
+        """
+        Method that registers a consumer of a file.
+
+        Args:
+            file_path (str): Path of the json lines file.
+            consumer (Consumer): Consumer of the records of the file.
+
+        Returns:
+            ScanEngine: The engine, so that calls can be chained.
+        """
+        self.consumers.setdefault(file_path, []).append(consumer)
+        return self
+
+    def run(self, n_workers: int = None, ranges_per_file: int = None) -> Dict[str, object]:
+        """
+        Method that scans all the files and returns the results of the consumers.
+
+        Args:
+            n_workers (int, optional): Number of processes to use. Defaults to the number of CPUs.
+            ranges_per_file (int, optional): Number of byte ranges of each file. Defaults to the number of processes.
+
+        Returns:
+            Dict[str, object]: Dictionary with the result of each consumer by name.
+        """
+        n_workers = n_workers or os.cpu_count() or 1
+        ranges_per_file = ranges_per_file or n_workers
+
+        #Here we create a task for each byte range of each file
+        tasks: List[Tuple[str, int, int]] = [(file_path, start, end) for file_path in self.consumers for start, end in jsonl_module.get_byte_ranges(file_path, ranges_per_file)]
+        task_consumers = [self.consumers[file_path] for file_path, _, _ in tasks]
+
+        #Here we scan the ranges. The map method returns the states in the order of the tasks, so the ranges of each file are in the order of the file
+        if n_workers == 1 or len(tasks) <= 1:
+            range_states = [scan_range(file_path, start, end, consumers) for (file_path, start, end), consumers in zip(tasks, task_consumers)]
+        else:
+            with ProcessPoolExecutor(max_workers=min(n_workers, len(tasks))) as executor:
+                range_states = list(executor.map(scan_range, *zip(*tasks), task_consumers))
+
+        #Here we merge the states of the ranges of each file in the order of the file
+        merged_states = {}
+        for (file_path, _, _), states in zip(tasks, range_states):
+            for consumer, state in zip(self.consumers[file_path], states):
+                merged_states[consumer.name] = consumer.merge(merged_states[consumer.name], state) if consumer.name in merged_states else state
+
+        #Here we return the result of each consumer. The consumers of empty files get the result of an empty state
+        return {consumer.name: consumer.finalize(merged_states[consumer.name] if consumer.name in merged_states else consumer.create()) for consumers in self.consumers.values() for consumer in consumers}
@@ -0,0 +1,363 @@
+#Here we import the necessary libraries
+import sys
+
+
+class Shelf:
+    """
+    Class that simulates the shelf of the Algorithmic Question. Each book gets a virtual position when it is placed: books placed on the left get positions counting down from 0 and books placed on the right get positions counting up from 1.
+    Since the books are never removed, the number of books to the left of a book is its position minus the position of the leftmost book, so all the instructions take O(1) time.
+    """
+    def __init__(self):
+        #Here we store the virtual position of each book id
+        self.positions = {}
+        #Here we store the positions that the next books placed on the left and on the right will get
+        self.next_left = 0
+        self.next_right = 1
+
+    def __len__(self) -> int:
+        return self.next_right - self.next_left - 1
+
+    def place_left(self, book_id) -> None:
+        """
+        Method that places a book to the left of the leftmost book (L instruction).
+
+        Args:
+            book_id: Id of the book.
+        """
+        self.positions[book_id] = self.next_left
+        self.next_left -= 1
+
+    def place_right(self, book_id) -> None:
+        """
+        Method that places a book to the right of the rightmost book (R instruction).
+
+        Args:
+            book_id: Id of the book.
+        """
+        self.positions[book_id] = self.next_right
+        self.next_right += 1
+
+    def query(self, book_id) -> int:
+        """
+        Method that returns the minimum number of books we must pop from the left or right to have a book as the leftmost or rightmost book (? instruction).
+
+        Args:
+            book_id: Id of the book. It must be on the shelf.
+
+        Returns:
+            int: Minimum number of books to pop.
+        """
+        position = self.positions[book_id]
+        #The books to the left are the ones between the leftmost position and the position of the book, and analogously for the right
+        return min(position - self.next_left - 1, self.next_right - 1 - position)
+
+class DynamicShelf:
+    """
+    Class that simulates a shelf where books can also be popped from both ends, removed by id and looked up by their position from the left.
+    As in the Shelf class, each book gets a virtual position when it is placed. A Fenwick tree over the virtual positions counts the books that are still on the shelf,
+    so the number of books to the left of a book (its rank) and the book with a given rank are found in O(log n) time, and removing a book takes O(log n) time.
+    The tree grows when the positions reach its ends, so the number of books doesn't need to be known in advance.
+
+    Args:
+        capacity (int, optional): Initial number of virtual positions of the tree. Defaults to 1024.
+    """
+    def __init__(self, capacity: int = 1024):
+        #Here we store the virtual position of each book id and the book id of each occupied index of the tree
+        self.positions = {}
+        self.books = {}
+        #Here we store the positions that the next books placed on the left and on the right will get, as in the Shelf class
+        self.next_left = 0
+        self.next_right = 1
+        #Here we create the tree. The virtual position p is stored at the index p + origin, and the origin is in the middle so that the shelf can grow on both sides
+        self.capacity = capacity
+        self.origin = capacity // 2
+        self.tree = [0] * (capacity + 1)
+        self.size = 0
+
+    def __len__(self) -> int:
+        return self.size
+
+    def _add(self, index: int, value: int) -> None:
+        """
+        Method that adds a value to an index of the Fenwick tree.
+
+        Args:
+            index (int): Index of the tree (0-based).
+            value (int): Value to add.
+        """
+        tree = self.tree
+        index += 1
+        while index <= self.capacity:
+            tree[index] += value
+            index += index & -index
+
+    def _prefix_sum(self, index: int) -> int:
+        """
+        Method that returns the number of books in the indexes from 0 to index (included).
+
+        Args:
+            index (int): Index of the tree (0-based).
+
+        Returns:
+            int: Number of books.
+        """
+        tree = self.tree
+        total = 0
+        index += 1
+        while index > 0:
+            total += tree[index]
+            index -= index & -index
+        return total
+
+    def _grow(self, position: int) -> None:
+        """
+        Method that doubles the capacity of the tree until a virtual position fits in it. The tree is built again in O(n) time, so the cost of growing is O(1) per book on average.
+
+        Args:
+            position (int): Virtual position that must fit in the tree.
+        """
+        capacity, origin = self.capacity, self.origin
+        while not 0 <= position + origin < capacity:
+            #Here we add the new space on the side where it is needed
+            if position + origin < 0:
+                origin += capacity
+            capacity *= 2
+
+        #Here we build the new tree from the indexes of the books in linear time
+        tree = [0] * (capacity + 1)
+        books = {}
+        for index, book_id in self.books.items():
+            new_index = index - self.origin + origin
+            books[new_index] = book_id
+            tree[new_index + 1] = 1
+        for index in range(1, capacity + 1):
+            parent = index + (index & -index)
+            if parent <= capacity:
+                tree[parent] += tree[index]
+
+        self.capacity, self.origin, self.tree, self.books = capacity, origin, tree, books
+
+    def _insert(self, book_id, position: int) -> None:
+        """
+        Method that places a book at a virtual position.
+
+        Args:
+            book_id: Id of the book.
+            position (int): Virtual position of the book.
+        """
+        if not 0 <= position + self.origin < self.capacity:
+            self._grow(position)
+        index = position + self.origin
+        self.positions[book_id] = position
+        self.books[index] = book_id
+        self._add(index, 1)
+        self.size += 1
+
+    def place_left(self, book_id) -> None:
+        """
+        Method that places a book to the left of the leftmost book (L instruction).
+
+        Args:
+            book_id: Id of the book.
+        """
+        self._insert(book_id, self.next_left)
+        self.next_left -= 1
+
+    def place_right(self, book_id) -> None:
+        """
+        Method that places a book to the right of the rightmost book (R instruction).
+
+        Args:
+            book_id: Id of the book.
+        """
+        self._insert(book_id, self.next_right)
+        self.next_right += 1
+
+    def remove(self, book_id) -> None:
+        """
+        Method that removes a book from the shelf.
+
+        Args:
+            book_id: Id of the book. It must be on the shelf.
+        """
+        index = self.positions.pop(book_id) + self.origin
+        del self.books[index]
+        self._add(index, -1)
+        self.size -= 1
+
+    def rank(self, book_id) -> int:
+        """
+        Method that returns the number of books to the left of a book.
+
+        Args:
+            book_id: Id of the book. It must be on the shelf.
+
+        Returns:
+            int: Number of books to the left of the book.
+        """
+        return self._prefix_sum(self.positions[book_id] + self.origin) - 1
+
+    def select(self, k: int):
+        """
+        Method that returns the k-th book from the left (starting from 0).
+
+        Args:
+            k (int): Number of books to the left of the book. It must be between 0 and the number of books minus 1.
+
+        Returns:
+            Id of the book.
+        """
+        if not 0 <= k < self.size:
+            raise IndexError(f"There is no book at position {k} of a shelf with {self.size} books.")
+
+        #Here we descend the Fenwick tree looking for the last index with at most k books before it
+        tree = self.tree
+        index = 0
+        step = 1 << (self.capacity.bit_length() - 1)
+        while step > 0:
+            if index + step <= self.capacity and tree[index + step] <= k:
+                index += step
+                k -= tree[index]
+            step >>= 1
+        return self.books[index]
+
+    def pop_left(self):
+        """
+        Method that removes the leftmost book.
+
+        Returns:
+            Id of the removed book.
+        """
+        book_id = self.select(0)
+        self.remove(book_id)
+        return book_id
+
+    def pop_right(self):
+        """
+        Method that removes the rightmost book.
+
+        Returns:
+            Id of the removed book.
+        """
+        book_id = self.select(self.size - 1)
+        self.remove(book_id)
+        return book_id
+
+    def query(self, book_id) -> int:
+        """
+        Method that returns the minimum number of books we must pop from the left or right to have a book as the leftmost or rightmost book (? instruction).
+
+        Args:
+            book_id: Id of the book. It must be on the shelf.
+
+        Returns:
+            int: Minimum number of books to pop.
+        """
+        rank = self.rank(book_id)
+        return min(rank, self.size - 1 - rank)
+
+def run_instructions(data: bytes) -> bytes:
+    """
+    Function that follows the instructions of the Algorithmic Question and returns the answers to the ? instructions.
+
+    Args:
+        data (bytes): Whole input: the number of instructions followed by one instruction per line.
+
+    Returns:
+        bytes: Answers to the ? instructions, one per line.
+    """
+    #Here we split the whole input at once instead of reading it line by line
+    tokens = data.split()
+    if len(tokens) == 0:
+        return b""
+    number_of_instructions = int(tokens[0])
+
+    #Here we keep the state of the shelf in local variables, since the loop runs for every instruction. It is the same logic as the Shelf class
+    positions = {}
+    next_left = 0
+    next_right = 1
+    answers = []
+    append_answer = answers.append
+
+    #Here we iterate over the (instruction, id) pairs
+    for i in range(1, 2 * number_of_instructions + 1, 2):
+        instruction = tokens[i]
+        book_id = tokens[i + 1]
+        if instruction == b"L":
+            positions[book_id] = next_left
+            next_left -= 1
+        elif instruction == b"R":
+            positions[book_id] = next_right
+            next_right += 1
+        elif instruction == b"?":
+            position = positions[book_id]
+            append_answer(min(position - next_left - 1, next_right - 1 - position))
+
+    #Here we join all the answers into a single output
+    if len(answers) == 0:
+        return b""
+    return ("\n".join(map(str, answers)) + "\n").encode()
+
+def run_dynamic_instructions(data: bytes) -> bytes:
+    """
+    Function that follows the instructions of the Algorithmic Question extended with removals, using a DynamicShelf. Besides L, R and ?, it accepts:
+    "D id" to remove a book, "K k" to get the id of the k-th book from the left (starting from 1), and "PL" and "PR" to pop the leftmost and rightmost books.
+
+    Args:
+        data (bytes): Whole input: the number of instructions followed by one instruction per line.
+
+    Returns:
+        bytes: Answers to the ? and K instructions, one per line.
+    """
+    #Here we split the whole input at once instead of reading it line by line
+    tokens = data.split()
+    if len(tokens) == 0:
+        return b""
+    number_of_instructions = int(tokens[0])
+
+    shelf = DynamicShelf()
+    answers = []
+    i = 1
+    for _ in range(number_of_instructions):
+        instruction = tokens[i]
+        #Here we follow the instructions without argument
+        if instruction == b"PL":
+            shelf.pop_left()
+            i += 1
+            continue
+        if instruction == b"PR":
+            shelf.pop_right()
+            i += 1
+            continue
+
+        #Here we follow the instructions with an argument
+        argument = tokens[i + 1]
+        i += 2
+        if instruction == b"L":
+            shelf.place_left(argument)
+        elif instruction == b"R":
+            shelf.place_right(argument)
+        elif instruction == b"?":
+            answers.append(str(shelf.query(argument)))
+        elif instruction == b"D":
+            shelf.remove(argument)
+        elif instruction == b"K":
+            answers.append(shelf.select(int(argument) - 1).decode())
+
+    #Here we join all the answers into a single output
+    if len(answers) == 0:
+        return b""
+    return ("\n".join(answers) + "\n").encode()
+
+def main() -> None:
+    """
+    Function that reads the instructions from the standard input and writes the answers to the standard output with a single read and a single write.
+    With the --dynamic option, the extended instructions of run_dynamic_instructions are accepted.
+    """
+    run = run_dynamic_instructions if "--dynamic" in sys.argv[1:] else run_instructions
+    sys.stdout.buffer.write(run(sys.stdin.buffer.read()))
+    sys.stdout.buffer.flush()
+
+
+if __name__ == "__main__":
+    main()
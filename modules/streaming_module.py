@@ -0,0 +1,315 @@
+#Here we import the necessary libraries
+import heapq
+from typing import List, Tuple
+from collections import Counter
+from . import jsonl_module
+
+
+class SpaceSaving:
+    """
+    Class that keeps approximate counts of the most frequent items of a stream using at most a fixed number of counters (Space-Saving algorithm).
+    When a new item arrives and all the counters are used, the item with the smallest count is replaced by the new item, which inherits its count as error.
+    Every reported count overestimates the real count by at most its error, and the error is at most total/capacity. Summaries of different shards can be merged.
+
+    Args:
+        capacity (int, optional): Maximum number of counters, i.e. the memory budget. Defaults to 1000.
+    """
+    def __init__(self, capacity: int = 1000):
+        assert capacity > 0, f"The capacity must be positive. The capacity {capacity} is not valid."
+        self.capacity = capacity
+        #Here we store the number of items seen in the stream
+        self.total = 0
+        #Here we store the estimated count and the error of each monitored item
+        self.counts = {}
+        self.errors = {}
+        #Here we store a min-heap of (count, insertion number, item) entries to find the item with the smallest count. It can have outdated entries, which are skipped
+        #The insertion number breaks ties so that the items themselves are never compared
+        self.heap = []
+        self.insertions = 0
+
+    def __len__(self) -> int:
+        return len(self.counts)
+
+    def minimum_count(self) -> int:
+        """
+        Method that returns the smallest monitored count if all the counters are used, and 0 otherwise. It is an upper bound of the real count of any item that is not monitored.
+
+        Returns:
+            int: Smallest monitored count.
+        """
+        if len(self.counts) < self.capacity:
+            return 0
+        self._clean_heap()
+        return self.heap[0][0]
+
+    def _clean_heap(self) -> None:
+        #Here we remove the outdated entries from the top of the heap
+        while self.heap[0][0] != self.counts.get(self.heap[0][2]):
+            heapq.heappop(self.heap)
+
+    def _rebuild_heap(self) -> None:
+        #Here we rebuild the heap from the current counts when it has too many outdated entries
+        self.heap = [(count, i, item) for i, (item, count) in enumerate(self.counts.items())]
+        self.insertions = len(self.heap)
+        heapq.heapify(self.heap)
+
+    def update(self, item, count: int = 1) -> None:
+        """
+        Method that adds occurrences of an item.
+
+        Args:
+            item: Item to count. It must be hashable.
+            count (int, optional): Number of occurrences. Defaults to 1.
+        """
+        self.total += count
+        if item in self.counts:
+            self.counts[item] += count
+        elif len(self.counts) < self.capacity:
+            self.counts[item] = count
+            self.errors[item] = 0
+        else:
+            #Here we replace the item with the smallest count by the new item
+            self._clean_heap()
+            minimum_count, _, minimum_item = heapq.heappop(self.heap)
+            del self.counts[minimum_item]
+            del self.errors[minimum_item]
+            self.counts[item] = minimum_count + count
+            self.errors[item] = minimum_count
+        heapq.heappush(self.heap, (self.counts[item], self.insertions, item))
+        self.insertions += 1
+
+        #Here we rebuild the heap if it has too many outdated entries
+        if len(self.heap) > 4 * self.capacity:
+            self._rebuild_heap()
+
+    def update_many(self, items) -> None:
+        """
+        Method that adds one occurrence of each item of an iterable.
+
+        Args:
+            items: Iterable of items.
+        """
+        for item in items:
+            self.update(item)
+
+    def merge(self, other: "SpaceSaving") -> "SpaceSaving":
+        """
+        Method that returns a summary of the union of the streams of two summaries. The items that are not monitored in one summary get its smallest count as count and error.
+
+        Args:
+            other (SpaceSaving): Summary to merge.
+
+        Returns:
+            SpaceSaving: Merged summary with the capacity of this summary.
+        """
+        merged = SpaceSaving(self.capacity)
+        merged.total = self.total + other.total
+        minimum_count, other_minimum_count = self.minimum_count(), other.minimum_count()
+
+        #Here we add the counts and errors of every item monitored in any of the summaries
+        for item in set(self.counts) | set(other.counts):
+            merged.counts[item] = self.counts.get(item, minimum_count) + other.counts.get(item, other_minimum_count)
+            merged.errors[item] = self.errors.get(item, minimum_count) + other.errors.get(item, other_minimum_count)
+
+        #Here we keep only the items with the largest counts
+        if len(merged.counts) > merged.capacity:
+            kept_items = heapq.nlargest(merged.capacity, merged.counts, key=merged.counts.get)
+            merged.counts = {item: merged.counts[item] for item in kept_items}
+            merged.errors = {item: merged.errors[item] for item in kept_items}
+        merged._rebuild_heap()
+        return merged
+
+    def most_common(self, n: int = None) -> List[Tuple]:
+        """
+        Method that returns the items with the largest estimated counts, as the most_common method of a Counter.
+
+        Args:
+            n (int, optional): Number of items to return. Defaults to all the monitored items.
+
+        Returns:
+            List[Tuple]: List of (item, count) pairs sorted by count in descending order.
+        """
+        items = sorted(self.counts.items(), key=lambda pair: pair[1], reverse=True)
+        return items if n is None else items[:n]
+
+    def error_bounds(self, n: int = None) -> List[Tuple]:
+        """
+        Method that returns the items with the largest estimated counts with the bounds of their real counts.
+
+        Args:
+            n (int, optional): Number of items to return. Defaults to all the monitored items.
+
+        Returns:
+            List[Tuple]: List of (item, lower_bound, upper_bound) tuples sorted by estimated count in descending order.
+        """
+        return [(item, count - self.errors[item], count) for item, count in self.most_common(n)]
+
+def count_tags_in_range(file_path: str, start: int, end: int, field: str = "tags", capacity: int = None):
+    """
+    Function that counts the occurrences of each tag in the lists of a byte range of the list file. The counter is updated line by line, so no list of tags is stored.
+
+    Args:
+        file_path (str): Path of the list file.
+        start (int): Byte offset where the range begins.
+        end (int): Byte offset where the range ends.
+        field (str, optional): Name of the field with the tags. Defaults to "tags".
+        capacity (int, optional): If it is not None, the tags are counted approximately with a SpaceSaving summary with this number of counters. Defaults to None.
+
+    Returns:
+        Counter or SpaceSaving: Counter with the number of occurrences of each tag.
+    """
+    #Here we create the counter and the encoded field name, which we use to skip the lines without tags before decoding them
+    tags_occurrences = Counter() if capacity is None else SpaceSaving(capacity)
+    encoded_field = f'"{field}"'.encode()
+
+    for line in jsonl_module.iterate_range_lines(file_path, start, end):
+        if encoded_field not in line:
+            continue
+        #Some lines do not have tags, so we must check for this
+        tags = jsonl_module.loads(line).get(field)
+        if tags:
+            if capacity is None:
+                tags_occurrences.update(tags)
+            else:
+                tags_occurrences.update_many(tags)
+
+    return tags_occurrences
+
+def merge_counters(counters: list):
+    """
+    Function that merges a list of counters (or of SpaceSaving summaries) into a single one.
+
+    Args:
+        counters (list): List of counters or SpaceSaving summaries.
+
+    Returns:
+        Counter or SpaceSaving: Counter with the sum of the counts.
+    """
+    #Here we merge the approximate summaries
+    if len(counters) > 0 and isinstance(counters[0], SpaceSaving):
+        merged_summary = counters[0]
+        for summary in counters[1:]:
+            merged_summary = merged_summary.merge(summary)
+        return merged_summary
+
+    merged_counter = Counter()
+    for counter in counters:
+        merged_counter.update(counter)
+    return merged_counter
+
+def count_tags(file_path: str = "./data/list.json", n_workers: int = None, field: str = "tags", capacity: int = None):
+    """
+    Function that counts the occurrences of each tag in the list file, splitting the file into byte ranges that are counted in a pool of processes.
+
+    Args:
+        file_path (str, optional): Path of the list file. Defaults to "./data/list.json".
+        n_workers (int, optional): Number of processes to use. Defaults to the number of CPUs.
+        field (str, optional): Name of the field with the tags. Defaults to "tags".
+        capacity (int, optional): If it is not None, the tags are counted approximately with SpaceSaving summaries with this number of counters. Defaults to None.
+
+    Returns:
+        Counter or SpaceSaving: Counter with the number of occurrences of each tag.
+    """
+    partial_counters = jsonl_module.map_file_ranges(file_path, count_tags_in_range, n_workers=n_workers, field=field, capacity=capacity)
+    return merge_counters(partial_counters)
+
+def to_number(value):
+    """
+    Function that converts a value to a number in the same way as the jq tonumber function.
+
+    Args:
+        value: String or number.
+
+    Returns:
+        int or float: Converted value.
+    """
+    try:
+        return int(value)
+    except ValueError:
+        return float(value)
+
+def update_top_series(heap: list, lines, first_line_number: int = 0, k: int = 5) -> int:
+    """
+    Function that updates a min-heap with the k series with the greatest total book count with the lines of the series file.
+    Since a series never changes once it is written, the heap of the whole file is the heap of the old lines updated with the new ones, so it can be updated when lines are appended to the file.
+
+    Args:
+        heap (list): Min-heap of (total_book_count, line_number, id, title) tuples. It is updated in place.
+        lines: Iterable with the lines of the series file.
+        first_line_number (int, optional): Number of the first line in the file. Defaults to 0.
+        k (int, optional): Number of series to keep. Defaults to 5.
+
+    Returns:
+        int: Number of lines read.
+    """
+    number_of_lines = 0
+    for line_number, line in enumerate(lines, first_line_number):
+        number_of_lines += 1
+        if not line.strip():
+            continue
+        series = jsonl_module.loads(line)
+        #Here we compute the total book count of the series. Series without works have a total book count of 0
+        total_book_count = sum(to_number(work.get("books_count")) for work in series.get("works") or [])
+        item = (total_book_count, line_number, series.get("id"), series.get("title"))
+
+        #Here we add the series to the heap, removing the smallest series when the heap has more than k items
+        if len(heap) < k:
+            heapq.heappush(heap, item)
+        elif item > heap[0]:
+            heapq.heapreplace(heap, item)
+
+    return number_of_lines
+
+def sort_top_series(heap: list) -> List[Tuple]:
+    """
+    Function that sorts the series of a heap created with update_top_series in descending order of total book count.
+
+    Args:
+        heap (list): Min-heap of (total_book_count, line_number, id, title) tuples.
+
+    Returns:
+        List[Tuple]: List of (id, title, total_book_count) tuples.
+    """
+    return [(series_id, title, total_book_count) for total_book_count, _, series_id, title in sorted(heap, reverse=True)]
+
+def get_top_series(file_path: str = "./data/series.json", k: int = 5) -> List[Tuple]:
+    """
+    Function that returns the k series with the greatest total book count, reading the series file line by line.
+    The total book count of each series is computed only once and only the best k series are kept in a min-heap, so the memory doesn't depend on the size of the file.
+
+    Args:
+        file_path (str, optional): Path of the series file. Defaults to "./data/series.json".
+        k (int, optional): Number of series to return. Defaults to 5.
+
+    Returns:
+        List[Tuple]: List of (id, title, total_book_count) tuples sorted by total book count in descending order.
+    """
+    #Here we create the heap. Its items are (total_book_count, line_number, id, title), so the smallest item is the one that leaves the heap
+    #Ties are broken by the line number, keeping the last series first as the reversed stable sort of the jq scripts does
+    heap = []
+
+    with open(file_path, "rb") as series_file:
+        update_top_series(heap, series_file, k=k)
+
+    #Here we sort the k series in descending order
+    return sort_top_series(heap)
+
+def to_markdown_table(header: List[str], rows: List[Tuple]) -> str:
+    """
+    Function that formats rows as a Markdown table with aligned columns.
+
+    Args:
+        header (List[str]): Names of the columns.
+        rows (List[Tuple]): Rows of the table.
+
+    Returns:
+        str: Markdown table.
+    """
+    #Here we convert the values to strings and compute the width of each column
+    table = [list(map(str, header))] + [[str(value) for value in row] for row in rows]
+    widths = [max(len(row[i]) for row in table) for i in range(len(header))]
+
+    #Here we build the lines of the table
+    lines = ["| " + " | ".join(value.ljust(width) for value, width in zip(row, widths)) + " |" for row in table]
+    lines.insert(1, "|" + "|".join("-" * (width + 2) for width in widths) + "|")
+    return "\n".join(lines)
@@ -20,30 +20,22 @@ Print your boss's type 3 instructions in the order they appear in the input.
 """
 #Solution:
 
-#First we import the deque class from the collections module. We do this since deques have the appendleft method, which allows us to add an element to the left of the deque.
-from collections import deque
-
-#Here we take the number of instructions from the user.
-n = int(input().strip())
-#Here we create a deque to store the books on the shelf.
-books_on_shelf = deque()
-
-#Here we iterate over the instructions.
-for i in range(n):
-    #Here we take the instruction and the book id from the user.
-    instruction, id = input().strip().split()
-    #If the instruction is L, we add the book to the left of the leftmost book on the shelf.
-    if instruction == "L":
-        books_on_shelf.appendleft(id)
-    #If the instruction is R, we add the book to the right of the rightmost book on the shelf.
-    elif instruction == "R":
-        books_on_shelf.append(id)
-    #If the instruction is ?, we calculate the minimum number of books we must pop from the left or right to have the book with ID = N as the leftmost or rightmost book on the shelf.
-    elif instruction == "?":
-        #Here we find the index of the book with the given id.
-        book_index = books_on_shelf.index(id)
-        #Here we print the minimum number of books we must pop from the left or right to have the book with ID = N as the leftmost or rightmost book on the shelf.
-        #We can see that this only depends on the index ("virtual position") of the book on the shelf and the number of books on the shelf.
-        #If we know the position of the book on the shelf, the number of books we must pop from the left is the index itself, since the index is the number of books to the left of the book.
-        #On the other side, the number of books we must pop from the right is the number of books on the shelf minus the index minus 1, since the index is the number of books to the left of the book and we must take out the book itself to obtain the number of books to the right of the book.
-        print(min(book_index, len(books_on_shelf) - book_index - 1))
+#We don't need to move the books to answer the ? instructions. Each book gets a "virtual position" when it is placed: the books placed on the left get positions counting down from 0 and the books placed on the right get positions counting up from 1.
+#Since the order of the books never changes, the number of books we must pop from the left is the position of the book minus the position of the leftmost book, and the number of books we must pop from the right is the position of the rightmost book minus the position of the book.
+#In this way every instruction takes O(1) time instead of searching the book on the shelf. This logic lives in the shelf_module so that it can be reused.
+
+#Here we import the sys and os modules to be able to import the modules folder when the script is run from the repository root.
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from modules import shelf_module, profiling_module
+
+#Here we read all the instructions at once from the standard input and write all the answers at once to the standard output.
+#With the --dynamic option, the shelf also accepts removals (D id), pops from both ends (PL and PR) and lookups of the k-th book from the left (K k), which take O(log n) time.
+#If the ADM_PROFILE_LOG environment variable is set, the script is profiled and its stages are written to that log.
+if __name__ == "__main__":
+    profiling_module.enable_from_environment([shelf_module])
+    with profiling_module.profile_stage("algorithmic_question"):
+        shelf_module.main()
@@ -4,33 +4,64 @@ Going through the [__list.json__](https://www.kaggle.com/datasets/opalskies/larg
 Please report the __top 5__ most frequently used tags and the number of times they appear in the lists.
 """
 #Solution:
-#First we import the jsonlines module. We do this since we want to read the json file line by line and take only the tags from each line.
-#We also import the time module to measure the time it takes to run the script.
-#Finally, we import the Counter class from the collections module. We do this since we want to count the number of occurrences of each tag.
+#We read the list file as a stream of lines and update a Counter with the tags of each line, so we never store the list of all the tags.
+#The file is split into byte ranges that start at the beginning of a line, and each range is counted in a different process. Then we merge the counters of the processes.
+#We use the orjson decoder if it is installed, since it is faster than the json module.
+#With the --capacity option, each process keeps only a fixed number of approximate counters (Space-Saving algorithm) instead of one counter per distinct tag, and the bounds of the real counts are reported.
+#With the --incremental option, the counter is saved in a checkpoint together with the byte offset up to which the file was read, and only the lines appended since the last run are counted.
+#We also import the time module to measure the time it takes to run each phase of the script.
+import os
+import sys
 import time
-import jsonlines
-from collections import Counter
+import argparse
 
-#Here we start counting the time it takes to run the script.
-start_time = time.time()
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-#Here we create a list to store the tags of each line. It is important to note that some lines do not have tags, so we must check for this.
-with jsonlines.open('./data/list.json', 'r') as jsonl_f:
-    tags_list = [obj.get("tags") for obj in jsonl_f if obj.get("tags") != None]
+from modules import jsonl_module, streaming_module, profiling_module, incremental_module
 
-#Here we flatten the list of lists into a list.
-tags_list = [tag for sublist in tags_list for tag in sublist]
+def main() -> None:
+    #Here we read the arguments of the script.
+    parser = argparse.ArgumentParser(description="Report the most frequently used tags of the book lists.")
+    parser.add_argument("--input", default="./data/list.json", help="Path of the list file.")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="Number of processes to use.")
+    parser.add_argument("--top", type=int, default=5, help="Number of tags to report.")
+    parser.add_argument("--capacity", type=int, default=None, help="Number of approximate counters per process. If it is not given, the tags are counted exactly.")
+    parser.add_argument("--incremental", action="store_true", help="Count only the lines appended since the last run, using a checkpoint in ./data/cache/incremental.")
+    arguments = parser.parse_args()
 
-#Here we create a counter object to count the number of occurrences of each tag.
-tags_ocurrences = Counter(tags_list)
+    #Here we count the tags of each byte range of the file in a pool of processes.
+    #If we count incrementally, we update the counter of the checkpoint with the new lines instead.
+    start_time = time.time()
+    if arguments.incremental:
+        partial_counters = [incremental_module.refresh_tag_counts(arguments.input, capacity=arguments.capacity)]
+    else:
+        partial_counters = jsonl_module.map_file_ranges(arguments.input, streaming_module.count_tags_in_range, n_workers=arguments.workers, capacity=arguments.capacity)
+    count_time = time.time()
 
-#Here we print the top 5 most frequently used tags and the number of times they appear in the lists as a Markdown table.
-print("| tag | #usage |")
-print("| --- | --- |")
-#The .most_common method returns a list of tuples, where each tuple contains the tag and the number of times it appears in the lists.
-for tag, count in tags_ocurrences.most_common(5):
-    print(f"| {tag} | {count} |")
+    #Here we merge the counters of the processes.
+    tags_ocurrences = streaming_module.merge_counters(partial_counters)
+    merge_time = time.time()
 
-#Here we print the time it took to run the script.
-print(f"{time.time() - start_time} seconds")
+    #Here we print the top 5 most frequently used tags and the number of times they appear in the lists as a Markdown table.
+    print("| tag | #usage |")
+    print("| --- | --- |")
+    #The .most_common method returns a list of tuples, where each tuple contains the tag and the number of times it appears in the lists.
+    for tag, count in tags_ocurrences.most_common(arguments.top):
+        print(f"| {tag} | {count} |")
+    #If we counted approximately, we print the bounds of the real counts of the reported tags.
+    if arguments.capacity is not None:
+        for tag, lower_bound, upper_bound in tags_ocurrences.error_bounds(arguments.top):
+            print(f"{tag}: between {lower_bound} and {upper_bound}")
+    report_time = time.time()
 
+    #Here we print the time it took to run each phase of the script.
+    print(f"count: {count_time - start_time} seconds")
+    print(f"merge: {merge_time - count_time} seconds")
+    print(f"report: {report_time - merge_time} seconds")
+    print(f"total: {report_time - start_time} seconds")
+
+if __name__ == "__main__":
+    #If the ADM_PROFILE_LOG environment variable is set, the script and the functions of the modules are profiled and the stages are written to that log.
+    profiling_module.enable_from_environment([jsonl_module, streaming_module])
+    with profiling_module.profile_stage("aws_question"):
+        main()
@@ -0,0 +1,34 @@
+"""
+Script that extracts the top 5 series from the series.json file regarding their total book count and displays them as a Markdown table.
+It gives the same table as commandline_original.sh, but it reads the file line by line instead of loading it into memory with jq -s,
+computes the total book count of each series only once and keeps only the best 5 series in a min-heap instead of sorting all of them.
+"""
+#Here we import the sys and os modules to be able to import the modules folder when the script is run from the repository root.
+import os
+import sys
+import argparse
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from modules import streaming_module, profiling_module, incremental_module
+
+def main() -> None:
+    #Here we read the arguments of the script. This default path is only valid for the original repository, change it accordingly if you use this script in your own repository
+    parser = argparse.ArgumentParser(description="Report the series with the greatest total book count.")
+    parser.add_argument("--input", default="./data/series.json", help="Path of the series file.")
+    parser.add_argument("--top", type=int, default=5, help="Number of series to report.")
+    parser.add_argument("--incremental", action="store_true", help="Read only the lines appended since the last run, using a checkpoint in ./data/cache/incremental.")
+    arguments = parser.parse_args()
+
+    #Here we get the top series and print them as a Markdown table. If we read incrementally, the heap of the checkpoint is updated with the new lines
+    if arguments.incremental:
+        top_series = incremental_module.refresh_top_series(arguments.input, k=arguments.top)
+    else:
+        top_series = streaming_module.get_top_series(arguments.input, k=arguments.top)
+    print(streaming_module.to_markdown_table(["id", "title", "total_book_count"], top_series))
+
+if __name__ == "__main__":
+    #If the ADM_PROFILE_LOG environment variable is set, the script and the functions of the modules are profiled and the stages are written to that log.
+    profiling_module.enable_from_environment([streaming_module])
+    with profiling_module.profile_stage("commandline_streaming"):
+        main()
@@ -0,0 +1,55 @@
+"""
+Script that generates the weekly report of the datasets: the most frequently used tags of the lists, the books of "The Worst Books of All Time" list,
+the series with the greatest total book count and the yearly statistics of the books.
+"""
+#Solution:
+#Each analysis is registered as a consumer of its file in a ScanEngine, so each file is read and decoded only once even if several analyses use it (the tags and the worst books both use list.json).
+#The files are split into byte ranges and all the ranges of all the files are scanned concurrently in a pool of processes.
+import os
+import sys
+import time
+import argparse
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from modules import scan_module, streaming_module, profiling_module
+
+def main() -> None:
+    #Here we read the arguments of the script.
+    parser = argparse.ArgumentParser(description="Generate the weekly report of the datasets with a single scan of each file.")
+    parser.add_argument("--list", default="./data/list.json", help="Path of the list file.")
+    parser.add_argument("--series", default="./data/series.json", help="Path of the series file.")
+    parser.add_argument("--books", default="./data/lighter_books.json", help="Path of the books file.")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="Number of processes to use.")
+    parser.add_argument("--top", type=int, default=5, help="Number of tags and series to report.")
+    arguments = parser.parse_args()
+
+    #Here we register the analyses of each file.
+    engine = scan_module.ScanEngine()
+    engine.register(arguments.list, scan_module.TagCounter())
+    engine.register(arguments.list, scan_module.ListBooks())
+    engine.register(arguments.series, scan_module.TopSeries(k=arguments.top))
+    engine.register(arguments.books, scan_module.YearlyBookStats())
+
+    #Here we scan all the files.
+    start_time = time.time()
+    results = engine.run(n_workers=arguments.workers)
+    scan_time = time.time()
+
+    #Here we print the report as Markdown.
+    print("## Most used tags\n")
+    print(streaming_module.to_markdown_table(["tag", "#usage"], results["tags"].most_common(arguments.top)))
+    print("\n## The Worst Books of All Time\n")
+    print(f"{len(results['worst_books'] or [])} books")
+    print("\n## Top series\n")
+    print(streaming_module.to_markdown_table(["id", "title", "total_book_count"], results["top_series"]))
+    print("\n## Yearly statistics\n")
+    yearly_stats = results["yearly_stats"].reset_index()
+    print(streaming_module.to_markdown_table(list(yearly_stats.columns), yearly_stats.itertuples(index=False, name=None)))
+    print(f"\nscan: {scan_time - start_time} seconds")
+
+if __name__ == "__main__":
+    #If the ADM_PROFILE_LOG environment variable is set, the script is profiled and its stages are written to that log.
+    profiling_module.enable_from_environment([scan_module])
+    with profiling_module.profile_stage("weekly_report"):
+        main()
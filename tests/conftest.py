@@ -0,0 +1,48 @@
+#Here we import the necessary libraries
+import os
+import sys
+import json
+
+import pytest
+
+#Here we add the repository root to the path, as the scripts do, so that the modules folder can be imported
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def write_jsonl(file_path: str, records: list, mode: str = "w") -> None:
+    """
+    Function that writes (or appends) records to a json lines file.
+
+    Args:
+        file_path (str): Path of the file.
+        records (list): List of dictionaries.
+        mode (str, optional): Mode used to open the file. Defaults to "w".
+    """
+    with open(file_path, mode) as file:
+        for record in records:
+            file.write(json.dumps(record) + "\n")
+
+@pytest.fixture
+def books_records() -> list:
+    """
+    Fixture with a few books shaped like the lighter_books.json file.
+    """
+    return [
+        {"id": 1, "title": "A", "author_id": 1, "num_pages": "300", "language": "eng", "original_publication_date": "1999-05-01", "rating_dist": "5:10|4:5|3:2|2:1|1:0|total:18"},
+        {"id": 2, "title": "B", "author_id": 1, "num_pages": "", "language": "spa", "original_publication_date": "2001-02", "rating_dist": "5:1|4:1|3:1|2:1|1:1|total:5"},
+        {"id": 3, "title": "C", "author_id": 2, "num_pages": "120", "language": "eng", "original_publication_date": "", "rating_dist": "5:0|4:0|3:0|2:0|1:0|total:0"},
+        {"id": 4, "title": "D", "author_id": 2, "num_pages": "450", "language": "ita", "original_publication_date": "2001-11-20", "rating_dist": "5:3|4:0|3:4|2:0|1:2|total:9"},
+        {"id": 5, "title": "E", "author_id": 3, "num_pages": "90", "language": "eng", "original_publication_date": "1999", "rating_dist": "5:7|4:7|3:0|2:0|1:0|total:14"},
+    ]
+
+@pytest.fixture
+def books_file(tmp_path, books_records, monkeypatch) -> str:
+    """
+    Fixture that writes the books to a temporary file and makes the data handling module read the books dataset from it.
+    """
+    from modules import data_handling_module
+    file_path = str(tmp_path / "lighter_books.json")
+    write_jsonl(file_path, books_records)
+    monkeypatch.setitem(data_handling_module.DATASET_PATHS, "books", file_path)
+    monkeypatch.setattr(data_handling_module, "CACHE_DIRECTORY", str(tmp_path / "cache"))
+    return file_path
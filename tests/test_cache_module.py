@@ -0,0 +1,77 @@
+#Here we import the necessary libraries
+import sys
+import importlib
+import pandas as pd
+import pytest
+
+from modules import cache_module, data_handling_module
+
+
+@pytest.fixture
+def cache(tmp_path):
+    """
+    Fixture that enables the cache in a temporary folder and disables it after the test.
+    """
+    cache_module.enable_cache(str(tmp_path / "results"))
+    cache_module.clear_cache()
+    for name in cache_module.statistics:
+        cache_module.statistics[name] = 0
+    yield cache_module
+    cache_module.clear_cache()
+    cache_module.disable_cache()
+
+def test_ratings_ratio_column_is_cached_without_modifying_the_dataset(cache, books_records):
+    books = pd.DataFrame(books_records)
+    columns = list(books.columns)
+
+    first_ratio = data_handling_module.get_ratings_above_limit_ratio_column(books)
+    second_ratio = data_handling_module.get_ratings_above_limit_ratio_column(books)
+
+    #The dataset keeps its columns, so the second call has the same key and is a hit
+    assert list(books.columns) == columns
+    assert cache.statistics["misses"] == 1 and cache.statistics["memory_hits"] == 1
+    pd.testing.assert_series_equal(first_ratio, second_ratio)
+    expected = books.rating_dist.apply(data_handling_module.get_ratings_above_limit_ratio)
+    assert (first_ratio.to_numpy() == expected.to_numpy()).all()
+
+    #The count columns of parse_rating_dist_column give the same values
+    parsed_ratio = data_handling_module.get_ratings_above_limit_ratio_column(data_handling_module.parse_rating_dist_column(books.copy()))
+    pd.testing.assert_series_equal(first_ratio, parsed_ratio)
+
+def test_code_version_changes_with_dependencies(monkeypatch):
+    function = data_handling_module.historical_dataframe.__wrapped__
+    version = cache_module.get_code_version(function, dependencies=["YearlyStats"])
+
+    #Here we replace the helper with a class with other source code
+    class YearlyStats:
+        pass
+    monkeypatch.setattr(data_handling_module, "YearlyStats", YearlyStats)
+
+    assert cache_module.get_code_version(function, dependencies=["YearlyStats"]) != version
+
+def test_cached_result_is_invalidated_when_a_dependency_changes(cache, tmp_path, monkeypatch):
+    #Here we write a module with a memoized function that calls a helper. We don't write bytecode, so that the edited module is compiled again
+    monkeypatch.setattr(sys, "dont_write_bytecode", True)
+    monkeypatch.syspath_prepend(str(tmp_path))
+    module_path = tmp_path / "memoized_example.py"
+    source = """from modules import cache_module
+
+def helper(value):
+    return value + 1
+
+@cache_module.memoize(dependencies=["helper"])
+def compute(value):
+    return helper(value)
+"""
+    module_path.write_text(source)
+    module = importlib.import_module("memoized_example")
+    assert module.compute(1) == 2
+
+    #Here we edit the source of the helper and reload the module, as after a restart, keeping only the results saved on disk
+    module_path.write_text(source.replace("return value + 1", "return value + 1000"))
+    module = importlib.reload(module)
+    cache.clear_cache(disk=False)
+
+    assert module.compute(1) == 1001
+    assert cache.statistics["misses"] == 2 and cache.statistics["disk_hits"] == 0
+    sys.modules.pop("memoized_example")
@@ -0,0 +1,138 @@
+#Here we import the necessary libraries
+import numpy as np
+import pandas as pd
+import pytest
+from scipy import stats
+
+from modules import data_handling_module
+from conftest import write_jsonl
+
+
+def test_correlation_matrix_with_large_offset():
+    #Here we create two columns near 1e8 with small variations and some missing values
+    generator = np.random.default_rng(0)
+    x = 1e8 + generator.integers(-1, 2, 200).astype("float64")
+    y = 1e8 + x - 1e8 + generator.integers(-1, 2, 200)
+    x[::17] = np.nan
+    dataset = pd.DataFrame({"x": x, "y": y})
+
+    correlations, p_values = data_handling_module.correlation_matrix(dataset)
+
+    complete = dataset.dropna()
+    expected = stats.pearsonr(complete["x"], complete["y"])
+    assert np.isclose(correlations.loc["x", "y"], expected.statistic)
+    assert np.isclose(p_values.loc["x", "y"], expected.pvalue)
+
+def test_get_data_drops_columns(books_file):
+    dataset = data_handling_module.get_data("books", upload_all=True, columns=["rating_dist", "language"])
+    assert list(dataset.columns) == ["id", "title", "author_id", "num_pages", "original_publication_date"]
+
+    #The columns already removed by keep_columns are ignored
+    dataset = data_handling_module.get_data("books", upload_all=True, columns=["rating_dist", "language"], keep_columns=["id", "title", "language"])
+    assert list(dataset.columns) == ["id", "title"]
+
+@pytest.mark.parametrize("mixed_types", [False, True])
+def test_get_cached_data_matches_get_data(tmp_path, monkeypatch, mixed_types):
+    #Here we write books whose first chunk has only numeric page counts and whose next chunks have empty ones, so the parsed column has the object type
+    #With mixed types, a page count of the third chunk is a string, so the columnar copy can't be written
+    records = [{"id": i, "language": "eng" if i % 3 == 0 else "spa", "num_pages": str(100 + i) if i < 100 or (mixed_types and i == 220) else ""} for i in range(250)]
+    file_path = str(tmp_path / "books.json")
+    write_jsonl(file_path, records)
+    monkeypatch.setitem(data_handling_module.DATASET_PATHS, "books", file_path)
+    monkeypatch.setattr(data_handling_module, "CACHE_DIRECTORY", str(tmp_path / "cache"))
+
+    for arguments in [{"upload_all": True}, {"upload_all": False}, {"upload_all": False, "row_filter": "language == 'eng'"}, {"upload_all": True, "keep_columns": ["id", "num_pages", "rating"]}]:
+        expected = data_handling_module.get_data("books", **arguments)
+        #The first call creates the columnar copy and the second one reads it
+        #The data types of the first chunk are the ones of the whole file, while pandas infers them from the chunk alone when the json file is parsed
+        for _ in range(2):
+            pd.testing.assert_frame_equal(data_handling_module.get_data("books", cache=True, **arguments), expected, check_dtype=arguments["upload_all"])
+
+def test_parallel_get_data_keeps_row_labels(tmp_path, monkeypatch, books_records):
+    #Here we write the books many times with some empty lines, so that the file is split into several ranges
+    file_path = str(tmp_path / "books.json")
+    write_jsonl(file_path, books_records * 40)
+    with open(file_path, "a") as file:
+        file.write("\n")
+    write_jsonl(file_path, books_records * 40, mode="a")
+    monkeypatch.setitem(data_handling_module.DATASET_PATHS, "books", file_path)
+
+    #We give the data types of the string columns, since pandas infers them from each chunk or range and the last chunk has only one row
+    dtype = {"num_pages": str, "original_publication_date": str}
+    for row_filter in [None, "language == 'eng'", lambda dataset: dataset["author_id"] == 2]:
+        expected = data_handling_module.get_data("books", upload_all=True, dtype=dtype, row_filter=row_filter)
+        pd.testing.assert_frame_equal(data_handling_module.get_data("books", upload_all=True, dtype=dtype, row_filter=row_filter, n_workers=3), expected)
+
+def test_compact_dataset_keeps_input_and_identifiers():
+    dataset = pd.DataFrame({
+        "id": pd.Series(["0012", "0345", "6789"], dtype="object"),
+        "isbn": pd.Series(["0439785960", "0316015849", None], dtype="object"),
+        "num_pages": pd.Series(["300", np.nan, "120"], dtype="object"),
+        "language": ["eng", "eng", "eng"]
+    })
+    original = dataset.copy()
+
+    compacted = data_handling_module.compact_dataset(dataset)
+
+    #The given dataframe is not modified
+    pd.testing.assert_frame_equal(dataset, original)
+    #The identifiers keep their leading zeros, while the other numeric strings are converted
+    assert compacted["id"].tolist() == ["0012", "0345", "6789"]
+    assert compacted["isbn"].iloc[0] == "0439785960"
+    assert compacted["num_pages"].dtype == "Int16"
+    assert compacted["language"].dtype == "category"
+
+def test_empty_dates_are_missing_and_not_malformed():
+    dates = pd.DataFrame({"date": pd.Series(["1999-05-01", "", "  ", None, "2001-13", "abc"], dtype="object")})
+
+    dataset, error_mask = data_handling_module.standardize_time_column_to_period(dates, "date", return_errors=True)
+
+    assert error_mask.tolist() == [False, False, False, False, True, True]
+    assert dataset["date"].isna().tolist() == [False, True, True, True, True, True]
+
+def test_historical_dataframe_drops_undated_books(books_file):
+    books = data_handling_module.get_data("books", upload_all=True, dtype={"original_publication_date": str})
+    books = data_handling_module.standardize_time_column_to_period(books, "original_publication_date")
+
+    historical_dataframe = data_handling_module.historical_dataframe(books, "original_publication_date")
+
+    #The book without a date is not counted in any year
+    assert historical_dataframe.index.tolist() == [1999, 2001]
+    assert historical_dataframe["Total Number of Books"].sum() == 4
+
+def test_yearly_stats_break_month_ties_with_the_first_seen_month():
+    #Here we create a year where November and February have the same number of books and November appears first
+    books = pd.DataFrame({
+        "date": pd.Series(["2001-11-03", "2001-02-10", "", "2001-02-11", "2001-11-20", "1999-04-01"], dtype="object"),
+        "num_pages": [100, 200, 50, 300, 150, 80],
+        "title": ["A", "B", "C", "D", "E", "F"]
+    })
+    books = data_handling_module.standardize_time_column_to_period(books, "date")
+
+    historical_dataframe = data_handling_module.YearlyStats("date").update(books).to_dataframe()
+    #The statistics updated in two parts give the same result
+    split_historical_dataframe = data_handling_module.YearlyStats("date").update(books.iloc[:3]).update(books.iloc[3:]).to_dataframe()
+
+    dated_books = books[books["date"].notna()]
+    for year in [1999, 2001]:
+        expected = data_handling_module.historical_data(dated_books, "date", year).set_index("Year")
+        assert historical_dataframe.loc[year, "Most Prolific Month"] == expected.loc[year, "Most Prolific Month"]
+    assert historical_dataframe.loc[2001, "Most Prolific Month"] == 11
+    pd.testing.assert_frame_equal(split_historical_dataframe, historical_dataframe)
+
+def test_approximate_count_column_values_bounds_the_real_counts():
+    #Here we create a column with a few frequent values and many rare ones, so that the counts of a small summary are overestimated
+    generator = np.random.default_rng(0)
+    column = pd.Series(generator.zipf(1.5, 5000) % 200).astype(str)
+    real_counts = column.value_counts()
+
+    labels, values, bounds = data_handling_module.count_column_values(column, limit=10, capacity=20)
+
+    assert len(labels) == len(values) == len(bounds) == 11
+    assert any(lower_bound < upper_bound for lower_bound, upper_bound in bounds[:-1])
+    for label, value, (lower_bound, upper_bound) in zip(labels[:-1], values[:-1], bounds[:-1]):
+        assert value == upper_bound
+        assert lower_bound <= real_counts[label] <= upper_bound
+    #The real count of the general category is the count of the values that are not in the labels
+    other_count = real_counts.drop(labels[:-1]).sum()
+    assert values[-1] == bounds[-1][0] <= other_count <= bounds[-1][1]
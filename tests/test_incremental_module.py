@@ -0,0 +1,24 @@
+#Here we import the necessary libraries
+import pandas as pd
+
+from conftest import write_jsonl
+from modules import incremental_module
+
+
+def test_refresh_yearly_stats_with_year_only_append(tmp_path, books_file):
+    #Here we build the checkpoint and then append a small delta whose dates are only years, which pandas reads as integers
+    incremental_module.refresh_yearly_stats(directory=str(tmp_path / "incremental"))
+    write_jsonl(books_file, [
+        {"id": 6, "title": "F", "author_id": 4, "num_pages": "500", "original_publication_date": "1999"},
+        {"id": 7, "title": "G", "author_id": 4, "num_pages": "80", "original_publication_date": "2003"},
+    ], mode="a")
+
+    incremental = incremental_module.refresh_yearly_stats(directory=str(tmp_path / "incremental"))
+    checkpoint = incremental_module.get_checkpoint("yearly-stats-v2-original_publication_date", books_file, str(tmp_path / "incremental"))
+    assert not checkpoint["rebuilt"]
+
+    #The incremental result must be the same as a full rebuild
+    rebuilt = incremental_module.refresh_yearly_stats(directory=str(tmp_path / "rebuild"))
+    pd.testing.assert_frame_equal(incremental, rebuilt)
+    assert incremental.loc[1999, "Longest Book"] == "F"
+    assert incremental.index.tolist() == [1999, 2001, 2003]
@@ -0,0 +1,21 @@
+#Here we import the necessary libraries
+import numpy as np
+import pandas as pd
+import matplotlib
+matplotlib.use("Agg")
+import matplotlib.pyplot as plt
+
+from modules import plotting_module
+
+
+def test_aggregated_bivariate_hist_plot_uses_keyword_arguments():
+    generator = np.random.default_rng(0)
+    data = pd.DataFrame({"x": generator.random(1000), "y": generator.random(1000)})
+    figure, (first_ax, second_ax) = plt.subplots(1, 2)
+
+    plotting_module.hist_plot(data, x="x", y="y", aggregate=True, bins=10, cmap="magma", ax=second_ax)
+
+    #The density map is drawn on the given axes with the given color map
+    assert len(first_ax.collections) == 0
+    assert second_ax.collections[0].get_cmap().name == "magma"
+    plt.close(figure)
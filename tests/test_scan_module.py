@@ -0,0 +1,16 @@
+#Here we import the necessary libraries
+from conftest import write_jsonl
+from modules import scan_module
+
+
+def test_yearly_book_stats_report_only_real_years(books_file):
+    #Here we append books without a date field or with an empty date, so that some ranges have only undated books
+    write_jsonl(books_file, [{"id": 6, "title": "F", "num_pages": "200"}, {"id": 7, "title": "G", "num_pages": "10", "original_publication_date": ""}], mode="a")
+
+    engine = scan_module.ScanEngine().register(books_file, scan_module.YearlyBookStats(batch_size=2))
+    yearly_stats = engine.run(n_workers=1, ranges_per_file=3)["yearly_stats"]
+
+    #Only the years of the dated books are reported, with their books
+    assert yearly_stats.index.tolist() == [1999, 2001]
+    assert yearly_stats["Total Number of Books"].tolist() == [2, 2]
+    assert yearly_stats.loc[1999, "Longest Book"] == "A"
@@ -0,0 +1,55 @@
+#Here we import the necessary libraries
+import pytest
+
+from benchmarks import data_generators
+from benchmarks.shelf_benchmark import NaiveShelf, stress_check
+from modules import shelf_module
+
+
+def run_naive_instructions(data: bytes) -> bytes:
+    """
+    Function that follows the instructions of the (extended) Algorithmic Question with a NaiveShelf and returns the answers to the ? and K instructions.
+
+    Args:
+        data (bytes): Whole input: the number of instructions followed by one instruction per line.
+
+    Returns:
+        bytes: Answers, one per line.
+    """
+    lines = data.split(b"\n")
+    shelf = NaiveShelf()
+    answers = []
+    for line in lines[1:int(lines[0]) + 1]:
+        instruction, *argument = line.split()
+        if instruction == b"L":
+            shelf.place_left(argument[0])
+        elif instruction == b"R":
+            shelf.place_right(argument[0])
+        elif instruction == b"?":
+            answers.append(str(shelf.query(argument[0])))
+        elif instruction == b"D":
+            shelf.remove(argument[0])
+        elif instruction == b"K":
+            answers.append(shelf.select(int(argument[0]) - 1).decode())
+        elif instruction == b"PL":
+            shelf.pop_left()
+        elif instruction == b"PR":
+            shelf.pop_right()
+    return "".join(answer + "\n" for answer in answers).encode()
+
+@pytest.mark.parametrize("seed", range(5))
+def test_run_instructions_matches_naive_shelf(seed):
+    data = data_generators.generate_shelf_instructions(2000, seed=seed)
+    expected = run_naive_instructions(data)
+    assert shelf_module.run_instructions(data) == expected
+    assert shelf_module.run_dynamic_instructions(data) == expected
+
+@pytest.mark.parametrize("seed", range(5))
+def test_run_dynamic_instructions_matches_naive_shelf(seed):
+    data = data_generators.generate_dynamic_shelf_instructions(2000, seed=seed)
+    assert shelf_module.run_dynamic_instructions(data) == run_naive_instructions(data)
+
+@pytest.mark.parametrize("seed", range(10))
+def test_dynamic_shelf_stress(seed):
+    #An AssertionError is raised if the DynamicShelf and the NaiveShelf give different answers
+    stress_check(500, seed)